@@ -42,13 +42,16 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "core",
     "tracker",
     "users",
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -57,14 +60,32 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Request instrumentation: a Server-Timing header on every response and
+# per-view latency / SQL / template histograms at /metrics (Prometheus
+# text format). Off by default, and then the middleware drops out of the
+# chain entirely.
+TRACKER_METRICS = os.getenv("TRACKER_METRICS", "False").lower() == "true"
+# Optional bearer token required to scrape /metrics
+TRACKER_METRICS_TOKEN = os.getenv("TRACKER_METRICS_TOKEN", "")
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # Compiled templates are kept per process (runserver's autoreloader
+            # still resets them when a template changes)
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
             "context_processors": [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
@@ -85,6 +106,11 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+# Serve the transaction list and analytics pages with async views
+# (tracker/async_views.py). Turn on when running under ASGI (uvicorn
+# config.asgi:application); leave off under WSGI.
+TRACKER_ASYNC_VIEWS = os.getenv("TRACKER_ASYNC_VIEWS", "False").lower() == "true"
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -100,6 +126,66 @@ DATABASES = {
     }
 }
 
+# Read replicas: DB_REPLICA_HOSTS=host1,host2 adds replica1, replica2, ...
+# with the primary's name and credentials. The list, export and analytics
+# pages read from them (core/routers.py); in tests they mirror the
+# primary's test database.
+TRACKER_DB_REPLICAS = []
+for number, host in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1):
+    DATABASES[f"replica{number}"] = dict(DATABASES["default"], HOST=host, TEST={"MIRROR": "default"})
+    TRACKER_DB_REPLICAS.append(f"replica{number}")
+
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+
+# After writing, a client reads from the primary for this many seconds;
+# set it above the replicas' worst replication lag
+TRACKER_REPLICA_STICKY_SECONDS = int(os.getenv("TRACKER_REPLICA_STICKY_SECONDS", 10))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# locmem is per process: with several workers, use file or db so that
+# analytics invalidation reaches every process (db needs `createcachetable`).
+
+CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "budget-tracker"),
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", str(BASE_DIR / ".cache")),
+    "db": ("django.core.cache.backends.db.DatabaseCache", "tracker_cache"),
+}
+CACHE_BACKEND, CACHE_DEFAULT_LOCATION = CACHE_BACKENDS[os.getenv("CACHE_BACKEND", "locmem")]
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", CACHE_DEFAULT_LOCATION),
+    }
+}
+
+# Cache alias holding per-user data versions and analytics results
+TRACKER_CACHE_ALIAS = os.getenv("TRACKER_CACHE_ALIAS", "default")
+TRACKER_CACHE_TIMEOUT = int(os.getenv("TRACKER_CACHE_TIMEOUT", 60 * 60))
+# Cache the rendered transaction table and its rows (tracker/fragments.py)
+TRACKER_FRAGMENT_CACHE = os.getenv("TRACKER_FRAGMENT_CACHE", "True").lower() == "true"
+
+
+# Sessions and the logged-in user
+# cached_db reads sessions from the cache, falling back to the database;
+# with several workers use a shared cache (file) so a logout reaches every
+# process. signed_cookies needs no storage, but a session can't be revoked
+# before it expires; cache alone loses sessions when they're evicted.
+
+SESSION_BACKENDS = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cache": "django.contrib.sessions.backends.cache",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_ENGINE = SESSION_BACKENDS[os.getenv("SESSION_BACKEND", "cached_db")]
+
+AUTHENTICATION_BACKENDS = ["users.backends.CachedModelBackend"]
+# Seconds a process may reuse a user row (users/backends.py); 0 turns it off
+TRACKER_USER_CACHE_SECONDS = int(os.getenv("TRACKER_USER_CACHE_SECONDS", 30))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
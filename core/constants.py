@@ -5,3 +5,15 @@ TRANSACTION_TYPE_CHOICES = [
     (INCOME, "Income"),
     (EXPENSE, "Expense"),
 ]
+
+WEEKLY = "weekly"
+BIWEEKLY = "biweekly"
+MONTHLY = "monthly"
+YEARLY = "yearly"
+
+RECURRING_PERIOD_CHOICES = [
+    (WEEKLY, "Weekly"),
+    (BIWEEKLY, "Every two weeks"),
+    (MONTHLY, "Monthly"),
+    (YEARLY, "Yearly"),
+]
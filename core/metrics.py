@@ -0,0 +1,74 @@
+"""
+In-process request histograms, rendered in the Prometheus text format.
+
+Each worker process keeps its own counts; Prometheus adds them up across
+the scraped processes. Recorded by core.middleware.RequestMetricsMiddleware
+and served at /metrics, both only when TRACKER_METRICS is on.
+"""
+import bisect
+import threading
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with one series per label value.
+    """
+
+    def __init__(self, name, documentation, buckets, label="view"):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.label = label
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, label_value, value):
+        # Counts per bucket, not cumulative, plus the running sum
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_value)
+            if series is None:
+                series = self.series[label_value] = [[0] * (len(self.buckets) + 1), 0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            items = sorted((value, list(counts), total) for value, (counts, total) in self.series.items())
+        for value, counts, total in items:
+            label = f'{self.label}="{_label(value)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return "\n".join(lines)
+
+
+REQUEST_SECONDS = Histogram(
+    "tracker_request_duration_seconds", "Time to produce the response, per URL name.", SECONDS_BUCKETS
+)
+DB_QUERIES = Histogram(
+    "tracker_request_db_queries", "SQL queries per request, per URL name.", QUERY_BUCKETS
+)
+DB_SECONDS = Histogram(
+    "tracker_request_db_seconds", "Time spent in SQL queries per request, per URL name.", SECONDS_BUCKETS
+)
+TEMPLATE_SECONDS = Histogram(
+    "tracker_request_template_seconds", "Template render time per request, per URL name.", SECONDS_BUCKETS
+)
+
+HISTOGRAMS = [REQUEST_SECONDS, DB_QUERIES, DB_SECONDS, TEMPLATE_SECONDS]
+
+
+def render():
+    return "\n".join(histogram.render() for histogram in HISTOGRAMS) + "\n"
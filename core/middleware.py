@@ -0,0 +1,176 @@
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import request_finished
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from . import metrics
+from .routers import end_request, start_request
+
+PRIMARY_COOKIE = "tracker_primary"
+
+
+def pinned_to_primary(request):
+    return PRIMARY_COOKIE in request.COOKIES
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Resets database routing for each request and clears it when the
+    response is closed (after a streaming body has been sent). After a
+    request that wrote to the tracker tables it keeps the client on the
+    primary for TRACKER_REPLICA_STICKY_SECONDS (a cookie), so it reads its
+    own changes despite replication lag. Unused without
+    TRACKER_DB_REPLICAS.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TRACKER_DB_REPLICAS:
+            raise MiddlewareNotUsed
+        request_finished.connect(end_request, dispatch_uid="core.middleware.end_request")
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        writes = start_request()
+        return self.finish(request, self.get_response(request), writes)
+
+    async def __acall__(self, request):
+        writes = start_request()
+        return self.finish(request, await self.get_response(request), writes)
+
+    def finish(self, request, response, writes):
+        if writes:
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                "1",
+                max_age=settings.TRACKER_REPLICA_STICKY_SECONDS,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class RequestTimings:
+    __slots__ = ("queries", "db_seconds", "template_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        # None until a template response is rendered
+        self.template_seconds = None
+
+
+# Timings of the request being handled; contextvars follow the request
+# into sync_to_async threads, where the async ORM runs its queries
+_timings = ContextVar("request_timings", default=None)
+
+
+def time_query(execute, sql, params, many, context):
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db_seconds += time.perf_counter() - started
+
+
+def install_query_timer(sender, connection, **kwargs):
+    # Connections are per thread, so wrap each one as it connects
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+class RequestMetricsMiddleware:
+    """
+    Times each request, its SQL queries and its template rendering, sends
+    them back in a Server-Timing header and records them per URL name in
+    the core.metrics histograms. Streaming bodies (the export) are timed
+    up to the first byte. Unused unless TRACKER_METRICS is on.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TRACKER_METRICS:
+            raise MiddlewareNotUsed
+        connection_created.connect(install_query_timer, dispatch_uid="core.middleware.install_query_timer")
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(None, connection)
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # A sync hook would cost a thread hop per request under ASGI
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        token = _timings.set(RequestTimings())
+        try:
+            response = self.get_response(request)
+            return self.finish(request, response, time.perf_counter() - started)
+        finally:
+            _timings.reset(token)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        token = _timings.set(RequestTimings())
+        try:
+            response = await self.get_response(request)
+            return self.finish(request, response, time.perf_counter() - started)
+        finally:
+            _timings.reset(token)
+
+    def time_render(self, request, response):
+        # Called just before the handler renders the response
+        timings = _timings.get()
+        started = time.perf_counter()
+
+        def rendered(response):
+            timings.template_seconds = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def process_template_response(self, request, response):
+        return self.time_render(request, response)
+
+    async def aprocess_template_response(self, request, response):
+        return self.time_render(request, response)
+
+    def finish(self, request, response, duration):
+        timings = _timings.get()
+        # Unmatched URLs share one label to keep the series count bounded
+        view = request.resolver_match.view_name if request.resolver_match else "unresolved"
+        metrics.REQUEST_SECONDS.observe(view, duration)
+        metrics.DB_QUERIES.observe(view, timings.queries)
+        metrics.DB_SECONDS.observe(view, timings.db_seconds)
+
+        entries = [
+            f"total;dur={duration * 1000:.1f}",
+            f'db;dur={timings.db_seconds * 1000:.1f};desc="{timings.queries} queries"',
+        ]
+        if timings.template_seconds is not None:
+            metrics.TEMPLATE_SECONDS.observe(view, timings.template_seconds)
+            entries.append(f"tpl;dur={timings.template_seconds * 1000:.1f}")
+        response["Server-Timing"] = ", ".join(entries)
+        return response
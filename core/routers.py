@@ -0,0 +1,91 @@
+"""
+Primary/replica database routing.
+
+Writes always go to the primary ("default"). Reads of tracker models go to
+one of TRACKER_DB_REPLICAS only once a view has called use_replica() for
+the current request (tracker.mixins.ReplicaReadMixin); everything else,
+including sessions, users and the cache table, stays on the primary.
+ReplicaRoutingMiddleware resets both per request, clears them when the
+response is closed and keeps clients that just wrote on the primary.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Apps whose reads may be served by a replica, and whose writes pin the client
+REPLICA_APPS = {"tracker"}
+
+# Left set after the middleware returns, so streaming responses (the export)
+# still read from the replica, and cleared once the response is closed
+_replica = ContextVar("replica", default=None)
+_writes = ContextVar("writes", default=None)
+
+
+def use_replica():
+    """
+    Send this request's tracker reads to one replica, picked at random
+    (no-op without replicas).
+    """
+    replicas = settings.TRACKER_DB_REPLICAS
+    _replica.set(random.choice(replicas) if replicas else None)
+
+
+def use_primary():
+    """
+    Send the rest of this request's reads back to the primary, e.g. after
+    it wrote rows it is about to show.
+    """
+    _replica.set(None)
+
+
+def current_replica():
+    return _replica.get()
+
+
+def start_request():
+    """
+    Route reads to the primary and start recording writes; returns the
+    (live) list of models written.
+    """
+    writes = []
+    _replica.set(None)
+    _writes.set(writes)
+    return writes
+
+
+def end_request(**kwargs):
+    """
+    Back to the primary, recording nothing, so code that runs after the
+    response (later work on the same thread) never reads a replica. A
+    request_finished receiver.
+    """
+    _replica.set(None)
+    _writes.set(None)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = _replica.get()
+        if replica and model._meta.app_label in REPLICA_APPS:
+            return replica
+        return None
+
+    def db_for_write(self, model, **hints):
+        writes = _writes.get()
+        if writes is not None and model._meta.app_label in REPLICA_APPS:
+            writes.append(model._meta.label)
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        aliases = {"default", *settings.TRACKER_DB_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema through replication
+        if db in settings.TRACKER_DB_REPLICAS:
+            return False
+        return None
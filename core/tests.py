@@ -1,3 +1,167 @@
-from django.test import TestCase
+from contextlib import ExitStack
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.constants import EXPENSE
+from core.metrics import Histogram
+from core.middleware import PRIMARY_COOKIE, ReplicaRoutingMiddleware
+from core.routers import PrimaryReplicaRouter, current_replica, start_request, use_replica
+from tracker.models import Category, Transaction
+
+
+@override_settings(TRACKER_DB_REPLICAS=["replica1", "replica2"])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.writes = start_request()
+
+    def tearDown(self):
+        start_request()
+
+    def test_reads_use_primary_by_default(self):
+        self.assertIsNone(self.router.db_for_read(Transaction))
+
+    def test_replica_reads_only_for_tracker_models(self):
+        use_replica()
+        self.assertIn(self.router.db_for_read(Transaction), ["replica1", "replica2"])
+        self.assertIsNone(self.router.db_for_read(Session))
+
+    def test_one_replica_per_request(self):
+        use_replica()
+        self.assertEqual(len({self.router.db_for_read(Transaction) for _ in range(20)}), 1)
+
+    def test_writes_go_to_primary_and_are_recorded(self):
+        use_replica()
+        self.assertEqual(self.router.db_for_write(Transaction), "default")
+        self.assertEqual(self.router.db_for_write(Session), "default")
+        self.assertEqual(self.writes, ["tracker.Transaction"])
+
+    def test_routing_is_cleared_when_the_response_closes(self):
+        def view(request):
+            use_replica()
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(RequestFactory().get("/"))
+        # Still set while a streaming body would be sent
+        self.assertIsNotNone(current_replica())
+        response.close()
+        self.assertIsNone(current_replica())
+        self.assertIsNone(self.router.db_for_read(Transaction))
+        self.router.db_for_write(Transaction)
+        self.assertEqual(self.writes, [])
+
+    def test_no_migrations_on_replicas(self):
+        self.assertFalse(self.router.allow_migrate("replica1", "tracker"))
+        self.assertIsNone(self.router.allow_migrate("default", "tracker"))
+
+
+@skipUnless(settings.TRACKER_DB_REPLICAS, "set DB_REPLICA_HOSTS to route to a replica")
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Run with a replica alias, e.g. DB_REPLICA_HOSTS=$DB_HOST: in tests the
+    replicas mirror the primary's test database, over their own connections.
+    """
+
+    databases = {"default", *settings.TRACKER_DB_REPLICAS}
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("alice", password="pw12345!x")
+        self.category = Category.objects.create(user=self.user, name="Food")
+        self.client.force_login(self.user)
+
+    def tracker_queries(self, method, path, data=None):
+        """
+        Send a request; returns {alias: number of queries on tracker tables}.
+        """
+        with ExitStack() as stack:
+            captured = {
+                alias: stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in self.databases
+            }
+            response = getattr(self.client, method)(path, data)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        # Nothing after the response may read from the replica
+        self.assertIsNone(current_replica())
+        self.response = response
+        return {
+            alias: sum("tracker_" in query["sql"] for query in queries)
+            for alias, queries in captured.items()
+        }
+
+    def replica_count(self, counts):
+        return sum(counts[alias] for alias in settings.TRACKER_DB_REPLICAS)
+
+    def test_read_views_use_a_replica(self):
+        for name in ["transaction-list", "transaction-export", "analytics-summary", "analytics-categories"]:
+            counts = self.tracker_queries("get", reverse(name))
+            self.assertEqual(self.response.status_code, 200, name)
+            self.assertGreater(self.replica_count(counts), 0, name)
+            self.assertEqual(counts["default"], 0, name)
+
+    def test_writes_use_the_primary_and_pin_the_client(self):
+        counts = self.tracker_queries("post", reverse("transaction-add"), {
+            "raw_date": "2024-05-01",
+            "description": "Lunch",
+            "amount": "12.50",
+            "type": EXPENSE,
+            "category": self.category.pk,
+        })
+        self.assertEqual(self.response.status_code, 302)
+        self.assertEqual(self.replica_count(counts), 0)
+        cookie = self.response.cookies[PRIMARY_COOKIE]
+        self.assertEqual(cookie["max-age"], settings.TRACKER_REPLICA_STICKY_SECONDS)
+
+        # Sees its own write straight away
+        counts = self.tracker_queries("get", reverse("transaction-list"))
+        self.assertEqual(self.replica_count(counts), 0)
+        self.assertContains(self.response, "Lunch")
+
+    def test_reads_do_not_pin_the_client(self):
+        self.tracker_queries("get", reverse("transaction-list"))
+        self.assertNotIn(PRIMARY_COOKIE, self.response.cookies)
+
+
+class HistogramTests(SimpleTestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram("test_seconds", "Test.", (0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe('a "b"', value)
+        self.assertEqual(histogram.render().splitlines()[2:], [
+            'test_seconds_bucket{view="a \\"b\\"",le="0.1"} 2',
+            'test_seconds_bucket{view="a \\"b\\"",le="1"} 3',
+            'test_seconds_bucket{view="a \\"b\\"",le="+Inf"} 4',
+            'test_seconds_sum{view="a \\"b\\""} 3.650000',
+            'test_seconds_count{view="a \\"b\\""} 4',
+        ])
+
+
+class RequestMetricsTests(TestCase):
+    @override_settings(TRACKER_METRICS=True, TRACKER_METRICS_TOKEN="")
+    def test_server_timing_and_metrics(self):
+        response = self.client.get(reverse("login"))
+        self.assertRegex(response["Server-Timing"], r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+$')
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        self.assertContains(response, 'tracker_request_duration_seconds_count{view="login"}')
+        self.assertContains(response, 'tracker_request_template_seconds_count{view="login"}')
+
+    @override_settings(TRACKER_METRICS=True, TRACKER_METRICS_TOKEN="s3cret")
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+        response = self.client.get(reverse("metrics"), headers={"Authorization": "Bearer s3cret"})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(TRACKER_METRICS=False)
+    def test_disabled(self):
+        self.assertNotIn("Server-Timing", self.client.get(reverse("login")))
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
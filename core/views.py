@@ -1,3 +1,22 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views import View
 
-# Create your views here.
+from . import metrics
+
+
+class MetricsView(View):
+    """
+    Request histograms for Prometheus to scrape. Not found unless
+    TRACKER_METRICS is on; with TRACKER_METRICS_TOKEN set, scrapers must
+    send "Authorization: Bearer <token>".
+    """
+
+    def get(self, request, *args, **kwargs):
+        if not settings.TRACKER_METRICS:
+            raise Http404
+        token = settings.TRACKER_METRICS_TOKEN
+        if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+        return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,165 @@
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Q, Sum
+
+from .cache import acached_for_user, cached_for_user
+from .models import MonthlyRollup, Transaction
+
+ZERO = Decimal("0.00")
+
+# Each report is a query plus a pure function shaping its rows, so the
+# sync views and the async (ASGI) views share everything but the I/O and
+# read and write the same cache entries.
+
+
+def _percent(part, whole):
+    return round(part * 100 / whole, 1) if whole else ZERO
+
+
+def _breakdown_rows(user_id, start_date, end_date):
+    qs = Transaction.objects.filter(user_id=user_id)
+    if start_date:
+        qs = qs.filter(full_date__gte=start_date)
+    if end_date:
+        qs = qs.filter(full_date__lte=end_date)
+
+    # LEFT JOIN keeps SET_NULL rows as one "uncategorized" group
+    return (
+        qs.order_by()
+        .values("category_id", "category__name")
+        .annotate(
+            income=Sum("amount", filter=Q(amount__gt=0)),
+            expenses=Sum("amount", filter=Q(amount__lt=0)),
+            count=Count("id"),
+        )
+    )
+
+
+def _breakdown(rows):
+    total_income = sum((row["income"] or ZERO for row in rows), ZERO)
+    total_expenses = -sum((row["expenses"] or ZERO for row in rows), ZERO)
+    categories = []
+    for row in rows:
+        income = row["income"] or ZERO
+        expenses = -(row["expenses"] or ZERO)
+        categories.append({
+            "id": row["category_id"],
+            "name": row["category__name"] or "Uncategorized",
+            "count": row["count"],
+            "income": income,
+            "expenses": expenses,
+            "income_percent": _percent(income, total_income),
+            "expenses_percent": _percent(expenses, total_expenses),
+        })
+    categories.sort(key=lambda c: (-c["expenses"], -c["income"], c["name"]))
+
+    return {
+        "categories": categories,
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "count": sum(row["count"] for row in rows),
+    }
+
+
+def category_breakdown(user_id, start_date=None, end_date=None):
+    """
+    Per-category income, expenses, counts and shares for a date range,
+    from a single GROUP BY (cached per user and range).
+    """
+
+    def compute():
+        return _breakdown(list(_breakdown_rows(user_id, start_date, end_date)))
+
+    return cached_for_user(user_id, "category-breakdown", (start_date, end_date), compute)
+
+
+async def acategory_breakdown(user_id, start_date=None, end_date=None):
+    async def compute():
+        return _breakdown([row async for row in _breakdown_rows(user_id, start_date, end_date)])
+
+    return await acached_for_user(user_id, "category-breakdown", (start_date, end_date), compute)
+
+
+SUMMARY_AGGREGATES = {"income": Sum("income"), "expenses": Sum("expenses")}
+
+
+def _summary(totals):
+    income = totals["income"] or ZERO
+    expenses = totals["expenses"] or ZERO
+    return {"income": income, "expenses": expenses, "balance": income - expenses}
+
+
+def summary_totals(user_id):
+    """
+    Lifetime income, expenses and balance, summed from the user's rollups.
+    """
+
+    def compute():
+        return _summary(MonthlyRollup.objects.filter(user_id=user_id).aggregate(**SUMMARY_AGGREGATES))
+
+    return cached_for_user(user_id, "summary", (), compute)
+
+
+async def asummary_totals(user_id):
+    async def compute():
+        return _summary(await MonthlyRollup.objects.filter(user_id=user_id).aaggregate(**SUMMARY_AGGREGATES))
+
+    return await acached_for_user(user_id, "summary", (), compute)
+
+
+def _monthly_rows(user_id):
+    return (
+        MonthlyRollup.objects.filter(user_id=user_id)
+        .values("month")
+        .annotate(income=Sum("income"), expenses=Sum("expenses"), count=Sum("count"))
+        .order_by("-month")
+    )
+
+
+def _monthly(rows):
+    return [dict(m, net=m["income"] - m["expenses"]) for m in rows]
+
+
+def monthly_trend(user_id):
+    """
+    Income, expenses, net and count per month, newest first.
+    """
+
+    def compute():
+        return _monthly(_monthly_rows(user_id))
+
+    return cached_for_user(user_id, "monthly", (), compute)
+
+
+async def amonthly_trend(user_id):
+    async def compute():
+        return _monthly([row async for row in _monthly_rows(user_id)])
+
+    return await acached_for_user(user_id, "monthly", (), compute)
+
+
+def spending_trends(user_id, today):
+    """
+    Month-over-month change, savings rate, rolling spending and the
+    month-end projection, computed on the user's columnar frame.
+    """
+
+    def compute():
+        # Imported here so NumPy is only loaded by the pages that need it
+        from .analytics_engine import TransactionFrame
+
+        return TransactionFrame.for_user(user_id).trends(today)
+
+    return cached_for_user(user_id, "trends", (today,), compute)
+
+
+async def aspending_trends(user_id, today):
+    async def compute():
+        from .analytics_engine import TransactionFrame
+
+        frame = await TransactionFrame.afor_user(user_id)
+        # CPU-bound on large histories; keep it off the event loop
+        return await sync_to_async(frame.trends, thread_sensitive=False)(today)
+
+    return await acached_for_user(user_id, "trends", (today,), compute)
@@ -0,0 +1,355 @@
+"""
+JSON API for transactions, for mobile and sync clients.
+
+Authentication is the regular session. Writes must be sent as
+application/json, which browsers can't do cross-site without a CORS
+preflight, so the API skips the CSRF token round-trip.
+
+Every write goes through apply_batch(): one query for the user's
+categories, one for the rows being changed, then bulk INSERT / UPDATE /
+DELETE and a single rollup update inside one database transaction.
+Validation follows TransactionForm (same validators, same sign rule).
+"""
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from core.constants import INCOME, EXPENSE
+from .cache import bump_data_version
+from .dates import resolve_dates
+from .forms.transaction_form import normalize_amount, validate_amount, validate_description
+from .mixins import CursorPaginateMixin, PaginateByMixin
+from .models import Category, Transaction
+from .pagination import InvalidCursor
+from .read_models import transaction_rows
+from .rollups import apply_deltas, bucket_deltas
+from .views import TransactionFilterMixin
+
+MAX_BATCH_SIZE = 1000
+
+FIELDS = ("date", "description", "amount", "type", "category")
+
+# Transaction fields a batch item can change, as stored on the model
+STORED_FIELDS = ("full_date", "description", "amount", "type", "category_id")
+
+AMOUNT_FIELD = Transaction._meta.get_field("amount")
+
+REQUIRED = "This field is required."
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def serialize(t):
+    return {
+        "id": t.pk,
+        "date": t.full_date.isoformat(),
+        "description": t.description,
+        "amount": str(t.amount),
+        "type": t.type,
+        "category": t.category_id,
+    }
+
+
+def _is_id(value):
+    # JSON arrays and objects are unhashable; booleans are ints to Python
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def clean_item(data, category_ids, current=None):
+    """
+    Validated STORED_FIELDS values for a create (current is None) or an
+    update (only the fields present in `data` change). Raises
+    ValidationError with a {field: [messages]} dict.
+    """
+    if not isinstance(data, dict):
+        raise ValidationError({"__all__": ["Expected an object."]})
+
+    errors = {}
+    values = dict(current or {})
+    unknown = sorted(set(data) - set(FIELDS))
+    if unknown:
+        errors["__all__"] = [f"Unknown field(s): {', '.join(unknown)}."]
+
+    def check(field, clean):
+        if field not in data:
+            if current is None and field != "category":
+                errors[field] = [REQUIRED]
+            return
+        try:
+            clean(data[field])
+        except ValidationError as e:
+            errors[field] = e.messages
+
+    def clean_date(value):
+        try:
+            values["full_date"] = datetime.date.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValidationError("Enter a valid date (YYYY-MM-DD).")
+
+    def clean_description(value):
+        if not isinstance(value, str):
+            raise ValidationError("Enter a string.")
+        validate_description(value)
+        values["description"] = value
+
+    def clean_amount(value):
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValidationError("Enter a number.")
+        amount = AMOUNT_FIELD.clean(value, None)
+        validate_amount(amount)
+        values["amount"] = amount
+
+    def clean_type(value):
+        if value not in (INCOME, EXPENSE):
+            raise ValidationError(f"Select {INCOME} or {EXPENSE}.")
+        values["type"] = value
+
+    def clean_category(value):
+        if value is not None and (not _is_id(value) or value not in category_ids):
+            raise ValidationError("Select one of your categories or null.")
+        values["category_id"] = value
+
+    check("date", clean_date)
+    check("description", clean_description)
+    check("amount", clean_amount)
+    check("type", clean_type)
+    check("category", clean_category)
+    if errors:
+        raise ValidationError(errors)
+
+    values.setdefault("category_id", None)
+    # Same rule as TransactionForm.clean(): the type decides the sign
+    values["amount"] = normalize_amount(values["amount"], values["type"])
+    return values
+
+
+def apply_batch(user, operations, all_or_nothing=False):
+    """
+    Apply [{"op": "create", "data": {...}}, {"op": "update", "id": 1,
+    "data": {...}}, {"op": "delete", "id": 2}, ...] for `user`.
+    Invalid items are reported and skipped, or with all_or_nothing
+    nothing is written. Returns (results, applied).
+    """
+    if not isinstance(operations, list):
+        raise ApiError('"operations" must be a list.')
+    if len(operations) > MAX_BATCH_SIZE:
+        raise ApiError(f"At most {MAX_BATCH_SIZE} operations per batch.", status=413)
+
+    with transaction.atomic():
+        category_ids = set(Category.objects.filter(user=user).values_list("id", flat=True))
+        target_ids = {
+            item.get("id")
+            for item in operations
+            if isinstance(item, dict) and item.get("op") in ("update", "delete") and _is_id(item.get("id"))
+        }
+        # Locked until the batch commits, so the rollup deltas computed from
+        # these values can't race a concurrent edit
+        stored = {
+            row["id"]: row
+            for row in Transaction.objects.select_for_update()
+            .filter(user=user, pk__in=target_ids)
+            .values("id", *STORED_FIELDS)
+        }
+
+        results = []
+        creates, updates, deletes = [], [], []
+        seen = set()
+        for index, item in enumerate(operations):
+            result = {"index": index}
+            results.append(result)
+            op = item.get("op") if isinstance(item, dict) else None
+            result["op"] = op
+            try:
+                if op == "create":
+                    creates.append((result, clean_item(item.get("data"), category_ids)))
+                elif op in ("update", "delete"):
+                    pk = item.get("id")
+                    result["id"] = pk
+                    if not _is_id(pk):
+                        raise ValidationError({"id": ["Enter an integer."]})
+                    if pk not in stored:
+                        raise ValidationError({"id": ["No such transaction."]})
+                    if pk in seen:
+                        raise ValidationError({"id": ["Transaction appears more than once in this batch."]})
+                    seen.add(pk)
+                    previous = {field: stored[pk][field] for field in STORED_FIELDS}
+                    if op == "update":
+                        updates.append((result, pk, previous, clean_item(item.get("data"), category_ids, previous)))
+                    else:
+                        deletes.append((result, pk, previous))
+                else:
+                    raise ValidationError({"op": ['Expected "create", "update" or "delete".']})
+            except ValidationError as e:
+                result["status"] = "error"
+                result["errors"] = e.message_dict
+
+        failed = any(result.get("status") == "error" for result in results)
+        if failed and all_or_nothing:
+            for result in results:
+                result.setdefault("status", "skipped")
+            return results, False
+
+        if creates or updates or deletes:
+            _write(user, creates, updates, deletes)
+        return results, True
+
+
+def _rollup_row(user, values):
+    return (user.pk, values["full_date"], values["category_id"], values["amount"])
+
+
+def _write(user, creates, updates, deletes):
+    date_ids = resolve_dates(
+        {values["full_date"] for _, values in creates}
+        | {values["full_date"] for _, _, _, values in updates}
+    )
+
+    new = [
+        Transaction(user=user, date_id=date_ids[values["full_date"]], **values)
+        for _, values in creates
+    ]
+    Transaction.objects.bulk_create(new, batch_size=500)
+    for (result, _), t in zip(creates, new):
+        result.update(status="created", id=t.pk)
+
+    # bulk_update() skips auto_now, and the cached rows are keyed on updated_at
+    now = timezone.now()
+    changed = [
+        Transaction(pk=pk, user=user, date_id=date_ids[values["full_date"]], updated_at=now, **values)
+        for _, pk, _, values in updates
+    ]
+    Transaction.objects.bulk_update(
+        changed, ["full_date", "date", "description", "amount", "type", "category", "updated_at"], batch_size=500
+    )
+    for result, _, _, _ in updates:
+        result["status"] = "updated"
+
+    if deletes:
+        # One DELETE without signals or cascade collection (nothing
+        # references a Transaction); rollups and caches are updated below
+        doomed = Transaction.objects.filter(user=user, pk__in=[pk for _, pk, _ in deletes])
+        doomed._raw_delete(doomed.db)
+    for result, _, _ in deletes:
+        result["status"] = "deleted"
+
+    # Bulk writes send no signals, so maintain the rollups here
+    deltas = bucket_deltas([_rollup_row(user, values) for _, values in creates])
+    bucket_deltas([_rollup_row(user, values) for _, _, _, values in updates], deltas=deltas)
+    bucket_deltas(
+        [_rollup_row(user, previous) for _, _, previous, _ in updates]
+        + [_rollup_row(user, previous) for _, _, previous in deletes],
+        sign=-1,
+        deltas=deltas,
+    )
+    apply_deltas(deltas)
+    bump_data_version(user.pk)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class ApiView(View):
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "Authentication required."}, status=401)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as e:
+            return JsonResponse({"error": str(e)}, status=e.status)
+
+    def http_method_not_allowed(self, request, *args, **kwargs):
+        response = super().http_method_not_allowed(request, *args, **kwargs)
+        return JsonResponse({"error": "Method not allowed."}, status=405, headers={"Allow": response["Allow"]})
+
+    def read_json(self):
+        if self.request.content_type != "application/json":
+            raise ApiError("Send the body as application/json.", status=415)
+        try:
+            return json.loads(self.request.body)
+        except (UnicodeDecodeError, ValueError):
+            raise ApiError("Malformed JSON body.")
+
+
+class TransactionApiListView(PaginateByMixin, CursorPaginateMixin, TransactionFilterMixin, ApiView):
+    """
+    GET: the user's transactions, with the list page's ?sort=, ?q=,
+    ?category=, ?start_date= and ?end_date= filters, keyset-paginated
+    with ?cursor= and ?page_size=. POST: create one transaction.
+    """
+
+    paginate_by = 50
+
+    def get(self, request, *args, **kwargs):
+        # The list page ignores malformed filters; API clients are told
+        errors = self.get_filter_errors()
+        if errors:
+            raise ApiError(" ".join(f"{name}: {message}" for name, message in errors.items()))
+        rows = transaction_rows(self.get_queryset())
+        paginator = self.get_cursor_paginator(rows, self.get_paginate_by(None))
+        try:
+            page = paginator.page(request.GET.get(self.cursor_param))
+        except InvalidCursor as e:
+            raise ApiError(str(e))
+        return JsonResponse({
+            "results": [serialize(t) for t in page],
+            "next": page.next_cursor,
+            "previous": page.previous_cursor,
+        })
+
+    def post(self, request, *args, **kwargs):
+        (result,), _ = apply_batch(request.user, [{"op": "create", "data": self.read_json()}])
+        if result["status"] == "error":
+            return JsonResponse({"errors": result["errors"]}, status=400)
+        return JsonResponse(serialize(Transaction.objects.get(pk=result["id"])), status=201)
+
+
+class TransactionApiDetailView(ApiView):
+    """
+    GET, PATCH (only the fields sent change) or DELETE one transaction.
+    """
+
+    def get_object(self):
+        try:
+            return Transaction.objects.get(user=self.request.user, pk=self.kwargs["pk"])
+        except Transaction.DoesNotExist:
+            raise ApiError("Not found.", status=404)
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(serialize(self.get_object()))
+
+    def patch(self, request, *args, **kwargs):
+        data = self.read_json()
+        pk = self.get_object().pk
+        (result,), _ = apply_batch(request.user, [{"op": "update", "id": pk, "data": data}])
+        if result["status"] == "error":
+            return JsonResponse({"errors": result["errors"]}, status=400)
+        return JsonResponse(serialize(self.get_object()))
+
+    def delete(self, request, *args, **kwargs):
+        apply_batch(request.user, [{"op": "delete", "id": self.get_object().pk}])
+        return HttpResponse(status=204)
+
+
+class TransactionApiBatchView(ApiView):
+    """
+    POST {"operations": [...], "all_or_nothing": false}: see apply_batch.
+    Responds 200 with one result per operation, in order; with
+    all_or_nothing and any invalid item, 400 and nothing is written.
+    """
+
+    def post(self, request, *args, **kwargs):
+        body = self.read_json()
+        if not isinstance(body, dict):
+            raise ApiError('Expected an object with an "operations" list.')
+        all_or_nothing = bool(body.get("all_or_nothing", False))
+        results, applied = apply_batch(request.user, body.get("operations"), all_or_nothing)
+        return JsonResponse({"applied": applied, "results": results}, status=200 if applied else 400)
@@ -0,0 +1,164 @@
+"""
+Async versions of the read-heavy pages, for ASGI deployments.
+
+Under ASGI every sync view is run in a worker thread. These views await
+the user, the queries and the cache instead, and only hand the finished
+context to the template. They are routed when TRACKER_ASYNC_VIEWS is on
+(see tracker/urls.py); under WSGI each would need its own event loop, so
+the sync views stay the default.
+"""
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
+from django.utils import timezone
+from django.views.generic import TemplateView
+
+from core.routers import use_primary
+
+from tracker.analytics import acategory_breakdown, amonthly_trend, aspending_trends, asummary_totals
+from tracker.cache import cache_stats
+from tracker.categories import auser_categories
+from tracker.counting import acount_transactions
+from tracker.fragments import afragment_context
+from tracker.forms.analytics_form import DateRangeForm
+from tracker.recurring import arefresh_if_stale, upcoming_series
+from .mixins import ReplicaReadMixin
+from .models import RecurringSeries
+from .pagination import InvalidCursor
+from .views import TransactionListView
+
+
+class AsyncLoginRequiredMixin(LoginRequiredMixin):
+    """
+    LoginRequiredMixin for views with async handlers.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        # request.user would load the user with a sync query on first use
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super(LoginRequiredMixin, self).dispatch(request, *args, **kwargs)
+
+
+class AsyncTemplateView(AsyncLoginRequiredMixin, ReplicaReadMixin, TemplateView):
+    login_url = "login"
+    redirect_field_name = "next"
+
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(await self.aget_context_data(**kwargs))
+
+    async def aget_context_data(self, **kwargs):
+        return self.get_context_data(**kwargs)
+
+
+# Transactions
+class AsyncTransactionListView(AsyncLoginRequiredMixin, TransactionListView):
+    """
+    TransactionListView with the count, the page and the categories
+    fetched through the async ORM. Same filters, sorts and templates.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = queryset = self.get_queryset()
+        page_size = self.get_paginate_by(queryset)
+
+        if self.is_cursor_mode():
+            paginator = self.get_cursor_paginator(queryset, page_size)
+            try:
+                page = await paginator.apage(request.GET.get(self.cursor_param))
+            except InvalidCursor as e:
+                raise Http404(str(e))
+        else:
+            self.row_count = await acount_transactions(request.user.pk, queryset, self.get_filters())
+            paginator, page, _, _ = self.paginate_queryset(queryset, page_size)
+            page.object_list = [t async for t in page.object_list]
+
+        context = {
+            "view": self,
+            "paginator": paginator,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+            "object_list": page.object_list,
+            self.context_object_name: page.object_list,
+            "supports_cursor": True,
+            "cursor_mode": self.is_cursor_mode(),
+            "categories": await auser_categories(request.user.pk),
+            **self.get_querystrings(),
+            **await afragment_context(request.user.pk, page.object_list),
+        }
+        return self.render_to_response(context)
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        # Counted in get(), skipping TransactionListView's sync count
+        return super(TransactionListView, self).get_paginator(queryset, per_page, row_count=self.row_count, **kwargs)
+
+
+# Analytics
+class AsyncAnalyticsHomeView(AsyncTemplateView):
+    template_name = "tracker/analytics/home.html"
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        if self.request.user.is_staff:
+            context["cache_stats"] = cache_stats()
+        return context
+
+
+class AsyncAnalyticsSummaryView(AsyncTemplateView):
+    template_name = "tracker/analytics/summary.html"
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context.update(await asummary_totals(self.request.user.pk))
+        return context
+
+
+class AsyncAnalyticsMonthlyView(AsyncTemplateView):
+    template_name = "tracker/analytics/monthly.html"
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context["months"] = await amonthly_trend(self.request.user.pk)
+        return context
+
+
+class AsyncAnalyticsCategoriesView(AsyncTemplateView):
+    template_name = "tracker/analytics/categories.html"
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+
+        form = DateRangeForm(self.request.GET)
+        start_date = end_date = None
+        if form.is_valid():
+            start_date = form.cleaned_data["start_date"]
+            end_date = form.cleaned_data["end_date"]
+
+        context["form"] = form
+        context["breakdown"] = await acategory_breakdown(self.request.user.pk, start_date, end_date)
+        return context
+
+
+class AsyncAnalyticsTrendsView(AsyncTemplateView):
+    template_name = "tracker/analytics/trends.html"
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context.update(await aspending_trends(self.request.user.pk, timezone.localdate()))
+        return context
+
+
+class AsyncAnalyticsRecurringView(AsyncTemplateView):
+    template_name = "tracker/analytics/recurring.html"
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+
+        today = timezone.localdate()
+        if await arefresh_if_stale(self.request.user.pk, today):
+            use_primary()
+        series = RecurringSeries.objects.filter(user=self.request.user).order_by("description")
+        context["today"] = today
+        context["upcoming"] = [s async for s in upcoming_series(self.request.user.pk, today)]
+        context["series"] = [s async for s in series]
+        return context
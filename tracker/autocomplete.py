@@ -0,0 +1,220 @@
+"""
+Description and category suggestions for the transaction form.
+
+Each process keeps a small LRU of per-user prefix indexes, built lazily on
+the first lookup from two GROUP BY queries and thrown away when the user's
+data version (tracker.cache) changes, i.e. after any write. Entries are
+ranked once at build time by how often and how recently they were used, so
+a lookup is a bisect over sorted words plus a walk in rank order.
+"""
+import bisect
+import heapq
+import itertools
+import re
+import threading
+from collections import OrderedDict
+
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .cache import data_version
+from .models import Category, Transaction
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+
+# What a warm lookup should take at the 99th percentile (100k transactions)
+TARGET_P99_MS = 10
+
+# Users whose index stays in memory per process
+MAX_INDEXED_USERS = 256
+
+# A use this many days ago counts half as much as one today
+HALF_LIFE_DAYS = 90
+
+# Prefixes this short cover too many words to merge per request, so their
+# best candidates are precomputed
+SHORT_PREFIX = 2
+SHORT_CANDIDATES = 200
+
+WORD = re.compile(r"\w+")
+
+
+def words(text):
+    # Reference and card numbers would only bloat the index
+    return [word for word in WORD.findall(text.casefold()) if not word.isdigit()]
+
+
+def frecency(count, last_used, today):
+    if last_used is None:
+        return 0.0
+    age = max((today - last_used).days, 0)
+    return count * 0.5 ** (age / HALF_LIFE_DAYS)
+
+
+class Suggestion:
+    __slots__ = ("text", "count", "last_used", "category_id", "score", "words")
+
+    def __init__(self, text, count, last_used, category_id, score):
+        self.text = text
+        self.count = count
+        self.last_used = last_used
+        self.category_id = category_id
+        self.score = score
+        self.words = words(text)
+
+
+class PrefixIndex:
+    """
+    Word-prefix lookup over suggestions. Suggestions are stored best-first,
+    so a suggestion's position is its rank; each word keeps the ranks it
+    appears in, ascending, and a prefix lazily merges the lists of the
+    words it covers to yield matches best-first.
+    """
+
+    def __init__(self, suggestions):
+        self.suggestions = sorted(suggestions, key=lambda s: (-s.score, s.text.casefold()))
+        postings = {}
+        for rank, suggestion in enumerate(self.suggestions):
+            for word in set(suggestion.words):
+                postings.setdefault(word, []).append(rank)
+        self.words = sorted(postings)
+        self.postings = [postings[word] for word in self.words]
+
+        # First SHORT_CANDIDATES ranks per short prefix, in one pass best-first
+        self.short = {}
+        for rank, suggestion in enumerate(self.suggestions):
+            for prefix in {word[:length] for word in suggestion.words for length in range(1, SHORT_PREFIX + 1)}:
+                ranks = self.short.setdefault(prefix, [])
+                if len(ranks) < SHORT_CANDIDATES:
+                    ranks.append(rank)
+
+    def _merged(self, prefix):
+        lo = bisect.bisect_left(self.words, prefix)
+        hi = bisect.bisect_left(self.words, prefix + "\U0010ffff", lo)
+        if hi - lo == 1:
+            return iter(self.postings[lo])
+        # A suggestion with two words sharing the prefix shows up twice
+        return (rank for rank, _ in itertools.groupby(heapq.merge(*self.postings[lo:hi])))
+
+    def _candidates(self, prefix):
+        if len(prefix) <= SHORT_PREFIX:
+            return self.short.get(prefix, ())
+        return self._merged(prefix)
+
+    def lookup(self, query, limit):
+        tokens = words(query)
+        if not tokens:
+            return self.suggestions[:limit]
+        # Walk the longest token's matches best-first and check the
+        # other tokens against each candidate's words
+        others = sorted(tokens, key=len)
+        key = others.pop()
+        found = []
+        for rank in self._candidates(key):
+            suggestion = self.suggestions[rank]
+            if all(any(word.startswith(token) for word in suggestion.words) for token in others):
+                found.append(suggestion)
+                if len(found) == limit:
+                    break
+        return found
+
+
+class UserIndex:
+    def __init__(self, descriptions, categories):
+        self.descriptions = descriptions
+        self.categories = categories
+
+
+def build_index(user_id, today):
+    # One row per (description, category): the category a description is
+    # most often filed under is suggested along with it
+    rows = (
+        Transaction.objects.filter(user_id=user_id)
+        .order_by()
+        .values_list("description", "category_id")
+        .annotate(count=Count("id"), last_used=Max("full_date"))
+    )
+    merged = {}
+    for description, category_id, count, last_used in rows:
+        text = " ".join(description.split())
+        if not text:
+            continue
+        # "NETFLIX.COM #1586" and "Netflix.com #1881" are one suggestion
+        key = " ".join(words(text)) or text.casefold()
+        entry = merged.setdefault(key, [text, 0, last_used, {}])
+        if last_used > entry[2]:
+            # Show the spelling used most recently
+            entry[0], entry[2] = text, last_used
+        entry[1] += count
+        if category_id is not None:
+            entry[3][category_id] = entry[3].get(category_id, 0) + count
+
+    descriptions = PrefixIndex(
+        Suggestion(
+            text,
+            count,
+            last_used,
+            max(categories, key=categories.get) if categories else None,
+            frecency(count, last_used, today),
+        )
+        for text, count, last_used, categories in merged.values()
+    )
+
+    category_rows = (
+        Category.objects.filter(user_id=user_id)
+        .order_by()
+        .values_list("id", "name")
+        .annotate(count=Count("transactions"), last_used=Max("transactions__full_date"))
+    )
+    categories = PrefixIndex(
+        Suggestion(name, count, last_used, category_id, frecency(count, last_used, today))
+        for category_id, name, count, last_used in category_rows
+    )
+    return UserIndex(descriptions, categories)
+
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_index(user_id):
+    version = data_version(user_id)
+    today = timezone.localdate()
+    with _lock:
+        cached = _indexes.get(user_id)
+        if cached and cached[0] == (version, today):
+            _indexes.move_to_end(user_id)
+            return cached[1]
+
+    # Built outside the lock; a concurrent duplicate build is harmless
+    index = build_index(user_id, today)
+    with _lock:
+        _indexes[user_id] = ((version, today), index)
+        _indexes.move_to_end(user_id)
+        while len(_indexes) > MAX_INDEXED_USERS:
+            _indexes.popitem(last=False)
+    return index
+
+
+def suggest(user_id, query, limit=DEFAULT_LIMIT):
+    """
+    Best-ranked past descriptions and categories with a word starting
+    with each word of `query`, as JSON-ready dicts.
+    """
+    index = get_index(user_id)
+    return {
+        "descriptions": [
+            {
+                "text": s.text,
+                "count": s.count,
+                "last_used": s.last_used.isoformat(),
+                "category_id": s.category_id,
+            }
+            for s in index.descriptions.lookup(query, limit)
+        ],
+        "categories": [
+            {"id": s.category_id, "name": s.text, "count": s.count}
+            for s in index.categories.lookup(query, limit)
+        ],
+    }
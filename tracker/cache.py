@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from core.routers import current_replica
+
+# Bump-only per-user counter; any cached result keyed on an older
+# version is simply never read again and ages out of the cache
+VERSION_KEY = "tracker:data-version:{user_id}"
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    # Resolved per call: caches[...] is thread-local and overridable in tests
+    return caches[settings.TRACKER_CACHE_ALIAS]
+
+
+def data_version(user_id):
+    cache = get_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter can't restart at a
+        # value that older cached results were stored under
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def adata_version(user_id):
+    cache = get_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def _bump(user_id):
+    cache = get_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_data_version(user_id, using=None):
+    """
+    Invalidate every cached result for the user. Called on each write to the
+    user's transactions or categories (on database `using`); bumped again on
+    commit so a reader that cached pre-commit data under the new version
+    doesn't keep it.
+    """
+    _bump(user_id)
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: _bump(user_id), using=using)
+
+
+def count_lookup(name, outcome):
+    with _stats_lock:
+        _stats[(name, outcome)] += 1
+
+
+def cache_stats():
+    """
+    Hit/miss counters of this process: {name: {"hits": n, "misses": n}}.
+    """
+    with _stats_lock:
+        items = list(_stats.items())
+    stats = {}
+    for (name, outcome), count in sorted(items):
+        stats.setdefault(name, {"hits": 0, "misses": 0})[outcome] = count
+    return stats
+
+
+def _result_key(name, user_id, version, params):
+    return f"tracker:{name}:{user_id}:{version}:" + ":".join(map(str, params))
+
+
+def cache_timeout(timeout=None):
+    """
+    How long to keep a result read in this request: `timeout`, by default
+    TRACKER_CACHE_TIMEOUT, capped while reading from a replica.
+    """
+    timeout = settings.TRACKER_CACHE_TIMEOUT if timeout is None else timeout
+    if current_replica():
+        # A lagging replica may return rows older than the version this is
+        # stored under, so keep it no longer than clients stay pinned
+        return min(timeout, settings.TRACKER_REPLICA_STICKY_SECONDS)
+    return timeout
+
+
+def cached_for_user(user_id, name, params, compute, timeout=None):
+    """
+    Return compute() cached under the user's current data version.
+    `params` is a tuple of the values the result depends on.
+    """
+    cache = get_cache()
+    key = _result_key(name, user_id, data_version(user_id), params)
+    result = cache.get(key)
+    if result is not None:
+        count_lookup(name, "hits")
+        return result
+
+    count_lookup(name, "misses")
+    result = compute()
+    cache.set(key, result, cache_timeout(timeout))
+    return result
+
+
+async def acached_for_user(user_id, name, params, compute, timeout=None):
+    """
+    Async cached_for_user(); `compute` is a coroutine function. Shares
+    keys with the sync version, so either one can warm the cache.
+    """
+    cache = get_cache()
+    key = _result_key(name, user_id, await adata_version(user_id), params)
+    result = await cache.aget(key)
+    if result is not None:
+        count_lookup(name, "hits")
+        return result
+
+    count_lookup(name, "misses")
+    result = await compute()
+    await cache.aset(key, result, cache_timeout(timeout))
+    return result
@@ -0,0 +1,70 @@
+"""
+Per-user category options, cached for the list filters and the
+transaction form.
+
+Unlike the results in cache.py these aren't keyed by the data version:
+adding a transaction doesn't change the categories, so only category
+writes (signals, and the bulk creates that skip them) forget the list.
+"""
+from collections import namedtuple
+
+from django.db import transaction
+
+from .cache import cache_timeout, count_lookup, get_cache
+from .models import Category
+
+CATEGORIES_KEY = "tracker:categories:{user_id}"
+
+CategoryOption = namedtuple("CategoryOption", ["id", "name", "is_income"])
+
+
+def _options(rows):
+    return [CategoryOption(*row) for row in rows]
+
+
+def _queryset(user_id):
+    # Meta.ordering sorts them by name
+    return Category.objects.filter(user_id=user_id).values_list("id", "name", "is_income")
+
+
+def user_categories(user_id):
+    """
+    The user's categories as CategoryOptions, sorted by name.
+    """
+    cache = get_cache()
+    key = CATEGORIES_KEY.format(user_id=user_id)
+    options = cache.get(key)
+    if options is not None:
+        count_lookup("categories", "hits")
+        return options
+
+    count_lookup("categories", "misses")
+    options = _options(_queryset(user_id))
+    cache.set(key, options, cache_timeout())
+    return options
+
+
+async def auser_categories(user_id):
+    cache = get_cache()
+    key = CATEGORIES_KEY.format(user_id=user_id)
+    options = await cache.aget(key)
+    if options is not None:
+        count_lookup("categories", "hits")
+        return options
+
+    count_lookup("categories", "misses")
+    options = _options([row async for row in _queryset(user_id)])
+    await cache.aset(key, options, cache_timeout())
+    return options
+
+
+def forget_categories(user_id, using=None):
+    """
+    Drop the user's cached categories; again when the write's transaction
+    on database `using` commits, in case a reader cached the old list
+    before the write was visible.
+    """
+    key = CATEGORIES_KEY.format(user_id=user_id)
+    get_cache().delete(key)
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: get_cache().delete(key), using=using)
@@ -0,0 +1,169 @@
+"""
+Row counts for the numbered list pages, without COUNT(*) over every row.
+
+- Unfiltered and category-only transaction lists add up the user's
+  MonthlyRollup counts, a counter table kept in step with every write.
+- Other filters ask PostgreSQL's planner first and show its estimate for
+  big results; otherwise (and on other databases) they count at most
+  COUNT_CAP + 1 rows and show "1,000+" beyond that.
+
+Counts are cached under the user's data version, so paging through one
+search counts it once.
+"""
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Sum
+
+from .cache import acached_for_user, cached_for_user
+from .models import MonthlyRollup
+
+COUNT_CAP = 1000
+
+# Above this the planner's estimate is shown instead of a capped count
+ESTIMATE_THRESHOLD = 10000
+
+
+class RowCount:
+    """
+    A listing's number of rows: exact, at least `value`, or the planner's
+    estimate.
+    """
+
+    __slots__ = ("value", "exact", "estimated")
+
+    def __init__(self, value, exact=True, estimated=False):
+        self.value = value
+        self.exact = exact
+        self.estimated = estimated
+
+    def __str__(self):
+        if self.exact:
+            return f"{self.value:,}"
+        if self.estimated:
+            return f"about {self.value:,}"
+        return f"{self.value:,}+"
+
+
+def _rollups(user_id, category_id):
+    rollups = MonthlyRollup.objects.filter(user_id=user_id)
+    if category_id is not None:
+        rollups = rollups.filter(category_id=category_id)
+    return rollups
+
+
+def planner_estimate(queryset):
+    plan = queryset.order_by().explain(format="json")
+    return int(json.loads(plan)[0]["Plan"]["Plan Rows"])
+
+
+def _from_capped(count):
+    if count > COUNT_CAP:
+        return RowCount(COUNT_CAP, exact=False)
+    return RowCount(count)
+
+
+def _count_params(filters):
+    # Only the category filter can be answered from the rollups
+    if filters.keys() <= {"category"}:
+        return ("rollups", filters.get("category"))
+    # Search text is free-form; keep it out of the cache key
+    digest = hashlib.sha256(repr(sorted(filters.items())).encode()).hexdigest()
+    return ("filtered", digest)
+
+
+def _capped(queryset):
+    return queryset.order_by()[: COUNT_CAP + 1]
+
+
+def count_transactions(user_id, queryset, filters):
+    """
+    RowCount of `queryset`, the user's transactions narrowed by `filters`
+    (TransactionFilterMixin.get_filters()).
+    """
+    params = _count_params(filters)
+
+    def compute():
+        if params[0] == "rollups":
+            total = _rollups(user_id, params[1]).aggregate(total=Sum("count"))["total"]
+            return RowCount(total or 0)
+        if connections[queryset.db].vendor == "postgresql":
+            estimate = planner_estimate(queryset)
+            if estimate > ESTIMATE_THRESHOLD:
+                return RowCount(estimate, exact=False, estimated=True)
+        return _from_capped(_capped(queryset).count())
+
+    return cached_for_user(user_id, "row-count", params, compute)
+
+
+async def acount_transactions(user_id, queryset, filters):
+    params = _count_params(filters)
+
+    async def compute():
+        if params[0] == "rollups":
+            total = (await _rollups(user_id, params[1]).aaggregate(total=Sum("count")))["total"]
+            return RowCount(total or 0)
+        if connections[queryset.db].vendor == "postgresql":
+            estimate = await sync_to_async(planner_estimate)(queryset)
+            if estimate > ESTIMATE_THRESHOLD:
+                return RowCount(estimate, exact=False, estimated=True)
+        return _from_capped(await _capped(queryset).acount())
+
+    return await acached_for_user(user_id, "row-count", params, compute)
+
+
+class CountedPage(Page):
+    """
+    Without an exact count, "next" is offered while pages come back full.
+    """
+
+    def has_next(self):
+        if self.paginator.count_exact:
+            return super().has_next()
+        return len(self) == self.paginator.per_page
+
+    def end_index(self):
+        if self.paginator.count_exact:
+            return super().end_index()
+        return (self.number - 1) * self.paginator.per_page + len(self)
+
+
+class CountingPaginator(Paginator):
+    """
+    Paginator taking its count from a RowCount instead of COUNT(*). When
+    the count isn't exact any page number is accepted, so pages past the
+    cap or a low estimate are still reachable.
+    """
+
+    def __init__(self, object_list, per_page, row_count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.row_count = row_count
+        # Paginator.count is a cached_property
+        self.count = row_count.value
+        self.count_exact = row_count.exact
+
+    def validate_number(self, number):
+        if self.count_exact:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        if self.count_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom : bottom + self.per_page], number, self)
+
+    def _get_page(self, *args, **kwargs):
+        return CountedPage(*args, **kwargs)
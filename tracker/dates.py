@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+
+from django.db import router, transaction
+
+from .models import Date
+
+# Roughly eleven years of days per process
+CACHE_SIZE = 4096
+
+# Keeps IN (...) lists and multi-row INSERTs under SQLite's variable limit
+BATCH_SIZE = 500
+
+
+def build_date(day):
+    """
+    Unsaved Date dimension row for a calendar day.
+    """
+    return Date(
+        full_date=day,
+        year=day.year,
+        month=day.month,
+        day=day.day,
+        weekday=day.strftime("%A"),
+        quarter=(day.month - 1) // 3 + 1,
+    )
+
+
+class DateResolver:
+    """
+    Maps calendar days to Date dimension ids, creating missing rows.
+
+    Resolved ids are kept in a bounded per-process LRU cache, so warm writes
+    don't touch the Date table at all. Missing rows are inserted with
+    ON CONFLICT DO NOTHING and re-read, so two requests creating the same
+    day concurrently both end up with the winner's id instead of one of
+    them failing on the full_date unique constraint.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, day, using=None):
+        return self.resolve_many([day], using=using)[day]
+
+    def resolve_many(self, days, using=None):
+        """
+        Return {day: Date id} for every day in `days`.
+        """
+        using = using or router.db_for_write(Date)
+        resolved = {}
+        missing = []
+        with self._lock:
+            for day in set(days):
+                key = (using, day)
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    resolved[day] = self._cache[key]
+                else:
+                    missing.append(day)
+
+        if not missing:
+            return resolved
+
+        found = self._fetch(missing, using)
+        absent = [day for day in missing if day not in found]
+        if absent:
+            Date.objects.using(using).bulk_create(
+                [build_date(day) for day in absent],
+                batch_size=BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+            # Picks up our rows and any a concurrent writer inserted first
+            found.update(self._fetch(absent, using))
+
+        # Only cache ids once they are committed; a rolled back insert
+        # must not leave a dangling id behind
+        transaction.on_commit(lambda: self._remember(using, found), using=using)
+        resolved.update(found)
+        return resolved
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _fetch(self, days, using):
+        found = {}
+        for i in range(0, len(days), BATCH_SIZE):
+            rows = Date.objects.using(using).filter(full_date__in=days[i : i + BATCH_SIZE])
+            found.update(rows.values_list("full_date", "id"))
+        return found
+
+    def _remember(self, using, found):
+        with self._lock:
+            for day, pk in found.items():
+                self._cache[(using, day)] = pk
+                self._cache.move_to_end((using, day))
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+
+date_resolver = DateResolver()
+
+
+def resolve_date(day, using=None):
+    return date_resolver.resolve(day, using=using)
+
+
+def resolve_dates(days, using=None):
+    return date_resolver.resolve_many(days, using=using)
@@ -0,0 +1,51 @@
+import csv
+import json
+
+# Same columns the CSV importer reads, so an export can be imported again
+EXPORT_COLUMNS = ["date", "description", "amount", "type", "category"]
+EXPORT_FIELDS = ["full_date", "description", "amount", "type", "category__name"]
+
+# Rows fetched per round-trip from the server-side cursor
+CHUNK_SIZE = 2000
+
+
+class Echo:
+    """
+    File-like object whose write() hands the line back instead of storing it,
+    so csv.writer can format one row at a time for a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=CHUNK_SIZE):
+    # values_list skips model instantiation; iterator() streams from a
+    # server-side cursor on Postgres instead of loading the whole result
+    return queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def stream_csv(queryset):
+    writer = csv.writer(Echo())
+    # The header goes out before the query has even been sent
+    yield writer.writerow(EXPORT_COLUMNS)
+    for full_date, description, amount, t_type, category in export_rows(queryset):
+        yield writer.writerow([full_date.isoformat(), description, amount, t_type, category or ""])
+
+
+def stream_ndjson(queryset):
+    for full_date, description, amount, t_type, category in export_rows(queryset):
+        row = {
+            "date": full_date.isoformat(),
+            "description": description,
+            "amount": str(amount),
+            "type": t_type,
+            "category": category,
+        }
+        yield json.dumps(row) + "\n"
+
+
+EXPORTERS = {
+    "csv": (stream_csv, "text/csv"),
+    "ndjson": (stream_ndjson, "application/x-ndjson"),
+}
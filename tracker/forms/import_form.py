@@ -0,0 +1,10 @@
+from django import forms
+from tracker.importers import PARSERS
+
+
+class TransactionImportForm(forms.Form):
+    file = forms.FileField(label="Statement file")
+    format = forms.ChoiceField(
+        choices=[("", "Detect from file name")] + [(name, name.upper()) for name in sorted(PARSERS)],
+        required=False,
+    )
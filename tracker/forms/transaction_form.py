@@ -1,7 +1,31 @@
 from django import forms
-from tracker.models import Transaction, Date, Category
+from tracker.models import Transaction, Category
+from tracker.categories import user_categories
+from tracker.dates import resolve_date
 from core.constants import INCOME, EXPENSE, TRANSACTION_TYPE_CHOICES
 
+
+def validate_amount(amount):
+    if amount == 0:
+        raise forms.ValidationError("Amount cannot be zero.")
+
+
+def validate_description(description):
+    if not description.strip():
+        raise forms.ValidationError("Description cannot be empty.")
+
+
+def normalize_amount(amount, t_type):
+    # Auto-normalize sign
+    if t_type == INCOME:
+        return abs(amount)  # always positive
+
+    elif t_type == EXPENSE:
+        return -abs(amount)  # always negative
+
+    return amount
+
+
 class TransactionForm(forms.ModelForm):
     type = forms.ChoiceField(
         choices=TRANSACTION_TYPE_CHOICES, 
@@ -27,49 +51,40 @@ class TransactionForm(forms.ModelForm):
 
         # Filter categories by logged-in user
         if self.user is not None:
-            self.fields["category"].queryset = Category.objects.filter(user=self.user)
+            field = self.fields["category"]
+            field.queryset = Category.objects.filter(user=self.user)
+            # Options come from the cache when rendered; the queryset only
+            # checks the submitted one
+            field.choices = lambda: [("", field.empty_label)] + [
+                (c.id, c.name) for c in user_categories(self.user.pk)
+            ]
         # Pre-fill date if editing
         if self.instance and self.instance.pk:
-            self.fields["raw_date"].initial = self.instance.date.full_date
+            self.fields["raw_date"].initial = self.instance.full_date
 
     def clean_amount(self):
         amount = self.cleaned_data.get("amount")
-        t_type = self.cleaned_data.get("type")
-
-        if amount == 0:
-            raise forms.ValidationError("Amount cannot be zero.")
-
-        # Auto-normalize sign
-        if t_type == INCOME:
-            return abs(amount)  # always positive
-
-        elif t_type == EXPENSE:
-            return -abs(amount)  # always negative
-
+        validate_amount(amount)
         return amount
 
     def clean_description(self):
         description = self.cleaned_data.get("description")
-        if not description.strip():
-            raise forms.ValidationError("Description cannot be empty.")
+        validate_description(description)
         return description
 
+    def clean(self):
+        cleaned_data = super().clean()
+        # Sign normalization needs both fields, and `type` is cleaned after `amount`
+        amount = cleaned_data.get("amount")
+        if amount is not None:
+            cleaned_data["amount"] = normalize_amount(amount, cleaned_data.get("type"))
+        return cleaned_data
+
     def save(self, commit=True):
         # get the cleaned date from the HTML input
         raw_date = self.cleaned_data["raw_date"]
 
-        # map to date dimension
-        date_obj, _ = Date.objects.get_or_create(
-            full_date=raw_date,
-            defaults={
-                "year": raw_date.year,
-                "month": raw_date.month,
-                "day": raw_date.day,
-                "weekday": raw_date.strftime("%A"),
-                "quarter": (raw_date.month - 1) // 3 + 1,
-            },
-        )
-
-        # replace raw date with date dimension object
-        self.instance.date = date_obj
+        # store the calendar date on the row, keep the dimension for analytics
+        self.instance.full_date = raw_date
+        self.instance.date_id = resolve_date(raw_date)
         return super().save(commit=commit)
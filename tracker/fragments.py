@@ -0,0 +1,67 @@
+"""
+Cached HTML for the transaction table.
+
+The table body is a {% cache %} fragment keyed by the user's data version
+and the page's query string, so any write by the user starts a new one.
+Inside it, each row is cached by pk, modification stamp (updated_at) and
+category name and fetched with one get_many(): after an edit only the
+changed row is rendered again, as long as the write path sets updated_at
+(save() does; bulk_update() callers must set it themselves). On a table
+hit the page isn't even queried.
+"""
+import hashlib
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .cache import adata_version, cache_timeout, data_version, get_cache
+
+ROW_TEMPLATE = "tracker/transactions/_row.html"
+
+
+def row_key(row):
+    # Category names may hold spaces, which memcached keys can't
+    category = hashlib.md5((row.category_name or "").encode()).hexdigest()
+    return f"tracker:row:{row.pk}:{row.updated_at.timestamp()}:{category}"
+
+
+def render_rows(transactions):
+    """
+    The <tr> elements for `transactions` (TransactionRows), from the
+    cache where possible.
+    """
+    cache = get_cache()
+    keys = [row_key(t) for t in transactions]
+    cached = cache.get_many(keys)
+    rendered = {}
+    for t, key in zip(transactions, keys):
+        if key not in cached:
+            rendered[key] = render_to_string(ROW_TEMPLATE, {"t": t})
+    if rendered:
+        # Keyed by the row's own stamp, so a lagging replica can't make it stale
+        cache.set_many(rendered, settings.TRACKER_CACHE_TIMEOUT)
+    return mark_safe("".join(cached.get(key) or rendered[key] for key in keys))
+
+
+def _fragment_context(transactions, version):
+    if not settings.TRACKER_FRAGMENT_CACHE:
+        return {}
+    return {
+        "fragment_cache": settings.TRACKER_CACHE_ALIAS,
+        "table_fragment_timeout": cache_timeout(),
+        "data_version": version,
+        # Called by the template only when the table isn't cached
+        "transaction_rows": lambda: render_rows(transactions),
+    }
+
+
+def fragment_context(user_id, transactions):
+    """
+    Context for tracker/transactions/list.html's cached table.
+    """
+    return _fragment_context(transactions, data_version(user_id))
+
+
+async def afragment_context(user_id, transactions):
+    return _fragment_context(transactions, await adata_version(user_id))
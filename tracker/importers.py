@@ -0,0 +1,286 @@
+import csv
+import datetime
+import html
+import itertools
+import re
+import time
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from core.constants import INCOME, EXPENSE
+from tracker.cache import bump_data_version
+from tracker.categories import forget_categories
+from tracker.dates import resolve_dates
+from tracker.forms.transaction_form import normalize_amount, validate_amount, validate_description
+from tracker.models import Category, Transaction
+from tracker.recurring import refresh_recurring
+from tracker.rollups import apply_rows
+
+# Rows per bulk INSERT / database transaction
+CHUNK_SIZE = 1000
+
+# What a single import should sustain end to end (parse, validate, insert)
+TARGET_ROWS_PER_SECOND = 5000
+
+# Per-row errors kept in memory; the rest are only counted
+MAX_ERRORS = 1000
+
+CSV_COLUMNS = {"date", "description", "amount", "type", "category"}
+REQUIRED_CSV_COLUMNS = {"date", "description", "amount"}
+
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+class ImportFormatError(Exception):
+    pass
+
+
+class RowError:
+    __slots__ = ("line", "message")
+
+    def __init__(self, line, message):
+        self.line = line
+        self.message = message
+
+    def __str__(self):
+        return f"line {self.line}: {self.message}"
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(RowError(line, message))
+
+
+# Parsers: yield (line, raw row dict) one record at a time
+
+def parse_csv(stream):
+    """
+    CSV with a header row: date (YYYY-MM-DD), description, amount,
+    and optional type (income/expense) and category columns.
+    """
+    reader = csv.DictReader(stream)
+    if reader.fieldnames is None:
+        return
+    columns = [(name or "").strip().lower() for name in reader.fieldnames]
+    missing = REQUIRED_CSV_COLUMNS - set(columns)
+    if missing:
+        raise ImportFormatError(f"Missing CSV column(s): {', '.join(sorted(missing))}.")
+    reader.fieldnames = columns
+
+    for record in reader:
+        row = {key: (record.get(key) or "").strip() for key in CSV_COLUMNS}
+        yield reader.line_num, row
+
+
+def _ofx_tokens(stream, read_size=64 * 1024):
+    # OFX 1.x is SGML without closing tags for leaf elements and may be
+    # written on a single line, so tokenize on tags rather than lines
+    buffer = ""
+    while True:
+        chunk = stream.read(read_size)
+        if not chunk:
+            break
+        buffer += chunk
+        cut = buffer.rfind("<")
+        if cut <= 0:
+            continue
+        for match in OFX_TAG.finditer(buffer, 0, cut):
+            yield match.group(1) == "/", match.group(2).upper(), match.group(3)
+        buffer = buffer[cut:]
+    for match in OFX_TAG.finditer(buffer):
+        yield match.group(1) == "/", match.group(2).upper(), match.group(3)
+
+
+def parse_ofx(stream):
+    """
+    <STMTTRN> records of an OFX 1.x (SGML) or 2.x (XML) bank statement.
+    The "line" reported for errors is the transaction's position in the file.
+    """
+    record = None
+    position = 0
+    for closing, tag, value in _ofx_tokens(stream):
+        if tag == "STMTTRN":
+            if closing and record is not None:
+                yield position, {
+                    "date": _ofx_date(record.get("DTPOSTED", "")),
+                    "description": record.get("NAME") or record.get("MEMO", ""),
+                    "amount": record.get("TRNAMT", ""),
+                    "type": "",
+                    "category": "",
+                }
+                record = None
+            elif not closing:
+                position += 1
+                record = {}
+        elif record is not None and not closing:
+            record[tag] = html.unescape(value.strip())
+
+
+def _ofx_date(value):
+    # DTPOSTED looks like 20240131, 20240131120000 or 20240131120000.000[-5:EST]
+    digits = value[:8]
+    if len(digits) == 8 and digits.isdigit():
+        return f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
+    return value
+
+
+PARSERS = {
+    "csv": parse_csv,
+    "ofx": parse_ofx,
+}
+
+
+def detect_format(filename):
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension == "qfx":
+        return "ofx"
+    if extension not in PARSERS:
+        raise ImportFormatError(f"Can't detect the format of {filename!r}; use CSV or OFX.")
+    return extension
+
+
+class TransactionImporter:
+    """
+    Streams parsed rows into the database for one user.
+
+    Rows are validated with the same rules as TransactionForm, then written
+    in chunks: categories and Date rows are resolved once per chunk and the
+    chunk is inserted with a single bulk_create in its own transaction, so
+    a bad chunk doesn't undo the ones before it. Memory use is bounded by
+    the chunk size, not the file size.
+    """
+
+    amount_field = Transaction._meta.get_field("amount")
+    category_name_length = Category._meta.get_field("name").max_length
+
+    def __init__(self, user, chunk_size=CHUNK_SIZE):
+        self.user = user
+        self.chunk_size = chunk_size
+        self.categories = {}
+
+    def run(self, rows):
+        result = ImportResult()
+        started = time.perf_counter()
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            result.rows += len(chunk)
+            self.import_chunk(chunk, result)
+        if result.created:
+            # Statements are where new subscriptions show up
+            refresh_recurring(self.user.pk)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def import_chunk(self, chunk, result):
+        valid = []
+        for line, raw in chunk:
+            try:
+                valid.append((line, self.clean_row(raw)))
+            except ValidationError as e:
+                result.add_error(line, "; ".join(e.messages))
+
+        if not valid:
+            return
+
+        try:
+            with transaction.atomic():
+                category_ids = self.resolve_categories([row for _, row in valid])
+                date_ids = resolve_dates({row["full_date"] for _, row in valid})
+                transactions = [
+                    Transaction(
+                        user=self.user,
+                        category_id=category_ids.get(row["category"]),
+                        full_date=row["full_date"],
+                        date_id=date_ids[row["full_date"]],
+                        amount=row["amount"],
+                        description=row["description"],
+                        type=row["type"],
+                    )
+                    for _, row in valid
+                ]
+                Transaction.objects.bulk_create(transactions, batch_size=self.chunk_size)
+                # bulk_create sends no signals, so update the rollups here
+                apply_rows((t.user_id, t.full_date, t.category_id, t.amount) for t in transactions)
+                bump_data_version(self.user.pk)
+        except DatabaseError as e:
+            # The categories created for this chunk were rolled back with it
+            self.categories = {}
+            for line, _ in valid:
+                result.add_error(line, f"not saved: {e}")
+            return
+
+        result.created += len(valid)
+
+    def clean_row(self, raw):
+        try:
+            full_date = datetime.date.fromisoformat(raw["date"])
+        except ValueError:
+            raise ValidationError(f"Invalid date {raw['date']!r}, expected YYYY-MM-DD.")
+
+        description = raw["description"]
+        validate_description(description)
+
+        amount = self.amount_field.clean(raw["amount"], None)
+        validate_amount(amount)
+
+        t_type = raw["type"].lower()
+        if not t_type:
+            t_type = EXPENSE if amount < 0 else INCOME
+        elif t_type not in (INCOME, EXPENSE):
+            raise ValidationError(f"Invalid type {raw['type']!r}, expected income or expense.")
+
+        category = raw["category"]
+        if len(category) > self.category_name_length:
+            raise ValidationError(
+                f"Category name is longer than {self.category_name_length} characters."
+            )
+
+        return {
+            "full_date": full_date,
+            "description": description,
+            "amount": normalize_amount(amount, t_type),
+            "type": t_type,
+            "category": category or None,
+        }
+
+    def resolve_categories(self, rows):
+        """
+        Map category names to ids, creating the user's missing categories.
+        """
+        wanted = {}
+        for row in rows:
+            name = row["category"]
+            if name and name not in self.categories:
+                wanted.setdefault(name, row["type"] == INCOME)
+
+        if wanted:
+            names = list(wanted)
+            user_categories = Category.objects.filter(user=self.user, name__in=names)
+            self.categories.update(user_categories.values_list("name", "id"))
+            absent = [name for name in names if name not in self.categories]
+            if absent:
+                Category.objects.bulk_create(
+                    [Category(user=self.user, name=name, is_income=wanted[name]) for name in absent],
+                    ignore_conflicts=True,
+                )
+                forget_categories(self.user.pk)
+                self.categories.update(user_categories.values_list("name", "id"))
+
+        return self.categories
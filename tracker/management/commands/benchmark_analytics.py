@@ -0,0 +1,163 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core.constants import INCOME, EXPENSE
+from tracker.analytics_engine import TransactionFrame, to_money
+from tracker.models import Transaction
+from decimal import Decimal
+import calendar
+import datetime
+import random
+import time
+
+
+def synthetic_rows(count, seed, today):
+    """
+    (full_date, amount, category_id, type) tuples spread over the two
+    years before `today`, shaped like Transaction.values_list() output.
+    """
+    rng = random.Random(seed)
+    first = today.toordinal() - 730
+    rows = []
+    for _ in range(count):
+        day = datetime.date.fromordinal(first + rng.randrange(731))
+        if rng.random() < 0.1:
+            rows.append((day, Decimal(rng.randrange(50000, 500000)) / 100, rng.choice([1, 2]), INCOME))
+        else:
+            rows.append((day, -Decimal(rng.randrange(100, 20000)) / 100, rng.choice([3, 4, 5, None]), EXPENSE))
+    return rows
+
+
+def python_trends(rows, today, months=12, window=30):
+    """
+    The same numbers as TransactionFrame.trends(), one row at a time.
+    """
+    monthly = {}
+    daily = {}
+    month_start = today.replace(day=1)
+    to_date = [0, 0]
+    for full_date, amount, category_id, t_type in rows:
+        cents = int(amount * 100)
+        key = (full_date.year, full_date.month)
+        bucket = monthly.setdefault(key, [0, 0, 0])
+        if cents > 0:
+            bucket[0] += cents
+        else:
+            bucket[1] -= cents
+            daily[full_date] = daily.get(full_date, 0) - cents
+        bucket[2] += 1
+        if month_start <= full_date <= today:
+            to_date[0 if cents > 0 else 1] += abs(cents)
+
+    result = []
+    if monthly:
+        year, month = min(monthly)
+        last = max(monthly)
+        previous = None
+        while (year, month) <= last:
+            income, expenses, count = monthly.get((year, month), (0, 0, 0))
+            net = income - expenses
+            result.append({
+                "month": datetime.date(year, month, 1),
+                "income": to_money(income),
+                "expenses": to_money(expenses),
+                "net": to_money(net),
+                "count": count,
+                "net_change": None if previous is None else to_money(net - previous),
+                "net_change_percent": (
+                    round((net - previous) * 100.0 / abs(previous), 1) if previous else None
+                ),
+                "savings_rate": round(net * 100.0 / income, 1) if income > 0 else None,
+            })
+            previous = net
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    result = result[-months:][::-1]
+
+    rolling_average = rolling_date = None
+    if rows:
+        first_day = min(row[0] for row in rows)
+        last_day = max(row[0] for row in rows)
+        if (last_day - first_day).days + 1 >= window:
+            total = sum(
+                daily.get(last_day - datetime.timedelta(days=i), 0) for i in range(window)
+            )
+            rolling_average = to_money(round(total / window))
+            rolling_date = last_day
+
+    scale = calendar.monthrange(today.year, today.month)[1] / today.day
+    return {
+        "months": result,
+        "rolling_window": window,
+        "rolling_average": rolling_average,
+        "rolling_date": rolling_date,
+        "projection": {
+            "income_to_date": to_money(to_date[0]),
+            "expenses_to_date": to_money(to_date[1]),
+            "projected_income": to_money(int(round(to_date[0] * scale))),
+            "projected_expenses": to_money(int(round(to_date[1] * scale))),
+        },
+    }
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the NumPy analytics engine with the equivalent per-row Python loop, "
+        "on synthetic rows (default 10k, 100k and 1M) or on a user's transactions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--user", help="Benchmark against this user's stored transactions instead")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+
+        if options["user"]:
+            User = get_user_model()
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']!r} does not exist.")
+            fields = ("full_date", "amount", "category_id", "type")
+            # Both sides include loading the rows from the database
+            self.compare(
+                today,
+                f"user {user.username}",
+                lambda: TransactionFrame.for_user(user.pk),
+                lambda: python_trends(
+                    Transaction.objects.filter(user=user).order_by().values_list(*fields), today
+                ),
+            )
+            return
+
+        for size in options["sizes"]:
+            rows = synthetic_rows(size, options["seed"], today)
+            self.compare(
+                today,
+                f"{size:,} rows",
+                lambda: TransactionFrame.from_rows(rows),
+                lambda: python_trends(rows, today),
+            )
+
+    def compare(self, today, label, load, loop):
+        frame, load_time = timed(load)
+        engine_result, compute_time = timed(frame.trends, today)
+        loop_result, loop_time = timed(loop)
+        if engine_result != loop_result:
+            raise CommandError(f"{label}: the engine and the Python loop disagree.")
+        engine_time = load_time + compute_time
+        speedup = loop_time / engine_time if engine_time else float("inf")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {label}: numpy {engine_time * 1000:,.1f} ms "
+                f"(load {load_time * 1000:,.1f} ms, metrics {compute_time * 1000:,.1f} ms), "
+                f"python loop {loop_time * 1000:,.1f} ms ({speedup:.1f}x)."
+            )
+        )
@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from tracker.autocomplete import TARGET_P99_MS, build_index, suggest, words
+from tracker.models import Transaction
+from django.utils import timezone
+import random
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the autocomplete index build and warm lookups for one user. "
+        f"Target: p99 under {TARGET_P99_MS} ms."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="Username to benchmark")
+        parser.add_argument("--queries", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+
+        rng = random.Random(options["seed"])
+        sample = list(
+            Transaction.objects.filter(user=user).values_list("description", flat=True)[:5000]
+        )
+        if not sample:
+            raise CommandError(f"User {user.username!r} has no transactions.")
+
+        # What people type: 1..n leading characters of a word, sometimes two words
+        queries = []
+        for _ in range(options["queries"]):
+            tokens = words(rng.choice(sample)) or ["a"]
+            start = rng.randrange(len(tokens))
+            typed = tokens[start:start + rng.choice([1, 1, 1, 2])]
+            typed[-1] = typed[-1][:rng.randint(1, len(typed[-1]))]
+            queries.append(" ".join(typed))
+
+        started = time.perf_counter()
+        build_index(user.pk, timezone.localdate())
+        build = time.perf_counter() - started
+
+        suggest(user.pk, "")  # warm the per-process index
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            suggest(user.pk, query)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+
+        def percentile(p):
+            return timings[min(len(timings) - 1, int(len(timings) * p / 100))]
+
+        count = Transaction.objects.filter(user=user).count()
+        summary = (
+            f"{count:,} transactions: index built in {build * 1000:,.0f} ms; "
+            f"{len(timings)} lookups p50 {percentile(50):.2f} ms, "
+            f"p95 {percentile(95):.2f} ms, p99 {percentile(99):.2f} ms."
+        )
+        if percentile(99) > TARGET_P99_MS:
+            self.stdout.write(self.style.WARNING(f"⚠️ {summary} Above the {TARGET_P99_MS} ms target."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {summary}"))
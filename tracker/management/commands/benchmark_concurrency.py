@@ -0,0 +1,200 @@
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+# The pages with an async version (tracker/async_views.py)
+PATHS = [
+    "/transactions/",
+    "/transactions/?page=5&sort=amount",
+    "/transactions/?paginate=cursor",
+    "/analytics/summary/",
+    "/analytics/monthly/",
+    "/analytics/categories/",
+    "/analytics/trends/",
+    "/analytics/recurring/",
+]
+
+HOST = "127.0.0.1"
+
+
+def server_command(kind, port, workers, threads):
+    if kind == "wsgi":
+        return [
+            "gunicorn", "config.wsgi:application",
+            "--bind", f"{HOST}:{port}",
+            "--workers", str(workers),
+            "--worker-class", "gthread",
+            "--threads", str(threads),
+            "--log-level", "warning",
+        ]
+    return [
+        "uvicorn", "config.asgi:application",
+        "--host", HOST,
+        "--port", str(port),
+        "--workers", str(workers),
+        "--log-level", "warning",
+        "--no-access-log",
+    ]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def percentile(timings, p):
+    return timings[min(len(timings) - 1, int(len(timings) * p / 100))]
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = dict(line.split(": ", 1) for line in lines[1:] if ": " in line)
+    headers = {name.lower(): value for name, value in headers.items()}
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    return status, headers.get("connection", "").lower() != "close"
+
+
+async def run_client(port, cookie, paths, count, timings, errors):
+    # One keep-alive connection per client, like a browser tab
+    reader = writer = None
+    for i in range(count):
+        path = paths[i % len(paths)]
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Cookie: {settings.SESSION_COOKIE_NAME}={cookie}\r\n\r\n"
+        ).encode()
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(HOST, port)
+            writer.write(request)
+            status, keep_alive = await read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            status, keep_alive = None, False
+        timings.append(time.perf_counter() - started)
+        if status != 200:
+            errors.append(status)
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, cookie, paths, clients, requests):
+    timings, errors = [], []
+    per_client = max(1, requests // clients)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        # Each client starts on a different page so all are hit at once
+        run_client(port, cookie, paths[i % len(paths):] + paths[:i % len(paths)], per_client, timings, errors)
+        for i in range(clients)
+    ))
+    return time.perf_counter() - started, sorted(timings), errors
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the app under gunicorn (WSGI, sync views) and uvicorn (ASGI, "
+        "async views) and compare requests/sec and latency with many "
+        "concurrent logged-in clients on the list and analytics pages."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="Username to browse as")
+        parser.add_argument("--clients", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=4000, help="Requests per server")
+        parser.add_argument("--workers", type=int, default=1, help="Processes per server")
+        parser.add_argument("--threads", type=int, default=32, help="Threads per gunicorn worker")
+        parser.add_argument("--only", choices=["wsgi", "asgi"], help="Benchmark one server only")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+
+        # A real session, as a logged-in browser would send
+        client = Client()
+        client.force_login(user)
+        cookie = client.cookies[settings.SESSION_COOKIE_NAME].value
+
+        results = {}
+        for kind in ("wsgi", "asgi"):
+            if options["only"] in (None, kind):
+                results[kind] = self.benchmark(kind, cookie, options)
+
+        if len(results) == 2:
+            wsgi, asgi = results["wsgi"], results["asgi"]
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ ASGI/WSGI: {asgi[0] / wsgi[0]:.2f}x requests/sec, "
+                f"p99 {asgi[1] * 1000:,.0f} ms vs {wsgi[1] * 1000:,.0f} ms."
+            ))
+
+    def benchmark(self, kind, cookie, options):
+        port = free_port()
+        command = server_command(kind, port, options["workers"], options["threads"])
+        if shutil.which(command[0]) is None:
+            raise CommandError(f"{command[0]} is not installed (pip install -r requirements.txt).")
+
+        env = dict(
+            os.environ,
+            DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE,
+            TRACKER_ASYNC_VIEWS="true" if kind == "asgi" else "false",
+            PYTHONPATH=os.pathsep.join(sys.path),
+        )
+        server = subprocess.Popen(command, env=env)
+        try:
+            self.wait_until_up(port, server)
+            # Warm caches, templates and connections before timing
+            asyncio.run(load(port, cookie, PATHS, len(PATHS), len(PATHS) * 2))
+            elapsed, timings, errors = asyncio.run(
+                load(port, cookie, PATHS, options["clients"], options["requests"])
+            )
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        rate = len(timings) / elapsed
+        p99 = percentile(timings, 99)
+        summary = (
+            f"{kind.upper()}: {len(timings):,} requests from {options['clients']} clients in {elapsed:.1f} s, "
+            f"{rate:,.0f} req/s, p50 {percentile(timings, 50) * 1000:,.0f} ms, p99 {p99 * 1000:,.0f} ms"
+        )
+        if errors:
+            self.stdout.write(self.style.WARNING(f"⚠️ {summary}, {len(errors)} failed (status {errors[0]})."))
+        else:
+            self.stdout.write(f"{summary}.")
+        return rate, p99
+
+    def wait_until_up(self, port, server, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"Server exited with status {server.returncode}.")
+            try:
+                socket.create_connection((HOST, port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"Server did not start within {timeout} s.")
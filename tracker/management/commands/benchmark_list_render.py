@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from tracker.cache import bump_data_version, get_cache
+from tracker.models import Transaction
+from tracker.views import TransactionListView
+import statistics
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        "Time rendering the transaction list for one user with and without "
+        "the cached table and row fragments (tracker/fragments.py)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="Username to benchmark")
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+        if not Transaction.objects.filter(user=user).exists():
+            raise CommandError(f"User {user.username!r} has no transactions.")
+
+        view = TransactionListView.as_view()
+        factory = RequestFactory()
+        url = reverse("transaction-list")
+        params = {"page_size": options["page_size"], "sort": "-date"}
+
+        def render(before=None):
+            # The page's rows are queried while rendering, so that's included
+            request = factory.get(url, params)
+            request.user = user
+            response = view(request)
+            if before:
+                before()
+            started = time.perf_counter()
+            response.render()
+            return (time.perf_counter() - started) * 1000
+
+        def measure(before=None):
+            render(before)  # templates, URL resolver, cache
+            return statistics.median(render(before) for _ in range(options["repeat"]))
+
+        with override_settings(TRACKER_FRAGMENT_CACHE=False):
+            baseline = measure()
+        results = [
+            ("no fragment cache", baseline),
+            ("cold (nothing cached)", measure(get_cache().clear)),
+            # A write elsewhere in the user's data: table misses, rows hit
+            ("rows cached", measure(lambda: bump_data_version(user.pk))),
+            ("table cached", measure()),
+        ]
+
+        self.stdout.write(f"Rendering {options['page_size']} rows, median of {options['repeat']}:")
+        for label, ms in results:
+            self.stdout.write(f"  {label:<22} {ms:8.2f} ms  {baseline / ms:5.1f}x")
+
+        if results[2][1] < baseline and results[3][1] < baseline:
+            self.stdout.write(self.style.SUCCESS("✅ Cached fragments render faster than the full table."))
+        else:
+            self.stdout.write(self.style.WARNING("⚠️ Cached fragments are not faster than the full table."))
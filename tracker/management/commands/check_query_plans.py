@@ -0,0 +1,121 @@
+import itertools
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+
+from tracker.views import TransactionListView
+
+# Filter combinations the list view supports (values only need to be well-formed)
+FILTERS = {
+    "none": {},
+    "category": {"category": "1"},
+    "date range": {"start_date": "2024-01-01", "end_date": "2024-12-31"},
+    "category + date range": {
+        "category": "1",
+        "start_date": "2024-01-01",
+        "end_date": "2024-12-31",
+    },
+    "search": {"q": "rent"},
+    "search + category": {"q": "rent", "category": "1"},
+}
+
+# Plan nodes that mean "no index could serve this query"
+BAD_NODES = {
+    "postgresql": re.compile(r"^\s*(->\s+)?(Parallel )?(Seq Scan|Incremental Sort|Sort)\b", re.M),
+    "sqlite": re.compile(r"\bSCAN\b"),
+}
+
+# SQLite has no planner switches to rule sorts out, and it will happily pick
+# a range index plus a sort where Postgres would walk the sort index, so
+# sorts there are only reported
+WARN_NODES = {
+    "sqlite": re.compile(r"USE TEMP B-TREE"),
+}
+
+# Search matches come from unordered bitmap scans of the GIN indexes, so
+# those plans may sort the matching rows but must not scan the table
+SEARCH_BAD_NODES = {
+    "postgresql": re.compile(r"^\s*(->\s+)?(Parallel )?Seq Scan\b", re.M),
+    "sqlite": BAD_NODES["sqlite"],
+}
+
+# ...and should be answered from the full-text/trigram GIN indexes
+SEARCH_INDEX_NODES = {
+    "postgresql": re.compile(r"Bitmap Index Scan on (txn_search_vector_idx|txn_description_trgm_idx)"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every TransactionListView filter/sort combination and fail "
+        "if any plan falls back to a sequential scan or an explicit sort"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, default=1, help="User id to plan for")
+        parser.add_argument("--page-size", type=int, default=TransactionListView.paginate_by)
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan")
+
+    def handle(self, *args, **options):
+        bad_nodes = BAD_NODES.get(connection.vendor)
+        warn_nodes = WARN_NODES.get(connection.vendor)
+        search_index_nodes = SEARCH_INDEX_NODES.get(connection.vendor)
+        if bad_nodes is None:
+            raise CommandError(f"Plan checks are not implemented for {connection.vendor}.")
+
+        user = get_user_model()(pk=options["user"])
+        failures = []
+        for sort, (label, params), mode in itertools.product(
+            TransactionListView.allowed_sorts, FILTERS.items(), ("page", "cursor")
+        ):
+            qs = self.page_queryset(user, dict(params, sort=sort), mode, options["page_size"])
+            searching = "q" in params
+            plan = self.explain(qs, allow_sort=searching)
+            name = f"sort={sort}, filter={label}, mode={mode}"
+            if options["verbose_plans"]:
+                self.stdout.write(f"--- {name}\n{plan}")
+            if (SEARCH_BAD_NODES[connection.vendor] if searching else bad_nodes).search(plan):
+                failures.append(f"{name}\n{plan}")
+                self.stdout.write(self.style.ERROR(f"❌ {name}"))
+            elif searching and search_index_nodes and not search_index_nodes.search(plan):
+                self.stdout.write(self.style.WARNING(f"⚠️ {name} (text indexes not used)"))
+            elif warn_nodes and warn_nodes.search(plan):
+                self.stdout.write(self.style.WARNING(f"⚠️ {name} (sorts in memory)"))
+            else:
+                self.stdout.write(f"✅ {name}")
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} plan(s) use a sequential scan or sort:\n\n" + "\n\n".join(failures)
+            )
+        self.stdout.write(self.style.SUCCESS("✅ All transaction list plans are index-backed."))
+
+    def page_queryset(self, user, params, mode, page_size):
+        request = RequestFactory().get("/transactions/", params)
+        request.user = user
+        view = TransactionListView()
+        view.setup(request)
+        qs = view.get_queryset()
+
+        if mode == "page":
+            return qs[:page_size]
+
+        # A seek from the middle of the list, as issued by a "next" cursor
+        paginator = view.get_cursor_paginator(qs, page_size)
+        sample = "2024-06-01" if "date" in paginator.key else "0"
+        return paginator.page_queryset({"v": sample, "id": 0})
+
+    def explain(self, qs, allow_sort=False):
+        if connection.vendor != "postgresql":
+            return qs.explain()
+        # On small tables the planner rightly prefers seq scans; disabling them
+        # only penalizes those nodes, so any left in the plan have no alternative
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                if not allow_sort:
+                    cursor.execute("SET LOCAL enable_sort = off")
+            return qs.explain()
@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from tracker.recurring import refresh_recurring
+import time
+
+
+class Command(BaseCommand):
+    help = "Detect recurring transactions (subscriptions, bills, salaries) and store them per user"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", action="append", help="Username (repeatable); default all users")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("pk")
+        if options["user"]:
+            users = users.filter(username__in=options["user"])
+            if users.count() != len(set(options["user"])):
+                raise CommandError("Unknown username in --user.")
+
+        started = time.perf_counter()
+        total = 0
+        for user_id, username in users.values_list("pk", "username"):
+            found = refresh_recurring(user_id)
+            total += found
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{username}: {found} recurring series")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"✅ {total} recurring series detected in {elapsed:.2f}s."))
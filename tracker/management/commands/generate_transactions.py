@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from tracker.cache import bump_data_version
+from tracker.recurring import refresh_recurring
+from tracker.rollups import rebuild_rollups
+from tracker.synthetic import CHUNK_SIZE, generate_transactions, supports_copy
+import time
+
+
+class Command(BaseCommand):
+    help = "Create users with realistic, reproducible transaction histories for load testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1, help="Number of users to create")
+        parser.add_argument("--transactions", type=int, default=10000, help="Transactions per user")
+        parser.add_argument("--seed", type=int, default=0, help="Same seed, same data")
+        parser.add_argument("--days", type=int, default=730, help="Length of each history, ending today")
+        parser.add_argument("--prefix", default="loadtest", help="Usernames are <prefix>1, <prefix>2, ...")
+        parser.add_argument("--password", help="Password for every generated user; default unusable")
+        parser.add_argument("--replace", action="store_true", help="Delete existing users with these names first")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--skip-recurring", action="store_true", help="Don't run recurring detection")
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["transactions"] < 0 or options["days"] < 1:
+            raise CommandError("--users and --days must be positive and --transactions not negative.")
+
+        User = get_user_model()
+        usernames = [f"{options['prefix']}{number}" for number in range(1, options["users"] + 1)]
+        existing = User.objects.filter(username__in=usernames)
+        if existing.exists():
+            if not options["replace"]:
+                raise CommandError(
+                    f"{existing.count()} of these users already exist; use --replace or another --prefix."
+                )
+            existing.delete()
+
+        # One hash for everyone, hashing per user would dominate small runs
+        password = make_password(options["password"]) if options["password"] else make_password(None)
+        with transaction.atomic():
+            User.objects.bulk_create(User(username=username, password=password) for username in usernames)
+        users = list(User.objects.filter(username__in=usernames).order_by("id"))
+
+        method = "COPY" if supports_copy(User.objects.db) else "bulk_create"
+        started = time.perf_counter()
+        for number, user in enumerate(users, start=1):
+            generate_transactions(
+                user,
+                number,
+                options["transactions"],
+                seed=options["seed"],
+                days=options["days"],
+                chunk_size=options["chunk_size"],
+            )
+        elapsed = time.perf_counter() - started
+        total = len(users) * options["transactions"]
+        self.stdout.write(
+            f"Inserted {total} transactions with {method} in {elapsed:.2f}s "
+            f"({total / elapsed if elapsed else 0:,.0f} rows/s)."
+        )
+
+        started = time.perf_counter()
+        user_ids = [user.pk for user in users]
+        buckets = rebuild_rollups(user_ids)
+        for user_id in user_ids:
+            if not options["skip_recurring"]:
+                refresh_recurring(user_id)
+            bump_data_version(user_id)
+        self.stdout.write(f"Rollups ({buckets} buckets) and recurring series in {time.perf_counter() - started:.2f}s.")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Generated {options['users']} user(s) ({usernames[0]}..{usernames[-1]}) "
+                f"with {options['transactions']} transactions each, seed {options['seed']}."
+            )
+        )
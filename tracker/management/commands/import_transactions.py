@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from tracker.importers import (
+    CHUNK_SIZE,
+    PARSERS,
+    TARGET_ROWS_PER_SECOND,
+    ImportFormatError,
+    TransactionImporter,
+    detect_format,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a CSV or OFX bank statement into a user's transactions. "
+        f"Target throughput: {TARGET_ROWS_PER_SECOND} rows/s."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or OFX/QFX file")
+        parser.add_argument("--user", required=True, help="Username to import for")
+        parser.add_argument("--format", choices=sorted(PARSERS), help="Defaults to the file extension")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+
+        try:
+            file_format = options["format"] or detect_format(options["path"])
+            # newline="" lets the csv module handle quoted line breaks
+            with open(options["path"], encoding="utf-8-sig", errors="replace", newline="") as stream:
+                importer = TransactionImporter(user, chunk_size=options["chunk_size"])
+                result = importer.run(PARSERS[file_format](stream))
+        except (OSError, ImportFormatError) as e:
+            raise CommandError(str(e))
+
+        for error in result.errors:
+            self.stderr.write(f"❌ {error}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more errors")
+
+        rate = result.rows_per_second
+        summary = (
+            f"{result.created} of {result.rows} rows imported, {result.error_count} rejected "
+            f"in {result.elapsed:.2f}s ({rate:,.0f} rows/s)."
+        )
+        # Tiny files are dominated by setup cost, only judge full chunks
+        if result.rows >= importer.chunk_size and rate < TARGET_ROWS_PER_SECOND:
+            self.stdout.write(self.style.WARNING(f"⚠️ {summary} Below the {TARGET_ROWS_PER_SECOND} rows/s target."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {summary}"))
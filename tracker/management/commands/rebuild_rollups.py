@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from tracker.rollups import compute_rollups, rebuild_rollups, stored_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the monthly rollup table from transactions, or --verify it"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", action="append", help="Username (repeatable); default all users")
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare stored rollups with recomputed ones without writing; fail on drift",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = None
+        if options["user"]:
+            users = get_user_model().objects.filter(username__in=options["user"])
+            user_ids = list(users.values_list("id", flat=True))
+            if len(user_ids) != len(set(options["user"])):
+                raise CommandError("Unknown username in --user.")
+
+        if not options["verify"]:
+            count = rebuild_rollups(user_ids)
+            self.stdout.write(self.style.SUCCESS(f"✅ Rollups rebuilt: {count} buckets."))
+            return
+
+        expected = compute_rollups(user_ids)
+        stored = stored_rollups(user_ids)
+        drifted = sorted(
+            (key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key)),
+            key=lambda key: (key[0], key[1], key[2] or 0),
+        )
+        for user_id, month, category_id in drifted:
+            key = (user_id, month, category_id)
+            self.stdout.write(
+                f"❌ user={user_id} month={month:%Y-%m} category={category_id}: "
+                f"stored={stored.get(key)} expected={expected.get(key)}"
+            )
+        if drifted:
+            raise CommandError(f"{len(drifted)} rollup bucket(s) out of date; run rebuild_rollups.")
+        self.stdout.write(self.style.SUCCESS(f"✅ Rollups verified: {len(expected)} buckets match."))
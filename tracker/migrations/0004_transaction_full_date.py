@@ -0,0 +1,30 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_full_date(apps, schema_editor):
+    Transaction = apps.get_model("tracker", "Transaction")
+    Date = apps.get_model("tracker", "Date")
+    Transaction.objects.using(schema_editor.connection.alias).filter(
+        full_date__isnull=True
+    ).update(
+        full_date=Subquery(
+            Date.objects.filter(pk=OuterRef("date_id")).values("full_date")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0003_transaction_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="full_date",
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(backfill_full_date, migrations.RunPython.noop),
+    ]
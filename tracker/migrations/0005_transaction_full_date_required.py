@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Kept apart from the backfill so the ALTER TABLE does not run in the
+    # same transaction as the bulk UPDATE
+    dependencies = [
+        ("tracker", "0004_transaction_full_date"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="transaction",
+            name="full_date",
+            field=models.DateField(),
+        ),
+        migrations.AlterModelOptions(
+            name="transaction",
+            options={"ordering": ["-full_date", "-id"]},
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="txn_user_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="txn_user_cat_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["user", "full_date", "id"], name="txn_user_full_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["user", "category", "full_date", "id"],
+                name="txn_user_cat_full_date_idx",
+            ),
+        ),
+    ]
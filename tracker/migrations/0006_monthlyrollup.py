@@ -0,0 +1,107 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Transaction = apps.get_model("tracker", "Transaction")
+    MonthlyRollup = apps.get_model("tracker", "MonthlyRollup")
+    db = schema_editor.connection.alias
+    rows = (
+        Transaction.objects.using(db)
+        .order_by()
+        .annotate(month=TruncMonth("full_date"))
+        .values("user_id", "category_id", "month")
+        .annotate(
+            income=Sum("amount", filter=Q(amount__gt=0)),
+            expenses=Sum("amount", filter=Q(amount__lt=0)),
+            count=Count("id"),
+        )
+    )
+    MonthlyRollup.objects.using(db).bulk_create(
+        [
+            MonthlyRollup(
+                user_id=row["user_id"],
+                category_id=row["category_id"],
+                month=row["month"],
+                income=row["income"] or 0,
+                expenses=-(row["expenses"] or 0),
+                count=row["count"],
+            )
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0005_transaction_full_date_required"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                (
+                    "income",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "expenses",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_rollups",
+                        to="tracker.category",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["user", "month"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("category__isnull", False)),
+                        fields=("user", "month", "category"),
+                        name="rollup_user_month_category_uniq",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("category__isnull", True)),
+                        fields=("user", "month"),
+                        name="rollup_user_month_uncategorized_uniq",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
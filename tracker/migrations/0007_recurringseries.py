@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_monthlyrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurringSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('description', models.CharField(max_length=255)),
+                ('type', models.CharField(choices=[('income', 'Income'), ('expense', 'Expense')], default='expense', max_length=7)),
+                ('period', models.CharField(choices=[('weekly', 'Weekly'), ('biweekly', 'Every two weeks'), ('monthly', 'Monthly'), ('yearly', 'Yearly')], max_length=8)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('occurrences', models.IntegerField()),
+                ('first_date', models.DateField()),
+                ('last_date', models.DateField()),
+                ('next_date', models.DateField()),
+                ('detected_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recurring_series', to='tracker.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_series', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['next_date', 'id'],
+                'indexes': [models.Index(fields=['user', 'next_date'], name='recurring_user_next_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:36
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# The trigger, the GIN indexes and pg_trgm only exist on PostgreSQL; other
+# databases keep an unused search_vector column and search with LIKE
+POSTGRES_FORWARDS = [
+    """
+    CREATE TRIGGER tracker_transaction_search_vector_update
+    BEFORE INSERT OR UPDATE ON tracker_transaction
+    FOR EACH ROW EXECUTE FUNCTION
+    tsvector_update_trigger(search_vector, 'pg_catalog.english', description)
+    """,
+    # Fires the trigger for existing rows
+    "UPDATE tracker_transaction SET search_vector = NULL",
+    "CREATE INDEX txn_search_vector_idx ON tracker_transaction USING gin (search_vector)",
+    "CREATE INDEX txn_description_trgm_idx ON tracker_transaction USING gin (description gin_trgm_ops)",
+]
+
+POSTGRES_BACKWARDS = [
+    "DROP INDEX IF EXISTS txn_description_trgm_idx",
+    "DROP INDEX IF EXISTS txn_search_vector_idx",
+    "DROP TRIGGER IF EXISTS tracker_transaction_search_vector_update ON tracker_transaction",
+]
+
+
+class PostgresTrigramExtension(TrigramExtension):
+    # CreateExtension skips other databases going forwards but not when
+    # reversed, where it would query pg_extension
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0007_recurringseries"),
+    ]
+
+    operations = [
+        PostgresTrigramExtension(),
+        migrations.AddField(
+            model_name="transaction",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(
+            run_on_postgres(POSTGRES_FORWARDS),
+            run_on_postgres(POSTGRES_BACKWARDS),
+        ),
+    ]
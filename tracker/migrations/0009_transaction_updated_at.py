@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0008_transaction_search"),
+    ]
+
+    operations = [
+        # Existing rows get the migration time (auto_now's effective default)
+        migrations.AddField(
+            model_name="transaction",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
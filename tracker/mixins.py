@@ -1,4 +1,9 @@
 from django.contrib import messages
+from django.http import Http404
+
+from core.middleware import pinned_to_primary
+from core.routers import use_replica
+from .pagination import CursorPaginator, InvalidCursor
 
 
 class MessageCreateUpdateMixin:
@@ -29,15 +34,92 @@ class MessageDeleteMixin:
         return super().post(request, *args, **kwargs)
 
 
+class ReplicaReadMixin:
+    """
+    Serve the view's GET/HEAD reads from a read replica, unless the client
+    wrote recently and is pinned to the primary (core.middleware).
+    Decided in dispatch(), which async views run inside their coroutine,
+    so the choice is seen by the handler's queries.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in ("GET", "HEAD") and not pinned_to_primary(request):
+            use_replica()
+        return super().dispatch(request, *args, **kwargs)
+
+
 class PaginateByMixin:
     """
     To allow ?page_size=20 style pagination.
-    Falls back to the class-defined paginate_by if missing.
+    Falls back to the class-defined paginate_by if missing,
+    and never returns more than max_page_size rows per page.
     """
 
+    max_page_size = 100
+
     def get_paginate_by(self, queryset):
         page_size = self.request.GET.get("page_size")
-        print("DEBUG: page_size param =", page_size)  # temporary debug
-        if page_size and page_size.isdigit():
-            return int(page_size)
+        if page_size and page_size.isdigit() and int(page_size) > 0:
+            return min(int(page_size), self.max_page_size)
         return getattr(self, "paginate_by", None)
+
+
+class SortMixin:
+    """
+    ?sort= handling restricted to a whitelist.
+    The view must define `allowed_sorts` ({sort param: ordering field})
+    and `default_sort`.
+    """
+
+    default_sort = None
+    allowed_sorts = {}
+
+    def get_sort(self):
+        sort = self.request.GET.get("sort")
+        return sort if sort in self.allowed_sorts else self.default_sort
+
+    def get_ordering(self):
+        field = self.allowed_sorts[self.get_sort()]
+        # Tie-break on id so equal keys keep a stable order across pages
+        return [field, "-id" if field.startswith("-") else "id"]
+
+
+class CursorPaginateMixin(SortMixin):
+    """
+    Opt-in keyset pagination for ListView: ?paginate=cursor.
+    Every sort in `allowed_sorts` is paged on (field, id).
+    Without the parameter the regular page-number paginator is used.
+    """
+
+    cursor_param = "cursor"
+
+    def is_cursor_mode(self):
+        return self.request.GET.get("paginate") == "cursor"
+
+    def get_cursor_paginator(self, queryset, page_size):
+        sort = self.get_sort()
+        field = self.allowed_sorts[sort]
+        return CursorPaginator(
+            queryset,
+            key=field.lstrip("-"),
+            per_page=page_size,
+            descending=field.startswith("-"),
+            scope=sort,
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.is_cursor_mode():
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = self.get_cursor_paginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_param))
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["supports_cursor"] = True
+        context["cursor_mode"] = self.is_cursor_mode()
+        return context
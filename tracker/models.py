@@ -1,6 +1,7 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
-from core.constants import INCOME, EXPENSE, TRANSACTION_TYPE_CHOICES
+from core.constants import INCOME, EXPENSE, TRANSACTION_TYPE_CHOICES, RECURRING_PERIOD_CHOICES
 
 class Category(models.Model):
     user = models.ForeignKey(
@@ -34,6 +35,12 @@ class Date(models.Model):
         return str(self.full_date)
 
 
+def format_signed_amount(amount, t_type):
+    if t_type == "income":
+        return f"+{abs(amount)}"
+    return f"-{abs(amount)}"
+
+
 class Transaction(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
@@ -47,6 +54,9 @@ class Transaction(models.Model):
         blank=True,
         related_name="transactions"
         )
+    # Calendar date stored on the row so listings, sorts and date filters
+    # never join the Date dimension; `date` is kept for analytics grouping
+    full_date = models.DateField()
     date = models.ForeignKey(
         Date, 
         on_delete=models.CASCADE
@@ -61,14 +71,117 @@ class Transaction(models.Model):
         choices=TRANSACTION_TYPE_CHOICES, 
         default=EXPENSE
         )
+    # Filled from description by a database trigger on PostgreSQL and
+    # GIN-indexed there (see migration 0008); unused on other databases
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Modification stamp, part of the cached table row's key
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-date__full_date"]
+        ordering = ["-full_date", "-id"]
+        # Composite indexes for the per-user access paths of the list views:
+        # every query filters on user first, then seeks/sorts on (key, id)
+        indexes = [
+            models.Index(fields=["user", "full_date", "id"], name="txn_user_full_date_idx"),
+            models.Index(fields=["user", "category", "full_date", "id"], name="txn_user_cat_full_date_idx"),
+            models.Index(fields=["user", "amount", "id"], name="txn_user_amount_idx"),
+            models.Index(fields=["user", "category", "amount", "id"], name="txn_user_cat_amount_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.date.full_date} | {self.get_type_display()} | {self.category} | {self.amount}"
+        return f"{self.full_date} | {self.get_type_display()} | {self.category} | {self.amount}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so edits can be taken back out of rollups
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
     def signed_amount(self):
-        if self.type == "income":
-            return f"+{abs(self.amount)}"
-        return f"-{abs(self.amount)}"
+        return format_signed_amount(self.amount, self.type)
+
+
+class MonthlyRollup(models.Model):
+    """
+    Per-user, per-month, per-category totals, maintained incrementally
+    by tracker.rollups on every Transaction write.
+    A null category is the "uncategorized" bucket.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="monthly_rollups"
+        )
+    month = models.DateField()  # first day of the month
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="monthly_rollups"
+        )
+    income = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    expenses = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # positive
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["user", "month"]
+        constraints = [
+            # NULLs never collide in a unique index, so the uncategorized
+            # bucket needs its own partial constraint
+            models.UniqueConstraint(
+                fields=["user", "month", "category"],
+                condition=models.Q(category__isnull=False),
+                name="rollup_user_month_category_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "month"],
+                condition=models.Q(category__isnull=True),
+                name="rollup_user_month_uncategorized_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} | {self.category} | +{self.income} -{self.expenses}"
+
+
+class RecurringSeries(models.Model):
+    """
+    A subscription, bill or salary found by tracker.recurring among a
+    user's transactions. Replaced wholesale each time detection runs.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="recurring_series"
+        )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="recurring_series"
+        )
+    description = models.CharField(max_length=255)
+    type = models.CharField(
+        max_length=7,
+        choices=TRANSACTION_TYPE_CHOICES,
+        default=EXPENSE
+        )
+    period = models.CharField(max_length=8, choices=RECURRING_PERIOD_CHOICES)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)  # median, signed like Transaction
+    occurrences = models.IntegerField()
+    first_date = models.DateField()
+    last_date = models.DateField()
+    next_date = models.DateField()
+    detected_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["next_date", "id"]
+        indexes = [
+            models.Index(fields=["user", "next_date"], name="recurring_user_next_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.description} | {self.get_period_display()} | {self.amount} | next {self.next_date}"
@@ -0,0 +1,130 @@
+from django.core import signing
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage:
+    """
+    One page of a keyset-paginated queryset.
+    Exposes the same has_next/has_previous interface as Django's Page,
+    but with opaque cursor tokens instead of page numbers.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset (seek) pagination on (key, id).
+
+    Instead of OFFSET/LIMIT, each page is fetched with
+    `WHERE (key, id) < (last_key, last_id) ORDER BY key, id LIMIT n`,
+    so deep pages cost the same as the first one and no COUNT(*) is needed.
+    `key` must be a non-nullable field; `id` breaks ties between equal keys.
+    """
+
+    salt = "tracker.pagination.cursor"
+
+    def __init__(self, queryset, key, per_page, descending=False, scope=""):
+        self.queryset = queryset
+        self.key = key
+        self.per_page = per_page
+        self.descending = descending
+        # Tokens are only valid for the sort they were issued for
+        self.scope = scope
+
+    def _ordering(self, reverse=False):
+        desc = self.descending != reverse
+        prefix = "-" if desc else ""
+        return [f"{prefix}{self.key}", f"{prefix}id"]
+
+    def _seek(self, value, pk, reverse=False):
+        # Rows strictly "after" (value, pk) in the requested direction
+        op = "lt" if self.descending != reverse else "gt"
+        return Q(**{f"{self.key}__{op}": value}) | Q(**{self.key: value, f"id__{op}": pk})
+
+    def _key_value(self, obj):
+        value = obj
+        for part in self.key.split("__"):
+            value = getattr(value, part)
+        return value
+
+    def encode(self, obj, direction):
+        payload = {
+            "s": self.scope,
+            "d": direction,
+            "v": str(self._key_value(obj)),
+            "id": obj.pk,
+        }
+        return signing.dumps(payload, salt=self.salt, compress=True)
+
+    def decode(self, token):
+        try:
+            payload = signing.loads(token, salt=self.salt)
+        except signing.BadSignature:
+            raise InvalidCursor("Cursor is invalid or has been tampered with.")
+        if payload.get("s") != self.scope or payload.get("d") not in ("next", "prev"):
+            raise InvalidCursor("Cursor does not match the current sort.")
+        return payload
+
+    def page_queryset(self, cursor=None, backwards=False):
+        qs = self.queryset.order_by(*self._ordering(reverse=backwards))
+        if cursor:
+            qs = qs.filter(self._seek(cursor["v"], cursor["id"], reverse=backwards))
+        # Fetch one extra row to know whether another page exists
+        return qs[: self.per_page + 1]
+
+    def _decode_direction(self, token):
+        if not token:
+            return None, False
+        cursor = self.decode(token)
+        return cursor, cursor["d"] == "prev"
+
+    def page(self, token=None):
+        cursor, backwards = self._decode_direction(token)
+        return self._page(list(self.page_queryset(cursor, backwards)), cursor, backwards)
+
+    async def apage(self, token=None):
+        cursor, backwards = self._decode_direction(token)
+        return self._page([row async for row in self.page_queryset(cursor, backwards)], cursor, backwards)
+
+    def _page(self, rows, cursor, backwards):
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return CursorPage(rows)
+
+        if backwards:
+            has_next, has_previous = cursor is not None, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        return CursorPage(
+            rows,
+            next_cursor=self.encode(rows[-1], "next") if has_next else None,
+            previous_cursor=self.encode(rows[0], "prev") if has_previous else None,
+        )
@@ -0,0 +1,217 @@
+"""
+Recurring transaction detection.
+
+A user's transactions are bucketed by (normalized description, category,
+type, amount band) in one pass; each bucket's day ordinals are sorted and
+the gaps between consecutive days are matched against fixed periods. That
+is O(n log n) overall, no pairwise comparison of rows. Results are stored
+as RecurringSeries so pages only read them. The recurring page re-runs
+detection when the user's data version (tracker.cache) has moved since the
+last run, i.e. after any write to their transactions, and once a day;
+`manage.py detect_recurring` refreshes users ahead of time.
+"""
+import calendar
+import datetime
+import math
+import re
+from collections import Counter, defaultdict
+
+from asgiref.sync import sync_to_async
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.constants import BIWEEKLY, MONTHLY, WEEKLY, YEARLY
+from .cache import adata_version, data_version, get_cache
+from .models import RecurringSeries, Transaction
+
+# (data version, day) the user's stored series were detected at
+DETECTED_KEY = "tracker:recurring-detected:{user_id}"
+
+# Accepted gap in days between consecutive occurrences, per period
+PERIOD_GAPS = {
+    WEEKLY: (6, 8),
+    BIWEEKLY: (13, 15),
+    MONTHLY: (26, 35),
+    YEARLY: (355, 375),
+}
+
+# Fewest occurrences before a series is believed
+MIN_OCCURRENCES = {
+    WEEKLY: 4,
+    BIWEEKLY: 3,
+    MONTHLY: 3,
+    YEARLY: 2,
+}
+
+# Share of gaps that must fit the period (a skipped month breaks one gap)
+MIN_REGULARITY = 0.75
+
+# Days past the expected date before a series is considered cancelled
+GRACE_DAYS = {
+    WEEKLY: 4,
+    BIWEEKLY: 7,
+    MONTHLY: 10,
+    YEARLY: 31,
+}
+
+# Amounts within ~15% of each other share a band (log scale)
+AMOUNT_BAND_RATIO = 1.15
+
+DESCRIPTION_LENGTH = RecurringSeries._meta.get_field("description").max_length
+
+NOISE = re.compile(r"[^a-z]+")
+
+
+def normalize_description(description):
+    # Drop digits and punctuation: card numbers, dates and references
+    # differ between otherwise identical statement lines
+    return " ".join(NOISE.sub(" ", description.lower()).split())[:DESCRIPTION_LENGTH]
+
+
+def amount_band(amount):
+    cents = abs(int(amount * 100))
+    return int(math.log(cents) / math.log(AMOUNT_BAND_RATIO)) if cents else 0
+
+
+def add_months(day, months, anchor_day):
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    return datetime.date(year, month, min(anchor_day, calendar.monthrange(year, month)[1]))
+
+
+def next_occurrence(days, period):
+    last = days[-1]
+    if period == WEEKLY:
+        return last + datetime.timedelta(days=7)
+    if period == BIWEEKLY:
+        return last + datetime.timedelta(days=14)
+    # Keep the usual day of month so a short month doesn't shift the series
+    anchor_day = Counter(day.day for day in days).most_common(1)[0][0]
+    if period == MONTHLY:
+        return add_months(last, 1, anchor_day)
+    return add_months(last, 12, anchor_day)
+
+
+def match_period(ordinals):
+    """
+    The period the sorted, distinct day ordinals repeat on, or None.
+    """
+    gaps = sorted(b - a for a, b in zip(ordinals, ordinals[1:]))
+    if not gaps:
+        return None
+    median = gaps[len(gaps) // 2]
+    for period, (low, high) in PERIOD_GAPS.items():
+        if low <= median <= high:
+            if len(ordinals) < MIN_OCCURRENCES[period]:
+                return None
+            regular = sum(1 for gap in gaps if low <= gap <= high)
+            return period if regular >= MIN_REGULARITY * len(gaps) else None
+    return None
+
+
+def detect_series(rows, today):
+    """
+    Unsaved RecurringSeries (without user) found in
+    (full_date, amount, category_id, type, description) rows.
+    """
+    groups = defaultdict(list)
+    labels = {}
+    for full_date, amount, category_id, t_type, description in rows:
+        name = normalize_description(description)
+        if not name:
+            continue
+        key = (name, category_id, t_type, amount_band(amount))
+        groups[key].append((full_date, amount))
+        labels.setdefault(key, description.strip()[:DESCRIPTION_LENGTH])
+
+    found = []
+    for key, occurrences in groups.items():
+        if len(occurrences) < 2:
+            continue
+        days = sorted({day for day, _ in occurrences})
+        period = match_period([day.toordinal() for day in days])
+        if period is None:
+            continue
+        next_date = next_occurrence(days, period)
+        if (today - next_date).days > GRACE_DAYS[period]:
+            continue
+        amounts = sorted(amount for _, amount in occurrences)
+        _, category_id, t_type, _ = key
+        found.append(
+            RecurringSeries(
+                category_id=category_id,
+                description=labels[key],
+                type=t_type,
+                period=period,
+                amount=amounts[len(amounts) // 2],
+                occurrences=len(days),
+                first_date=days[0],
+                last_date=days[-1],
+                next_date=next_date,
+            )
+        )
+    return found
+
+
+def refresh_recurring(user_id, today=None):
+    """
+    Re-run detection for one user and replace their stored series.
+    Returns the number of series found.
+    """
+    today = today or timezone.localdate()
+    # Read before the rows: a write in between leaves the series stale
+    detected = (data_version(user_id), today.isoformat())
+    # From the primary, even in a request reading from a replica
+    using = router.db_for_write(RecurringSeries)
+    rows = (
+        Transaction.objects.using(using)
+        .filter(user_id=user_id)
+        .order_by()
+        .values_list("full_date", "amount", "category_id", "type", "description")
+        .iterator(chunk_size=2000)
+    )
+    series = detect_series(rows, today)
+    for item in series:
+        item.user_id = user_id
+    with transaction.atomic(using=using):
+        RecurringSeries.objects.using(using).filter(user_id=user_id).delete()
+        RecurringSeries.objects.using(using).bulk_create(series, batch_size=500)
+    get_cache().set(DETECTED_KEY.format(user_id=user_id), detected, timeout=None)
+    return len(series)
+
+
+def refresh_if_stale(user_id, today):
+    """
+    refresh_recurring() unless the stored series are up to date with the
+    user's transactions and `today`. Returns True if it ran.
+    """
+    detected = get_cache().get(DETECTED_KEY.format(user_id=user_id))
+    if detected == (data_version(user_id), today.isoformat()):
+        return False
+    refresh_recurring(user_id, today)
+    return True
+
+
+async def arefresh_if_stale(user_id, today):
+    detected = await get_cache().aget(DETECTED_KEY.format(user_id=user_id))
+    if detected == (await adata_version(user_id), today.isoformat()):
+        return False
+    await sync_to_async(refresh_recurring)(user_id, today)
+    return True
+
+
+def upcoming_series(user_id, today, days=30):
+    """
+    Series due within `days`, plus ones a little overdue but not yet
+    past their grace period.
+    """
+    due = Q()
+    for period, grace in GRACE_DAYS.items():
+        due |= Q(period=period, next_date__gte=today - datetime.timedelta(days=grace))
+    return RecurringSeries.objects.filter(
+        due,
+        user_id=user_id,
+        next_date__lte=today + datetime.timedelta(days=days),
+    ).select_related("category")
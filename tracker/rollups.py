@@ -0,0 +1,212 @@
+"""
+Incremental maintenance of MonthlyRollup.
+
+Every Transaction create/update/delete goes through the signal handlers in
+tracker.signals, which turn the change into (user, month, category) deltas
+and apply them with a single UPDATE ... SET x = x + delta per bucket.
+Bulk writers (importer, API) call apply_rows() themselves; anything that
+writes with queryset.update() or raw SQL must be followed by
+`manage.py rebuild_rollups`.
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, router, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .cache import bump_data_version
+from .models import MonthlyRollup, Transaction
+
+ZERO = Decimal("0.00")
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def bucket_deltas(rows, sign=1, deltas=None):
+    """
+    Fold (user_id, full_date, category_id, amount) rows into
+    {(user_id, month, category_id): [income, expenses, count]},
+    adding to `deltas` when given.
+    """
+    if deltas is None:
+        deltas = {}
+    for user_id, full_date, category_id, amount in rows:
+        delta = deltas.setdefault((user_id, month_start(full_date), category_id), [ZERO, ZERO, 0])
+        if amount > 0:
+            delta[0] += sign * amount
+        else:
+            delta[1] += sign * -amount
+        delta[2] += sign
+    return deltas
+
+
+def apply_deltas(deltas, using=None):
+    using = using or router.db_for_write(MonthlyRollup)
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+    if len(deltas) > 1:
+        try:
+            with transaction.atomic(using=using):
+                _apply_deltas_in_bulk(deltas, using)
+            return
+        except IntegrityError:
+            # A bucket we were about to create appeared concurrently
+            pass
+    for key, delta in deltas.items():
+        _apply_delta(key, delta, using)
+
+
+def _apply_delta(key, delta, using):
+    user_id, month, category_id = key
+    income, expenses, count = delta
+    bucket = MonthlyRollup.objects.using(using).filter(
+        user_id=user_id, month=month, category_id=category_id
+    )
+    changes = {
+        "income": F("income") + income,
+        "expenses": F("expenses") + expenses,
+        "count": F("count") + count,
+    }
+    if not bucket.update(**changes):
+        try:
+            with transaction.atomic(using=using):
+                MonthlyRollup.objects.using(using).create(
+                    user_id=user_id,
+                    month=month,
+                    category_id=category_id,
+                    income=income,
+                    expenses=expenses,
+                    count=count,
+                )
+        except IntegrityError:
+            # Someone created the bucket between our UPDATE and INSERT
+            bucket.update(**changes)
+    if count < 0:
+        bucket.filter(count__lte=0).delete()
+
+
+def _apply_deltas_in_bulk(deltas, using):
+    # Many buckets at once (imports, batch API): lock and read the existing
+    # buckets, then replace them with one DELETE and one multi-row INSERT
+    # instead of an UPDATE per bucket
+    rollups = MonthlyRollup.objects.using(using)
+    existing = {
+        (rollup.user_id, rollup.month, rollup.category_id): rollup
+        for rollup in rollups.select_for_update().filter(
+            user_id__in={user_id for user_id, _, _ in deltas},
+            month__in={month for _, month, _ in deltas},
+        )
+    }
+    replaced, merged = [], []
+    for key, (income, expenses, count) in deltas.items():
+        rollup = existing.get(key)
+        if rollup is not None:
+            replaced.append(rollup.pk)
+            income += rollup.income
+            expenses += rollup.expenses
+            count += rollup.count
+        if count > 0:
+            user_id, month, category_id = key
+            merged.append(
+                MonthlyRollup(
+                    user_id=user_id,
+                    month=month,
+                    category_id=category_id,
+                    income=income,
+                    expenses=expenses,
+                    count=count,
+                )
+            )
+    rollups.filter(pk__in=replaced).delete()
+    rollups.bulk_create(merged, batch_size=500)
+
+
+def apply_rows(rows, sign=1, using=None):
+    """
+    Add (sign=1) or remove (sign=-1) transactions given as
+    (user_id, full_date, category_id, amount) tuples.
+    """
+    apply_deltas(bucket_deltas(rows, sign), using=using)
+
+
+def move_category_to_uncategorized(category, using=None):
+    """
+    A deleted category's transactions become uncategorized (SET_NULL),
+    so fold its buckets into the user's uncategorized ones.
+    """
+    deltas = {}
+    for rollup in MonthlyRollup.objects.using(using).filter(category=category):
+        deltas[(rollup.user_id, rollup.month, None)] = [rollup.income, rollup.expenses, rollup.count]
+    apply_deltas(deltas, using=using)
+
+
+def compute_rollups(user_ids=None, using=None):
+    """
+    Rollups recomputed from scratch with one GROUP BY over Transaction.
+    """
+    qs = Transaction.objects.using(using)
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+    rows = (
+        qs.order_by()
+        .annotate(month=TruncMonth("full_date"))
+        .values("user_id", "category_id", "month")
+        .annotate(
+            income=Sum("amount", filter=Q(amount__gt=0)),
+            expenses=Sum("amount", filter=Q(amount__lt=0)),
+            count=Count("id"),
+        )
+    )
+    return {
+        (row["user_id"], row["month"], row["category_id"]): (
+            row["income"] or ZERO,
+            -(row["expenses"] or ZERO),
+            row["count"],
+        )
+        for row in rows
+    }
+
+
+def stored_rollups(user_ids=None, using=None):
+    qs = MonthlyRollup.objects.using(using).filter(count__gt=0)
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+    return {
+        (user_id, month, category_id): (income, expenses, count)
+        for user_id, month, category_id, income, expenses, count in qs.values_list(
+            "user_id", "month", "category_id", "income", "expenses", "count"
+        )
+    }
+
+
+def rebuild_rollups(user_ids=None, using=None):
+    """
+    Replace the stored rollups with freshly computed ones. Returns the row count.
+    """
+    using = using or router.db_for_write(MonthlyRollup)
+    with transaction.atomic(using=using):
+        computed = compute_rollups(user_ids, using=using)
+        existing = MonthlyRollup.objects.using(using)
+        if user_ids is not None:
+            existing = existing.filter(user_id__in=user_ids)
+        affected = set(existing.values_list("user_id", flat=True).distinct())
+        affected.update(user_id for user_id, _, _ in computed)
+        existing.delete()
+        MonthlyRollup.objects.using(using).bulk_create(
+            [
+                MonthlyRollup(
+                    user_id=user_id,
+                    month=month,
+                    category_id=category_id,
+                    income=income,
+                    expenses=expenses,
+                    count=count,
+                )
+                for (user_id, month, category_id), (income, expenses, count) in computed.items()
+            ],
+            batch_size=500,
+        )
+        for user_id in affected:
+            bump_data_version(user_id, using=using)
+    return len(computed)
@@ -0,0 +1,29 @@
+from django.contrib.postgres.search import SearchQuery
+from django.db import connections
+from django.db.models import Q
+
+# Must match the configuration the search_vector trigger uses (migration 0008)
+SEARCH_CONFIG = "english"
+
+MAX_QUERY_LENGTH = 200
+
+
+def search_transactions(qs, text):
+    """
+    Narrow a Transaction queryset to descriptions matching `text`,
+    leaving its ordering alone so it combines with any sort and filter.
+    """
+    text = " ".join(text.split())[:MAX_QUERY_LENGTH]
+    if not text:
+        return qs
+
+    if connections[qs.db].vendor == "postgresql":
+        # Whole words through the tsvector GIN index, partial words and
+        # typos through the trigram GIN index; the planner ORs the bitmaps
+        return qs.filter(
+            Q(search_vector=SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch"))
+            | Q(description__trigram_word_similar=text)
+        )
+
+    # Portable fallback for SQLite development and test runs
+    return qs.filter(description__icontains=text)
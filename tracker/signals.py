@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import rollups
+from .cache import bump_data_version
+from .categories import forget_categories
+from .dates import date_resolver
+from .models import Category, Date, Transaction
+
+ROLLUP_FIELDS = ("user_id", "full_date", "category_id", "amount")
+
+
+@receiver(post_delete, sender=Date)
+def forget_deleted_dates(sender, **kwargs):
+    # Deleted dimension rows must not be handed out from the cache
+    date_resolver.clear()
+
+
+def _rollup_row(values):
+    return tuple(values[field] for field in ROLLUP_FIELDS)
+
+
+def _current_row(instance):
+    # Field values may still be unconverted input (e.g. a date string)
+    return tuple(
+        Transaction._meta.get_field(field).to_python(getattr(instance, field))
+        for field in ROLLUP_FIELDS
+    )
+
+
+def _deleting_user(origin):
+    # Deleting a user cascades to transactions, categories and rollups alike
+    return getattr(origin, "model", type(origin)) is get_user_model()
+
+
+def _stored_row(instance, using):
+    # What the database holds for this transaction, from the values
+    # remembered by Transaction.from_db when possible
+    loaded = getattr(instance, "_loaded_values", None)
+    if loaded and all(field in loaded for field in ROLLUP_FIELDS):
+        return _rollup_row(loaded)
+    stored = Transaction.objects.using(using).filter(pk=instance.pk).values(*ROLLUP_FIELDS).first()
+    return _rollup_row(stored) if stored else None
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_rollup_row(sender, instance, raw, using, **kwargs):
+    instance._rollup_previous = None
+    # An instance built with an explicit pk may still update an existing row
+    if not raw and instance.pk is not None:
+        instance._rollup_previous = _stored_row(instance, using)
+
+
+@receiver(post_save, sender=Transaction)
+def update_rollups_on_save(sender, instance, created, raw, using, **kwargs):
+    if raw:
+        return
+    current = _current_row(instance)
+    deltas = rollups.bucket_deltas([current])
+    previous = getattr(instance, "_rollup_previous", None)
+    if previous and not created:
+        # Edits may move the amount to another month or category
+        rollups.bucket_deltas([previous], sign=-1, deltas=deltas)
+    rollups.apply_deltas(deltas, using=using)
+    instance._loaded_values = dict(zip(ROLLUP_FIELDS, current))
+
+
+@receiver(pre_delete, sender=Transaction)
+def remember_deleted_rollup_row(sender, instance, using, **kwargs):
+    instance._rollup_previous = _stored_row(instance, using)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_rollups_on_delete(sender, instance, using, origin=None, **kwargs):
+    if _deleting_user(origin):
+        return
+    previous = getattr(instance, "_rollup_previous", None)
+    if previous:
+        rollups.apply_rows([previous], sign=-1, using=using)
+
+
+@receiver(pre_delete, sender=Category)
+def fold_category_rollups(sender, instance, using, origin=None, **kwargs):
+    if _deleting_user(origin):
+        return
+    rollups.move_category_to_uncategorized(instance, using=using)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_user_cache(sender, instance, using=None, raw=False, **kwargs):
+    if not raw:
+        bump_data_version(instance.user_id, using=using)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_user_categories(sender, instance, using=None, raw=False, **kwargs):
+    if not raw:
+        forget_categories(instance.user_id, using=using)
@@ -0,0 +1,81 @@
+// Suggest past descriptions (and their usual category) while typing.
+// Expects a [data-autocomplete-url] wrapper around the description field.
+(function () {
+    const wrapper = document.querySelector("[data-autocomplete-url]");
+    if (!wrapper) return;
+
+    const input = wrapper.querySelector("textarea, input");
+    const category = document.getElementById(wrapper.dataset.categoryField);
+    const menu = document.createElement("div");
+    menu.className = "list-group position-absolute w-100 shadow-sm d-none";
+    menu.style.zIndex = 1000;
+    wrapper.appendChild(menu);
+    input.setAttribute("autocomplete", "off");
+
+    let timer = null;
+    let request = null;
+
+    function hide() {
+        menu.classList.add("d-none");
+        menu.replaceChildren();
+    }
+
+    function item(label, hint, onPick) {
+        const button = document.createElement("button");
+        button.type = "button";
+        button.className = "list-group-item list-group-item-action d-flex justify-content-between";
+        button.append(label);
+        const small = document.createElement("small");
+        small.className = "text-muted ms-2";
+        small.textContent = hint;
+        button.appendChild(small);
+        // mousedown fires before the input's blur hides the menu
+        button.addEventListener("mousedown", (event) => {
+            event.preventDefault();
+            onPick();
+            hide();
+        });
+        return button;
+    }
+
+    function selectCategory(id) {
+        if (category && id !== null && category.querySelector(`option[value="${id}"]`)) {
+            category.value = String(id);
+        }
+    }
+
+    function render(data) {
+        menu.replaceChildren();
+        data.descriptions.forEach((d) => {
+            menu.appendChild(item(d.text, `${d.count}×`, () => {
+                input.value = d.text;
+                selectCategory(d.category_id);
+            }));
+        });
+        if (category) {
+            data.categories.slice(0, 3).forEach((c) => {
+                menu.appendChild(item(`Category: ${c.name}`, `${c.count}×`, () => selectCategory(c.id)));
+            });
+        }
+        menu.classList.toggle("d-none", !menu.children.length);
+    }
+
+    input.addEventListener("input", () => {
+        clearTimeout(timer);
+        const query = input.value.trim();
+        if (!query) return hide();
+        timer = setTimeout(() => {
+            if (request) request.abort();
+            request = new AbortController();
+            const url = `${wrapper.dataset.autocompleteUrl}?q=${encodeURIComponent(query)}`;
+            fetch(url, { signal: request.signal, headers: { Accept: "application/json" } })
+                .then((response) => (response.ok ? response.json() : null))
+                .then((data) => data && render(data))
+                .catch(() => {});
+        }, 80);
+    });
+    input.addEventListener("blur", hide);
+    input.addEventListener("keydown", (event) => {
+        if (event.key === "Escape") hide();
+    });
+})();
@@ -0,0 +1,195 @@
+"""
+Synthetic transaction histories, for load testing and the budget tests.
+
+Rows are drawn column-wise with NumPy from (seed, user number), so a user
+gets the same history however many users are generated with it. Each user
+has a monthly salary, rent and subscriptions (what recurring detection
+looks for) on top of everyday spending spread over the period, with
+amounts log-normally distributed around each category's typical amount.
+
+Rows are built lazily and written one chunk at a time, with COPY on
+PostgreSQL (psycopg 3) and with bulk_create elsewhere. Like raw SQL writes they skip the rollup signals, so callers
+rebuild the rollups afterwards (see `manage.py generate_transactions`).
+"""
+import calendar
+import datetime
+import heapq
+import itertools
+from decimal import Decimal
+
+import numpy as np
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from core.constants import EXPENSE, INCOME
+from .categories import forget_categories
+from .dates import resolve_dates
+from .models import Category, Transaction
+
+# (name, is_income, share of the everyday rows, typical amount, descriptions)
+CATEGORY_PROFILES = [
+    ("Groceries", False, 0.28, 45, ["Supermarket", "Farmers market", "Bakery", "Corner shop"]),
+    ("Dining", False, 0.18, 25, ["Coffee shop", "Pizza place", "Sushi bar", "Lunch"]),
+    ("Transport", False, 0.14, 12, ["Metro card", "Taxi", "Fuel", "Parking"]),
+    ("Shopping", False, 0.12, 60, ["Online order", "Clothing store", "Electronics", "Bookshop"]),
+    ("Entertainment", False, 0.08, 30, ["Cinema tickets", "Concert", "Museum"]),
+    ("Health", False, 0.06, 40, ["Pharmacy", "Dentist", "Gym day pass"]),
+    ("Utilities", False, 0.05, 80, ["Electricity bill", "Water bill", "Phone bill"]),
+    ("Travel", False, 0.04, 250, ["Hotel", "Train tickets", "Flight"]),
+    ("Freelance", True, 0.03, 400, ["Client payment", "Consulting invoice"]),
+    (None, False, 0.02, 20, ["Cash withdrawal", "Bank transfer"]),
+]
+
+# (category, is_income, day of month, amount, description), every month
+MONTHLY = [
+    ("Salary", True, 25, Decimal("3200.00"), "Payroll"),
+    ("Rent", False, 1, Decimal("1150.00"), "Monthly rent"),
+    ("Subscriptions", False, 5, Decimal("12.99"), "Music streaming"),
+    ("Subscriptions", False, 14, Decimal("9.99"), "Cloud storage"),
+]
+
+CATEGORY_NAMES = [
+    (name, is_income) for name, is_income, *_ in CATEGORY_PROFILES if name is not None
+] + list(dict.fromkeys((name, is_income) for name, is_income, *_ in MONTHLY))
+
+# Spread of the everyday amounts around the typical one
+AMOUNT_SIGMA = 0.6
+
+CHUNK_SIZE = 50000
+
+# Rows turned from NumPy columns into Python tuples at a time
+ROW_BLOCK = 10000
+
+
+def create_categories(user, using=None):
+    """
+    The generated categories for `user`, as {name: id}.
+    """
+    using = using or router.db_for_write(Category)
+    Category.objects.using(using).bulk_create(
+        [Category(user=user, name=name, is_income=is_income) for name, is_income in CATEGORY_NAMES],
+        ignore_conflicts=True,
+    )
+    forget_categories(user.pk)
+    return dict(Category.objects.using(using).filter(user=user).values_list("name", "id"))
+
+
+def generate_rows(count, seed, user_number, categories, date_ids, first, days):
+    """
+    Yield `count` (category_id, full_date, date_id, amount, description,
+    type) tuples over the `days` days from `first`, in date order.
+    `categories` maps names to ids and `date_ids` days to Date ids.
+    """
+    rng = np.random.default_rng([seed, user_number])
+    last = first + datetime.timedelta(days=days - 1)
+
+    monthly = []
+    month = first.replace(day=1)
+    while month <= last:
+        month_days = calendar.monthrange(month.year, month.month)[1]
+        for name, is_income, day, amount, description in MONTHLY:
+            full_date = month.replace(day=min(day, month_days))
+            if first <= full_date <= last:
+                monthly.append((full_date, categories[name], amount if is_income else -amount, description, is_income))
+        month = (month + datetime.timedelta(days=31)).replace(day=1)
+    monthly = monthly[:count]
+    monthly.sort(key=lambda row: row[0])
+
+    # Only these compact columns are held for the whole history; tuples are
+    # built a block at a time as the caller consumes them
+    everyday = count - len(monthly)
+    shares = np.array([profile[2] for profile in CATEGORY_PROFILES])
+    picks = rng.choice(len(CATEGORY_PROFILES), size=everyday, p=shares / shares.sum()).astype(np.int8)
+    typical = np.array([profile[3] for profile in CATEGORY_PROFILES], dtype=float)[picks]
+    cents = np.maximum(np.rint(typical * 100 * rng.lognormal(0, AMOUNT_SIGMA, everyday)), 1).astype(np.int64)
+    del typical
+    offsets = rng.integers(0, days, everyday).astype(np.int32)
+    variants = rng.integers(0, 1 << 16, everyday).astype(np.int32)
+    order = np.argsort(offsets, kind="stable")
+
+    calendar_days = [first + datetime.timedelta(days=offset) for offset in range(days)]
+
+    def everyday_rows():
+        for start in range(0, everyday, ROW_BLOCK):
+            block = order[start : start + ROW_BLOCK]
+            for offset, pick, amount, variant in zip(
+                offsets[block].tolist(), picks[block].tolist(), cents[block].tolist(), variants[block].tolist()
+            ):
+                name, is_income, _, _, descriptions = CATEGORY_PROFILES[pick]
+                amount = Decimal(amount if is_income else -amount).scaleb(-2)
+                yield (
+                    calendar_days[offset],
+                    categories.get(name),
+                    amount,
+                    descriptions[variant % len(descriptions)],
+                    is_income,
+                )
+
+    # Stable: on the same day everyday rows come before the monthly ones
+    for full_date, category_id, amount, description, is_income in heapq.merge(
+        everyday_rows(), monthly, key=lambda row: row[0]
+    ):
+        yield (category_id, full_date, date_ids[full_date], amount, description, INCOME if is_income else EXPENSE)
+
+
+def supports_copy(using):
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    return is_psycopg3
+
+
+def copy_transactions(user_id, rows, using):
+    """
+    COPY `rows` (see generate_rows) into the transaction table.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    columns = ["user", "category", "full_date", "date", "amount", "description", "type", "updated_at"]
+    sql = "COPY {} ({}) FROM STDIN".format(
+        quote(Transaction._meta.db_table),
+        ", ".join(quote(Transaction._meta.get_field(name).column) for name in columns),
+    )
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(sql) as copy:
+            for row in rows:
+                copy.write_row((user_id, *row, now))
+
+
+def insert_transactions(user_id, rows, using):
+    Transaction.objects.using(using).bulk_create(
+        Transaction(
+            user_id=user_id,
+            category_id=category_id,
+            full_date=full_date,
+            date_id=date_id,
+            amount=amount,
+            description=description,
+            type=t_type,
+        )
+        for category_id, full_date, date_id, amount, description, t_type in rows
+    )
+
+
+def generate_transactions(user, user_number, count, seed=0, end=None, days=730, chunk_size=CHUNK_SIZE, using=None):
+    """
+    Give `user` the generated categories and `count` transactions over the
+    `days` days up to `end` (default today), each chunk of rows in its own
+    database transaction. Returns the categories as {name: id}.
+    """
+    using = using or router.db_for_write(Transaction)
+    end = end or timezone.localdate()
+    first = end - datetime.timedelta(days=days - 1)
+    categories = create_categories(user, using=using)
+    date_ids = resolve_dates((first + datetime.timedelta(days=offset) for offset in range(days)), using=using)
+    rows = generate_rows(count, seed, user_number, categories, date_ids, first, days)
+
+    write = copy_transactions if supports_copy(using) else insert_transactions
+    # One chunk of rows in memory at a time, however large `count` is
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        with transaction.atomic(using=using):
+            write(user.pk, chunk, using)
+    return categories
@@ -0,0 +1,57 @@
+"""
+Fixtures shared by the tracker test modules.
+"""
+import datetime
+import os
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from ..dates import date_resolver
+from ..models import Category, Transaction
+
+# Wall-clock budgets depend on the machine, so they're opt-in; query budgets
+# always apply
+CHECK_LATENCY = os.getenv("TRACKER_BENCH_LATENCY", "False").lower() == "true"
+
+
+def add_transaction(user, day, amount, category=None, description="Row"):
+    return Transaction.objects.create(
+        user=user,
+        category=category,
+        full_date=day,
+        date_id=date_resolver.resolve(day),
+        amount=amount,
+        description=description,
+    )
+
+
+@override_settings(TRACKER_DB_REPLICAS=[])
+class TrackerTestCase(TestCase):
+    """
+    Reads from the primary even when replicas are configured, as the test's
+    transaction isn't visible over a replica's own connection; core's
+    ReplicaRoutingTests cover the routing.
+    """
+
+
+class UserDataTestCase(TrackerTestCase):
+    """
+    alice with a "Food" category and one "Lunch" transaction, logged in,
+    starting each test with an empty tracker cache.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        date_resolver.clear()
+        cls.user = get_user_model().objects.create_user("alice", password="pw12345!x")
+        cls.category = Category.objects.create(user=cls.user, name="Food")
+        cls.transaction = add_transaction(cls.user, datetime.date(2024, 5, 1), -12, cls.category, "Lunch")
+
+    def setUp(self):
+        caches[settings.TRACKER_CACHE_ALIAS].clear()
+        # Date ids resolved by an earlier test were rolled back with it
+        date_resolver.clear()
+        self.client.force_login(self.user)
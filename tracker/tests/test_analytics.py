@@ -0,0 +1,141 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.constants import EXPENSE, INCOME
+from ..analytics import category_breakdown
+from ..analytics_engine import TransactionFrame
+from ..management.commands.benchmark_analytics import python_trends, synthetic_rows
+from ..models import Category, Transaction
+from ..synthetic import generate_transactions
+from .base import UserDataTestCase, add_transaction
+
+TODAY = datetime.date(2024, 6, 15)
+
+
+def figures(breakdown):
+    return [
+        (c["name"], c["count"], c["income"], c["expenses"], c["income_percent"], c["expenses_percent"])
+        for c in breakdown["categories"]
+    ]
+
+
+class CategoryBreakdownTests(UserDataTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.rent = Category.objects.create(user=cls.user, name="Rent")
+        add_transaction(cls.user, datetime.date(2024, 5, 10), -8, cls.category)
+        add_transaction(cls.user, datetime.date(2024, 6, 2), -1000, cls.rent)
+        add_transaction(cls.user, datetime.date(2024, 6, 1), 2500, description="Salary")
+        bob = get_user_model().objects.create_user("bob", password="pw12345!x")
+        add_transaction(bob, datetime.date(2024, 5, 1), -7, Category.objects.create(user=bob, name="Food"))
+
+    def test_figures(self):
+        breakdown = category_breakdown(self.user.pk)
+        self.assertEqual(figures(breakdown), [
+            ("Rent", 1, 0, Decimal("1000"), 0, Decimal("98.0")),
+            ("Food", 2, 0, Decimal("20"), 0, Decimal("2.0")),
+            ("Uncategorized", 1, Decimal("2500"), 0, Decimal("100.0"), 0),
+        ])
+        self.assertEqual(
+            (breakdown["total_income"], breakdown["total_expenses"], breakdown["count"]),
+            (Decimal("2500"), Decimal("1020"), 4),
+        )
+
+    def test_date_range(self):
+        breakdown = category_breakdown(self.user.pk, datetime.date(2024, 5, 5), datetime.date(2024, 6, 1))
+        self.assertEqual(figures(breakdown), [
+            ("Food", 1, 0, Decimal("8"), 0, Decimal("100.0")),
+            ("Uncategorized", 1, Decimal("2500"), 0, Decimal("100.0"), 0),
+        ])
+
+    def test_cached_until_the_data_changes(self):
+        category_breakdown(self.user.pk)
+        with self.assertNumQueries(0):
+            category_breakdown(self.user.pk)
+
+        add_transaction(self.user, datetime.date(2024, 6, 3), -30, self.category)
+        self.assertEqual(figures(category_breakdown(self.user.pk))[1][:4], ("Food", 3, 0, Decimal("50")))
+
+        self.rent.name = "Housing"
+        self.rent.save()
+        self.assertEqual(figures(category_breakdown(self.user.pk))[0][0], "Housing")
+
+        # SET_NULL moves the rows without Transaction signals
+        self.category.delete()
+        self.assertEqual(
+            [c[:4] for c in figures(category_breakdown(self.user.pk))],
+            [("Housing", 1, 0, Decimal("1000")), ("Uncategorized", 4, Decimal("2500"), Decimal("50"))],
+        )
+
+    def test_view(self):
+        response = self.client.get(reverse("analytics-categories"), {"start_date": "2024-06-01"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c["name"] for c in response.context["breakdown"]["categories"]], ["Rent", "Uncategorized"])
+        self.assertContains(response, "Rent")
+
+
+class TransactionFrameTests(SimpleTestCase):
+    """
+    The NumPy engine against the per-row loop benchmark_analytics times it
+    with.
+    """
+
+    def assertMatchesLoop(self, rows, today=TODAY):
+        self.assertEqual(TransactionFrame.from_rows(rows).trends(today), python_trends(rows, today))
+
+    def test_synthetic_rows(self):
+        for size, seed in [(1, 0), (50, 1), (5000, 2)]:
+            with self.subTest(size=size, seed=seed):
+                self.assertMatchesLoop(synthetic_rows(size, seed, TODAY))
+
+    def test_edge_cases(self):
+        expense = (datetime.date(2024, 1, 31), Decimal("-10.05"), None, EXPENSE)
+        income = (datetime.date(2024, 4, 1), Decimal("0.01"), 1, INCOME)
+        for name, rows in [
+            ("no rows", []),
+            ("shorter than the window", [expense, (datetime.date(2024, 2, 1), Decimal("-3"), 2, EXPENSE)]),
+            ("months without rows", [expense, income]),
+            ("only this month", [(TODAY, Decimal("-99.99"), None, EXPENSE)]),
+        ]:
+            with self.subTest(name):
+                self.assertMatchesLoop(rows)
+
+    def test_figures(self):
+        rows = [
+            (datetime.date(2024, 5, 1), Decimal("2000"), None, INCOME),
+            (datetime.date(2024, 5, 20), Decimal("-500"), None, EXPENSE),
+            (datetime.date(2024, 6, 1), Decimal("2000"), None, INCOME),
+            (datetime.date(2024, 6, 10), Decimal("-1500"), None, EXPENSE),
+        ]
+        trends = TransactionFrame.from_rows(rows).trends(TODAY)
+        june, may = trends["months"]
+        self.assertEqual((june["net"], june["net_change"], june["net_change_percent"]), (500, -1000, -66.7))
+        self.assertEqual((june["savings_rate"], may["savings_rate"], may["net_change"]), (25.0, 75.0, None))
+        # 15 of June's 30 days have passed
+        self.assertEqual(trends["projection"]["projected_expenses"], 3000)
+
+
+class SpendingTrendsTests(UserDataTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        generate_transactions(cls.user, 1, 300, days=120, seed=3)
+
+    def test_matches_the_loop_on_stored_rows(self):
+        today = timezone.localdate()
+        rows = list(Transaction.objects.filter(user=self.user).values_list("full_date", "amount", "category_id", "type"))
+        # Cents computed by the database, as the trends page loads them
+        self.assertEqual(TransactionFrame.for_user(self.user.pk).trends(today), python_trends(rows, today))
+
+    def test_view(self):
+        response = self.client.get(reverse("analytics-trends"))
+        self.assertEqual(response.status_code, 200)
+        latest = response.context["months"][0]
+        in_month = Transaction.objects.filter(user=self.user, full_date__gte=latest["month"])
+        self.assertEqual(latest["count"], in_month.count())
@@ -0,0 +1,139 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from core.constants import EXPENSE, INCOME
+from ..models import Category, Transaction
+from ..rollups import compute_rollups, stored_rollups
+from .base import UserDataTestCase, add_transaction
+
+
+class TransactionApiBatchTests(UserDataTestCase):
+    def batch(self, operations, all_or_nothing=False):
+        return self.client.post(
+            reverse("api-transaction-batch"),
+            {"operations": operations, "all_or_nothing": all_or_nothing},
+            content_type="application/json",
+        )
+
+    def create(self, **data):
+        return {"op": "create", "data": {
+            "date": "2024-05-02", "description": "Coffee", "amount": "3.50", "type": EXPENSE, **data,
+        }}
+
+    def test_non_integer_ids_and_categories(self):
+        response = self.batch([
+            {"op": "delete", "id": [1]},
+            {"op": "update", "id": {"pk": 1}, "data": {}},
+            {"op": "delete", "id": True},
+            self.create(category=[self.category.pk]),
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        for result in results[:3]:
+            self.assertEqual(result["errors"], {"id": ["Enter an integer."]})
+        self.assertEqual(list(results[3]["errors"]), ["category"])
+        self.assertTrue(Transaction.objects.filter(pk=self.transaction.pk).exists())
+
+    def test_mixed_operations(self):
+        doomed = add_transaction(self.user, datetime.date(2024, 4, 30), -40, description="Taxi")
+        response = self.batch([
+            self.create(category=self.category.pk),
+            {"op": "update", "id": self.transaction.pk, "data": {"description": "Dinner", "date": "2024-06-03"}},
+            {"op": "delete", "id": doomed.pk},
+            {"op": "create", "data": {"description": "No amount"}},
+            {"op": "rename"},
+        ])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body["applied"])
+        statuses = [result["status"] for result in body["results"]]
+        self.assertEqual(statuses, ["created", "updated", "deleted", "error", "error"])
+        self.assertEqual(set(body["results"][3]["errors"]), {"date", "amount", "type"})
+
+        created = Transaction.objects.get(pk=body["results"][0]["id"])
+        self.assertEqual((created.description, created.category_id), ("Coffee", self.category.pk))
+        self.transaction.refresh_from_db()
+        self.assertEqual(self.transaction.description, "Dinner")
+        self.assertEqual(self.transaction.full_date, datetime.date(2024, 6, 3))
+        self.assertEqual(self.transaction.date.full_date, datetime.date(2024, 6, 3))
+        self.assertEqual(self.transaction.amount, -12)
+        self.assertFalse(Transaction.objects.filter(pk=doomed.pk).exists())
+        self.assertEqual(stored_rollups([self.user.pk]), compute_rollups([self.user.pk]))
+
+    def test_all_or_nothing(self):
+        response = self.batch([
+            self.create(),
+            {"op": "update", "id": self.transaction.pk, "data": {"amount": "99"}},
+            {"op": "delete", "id": self.transaction.pk + 1000},
+        ], all_or_nothing=True)
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertFalse(body["applied"])
+        self.assertEqual([result["status"] for result in body["results"]], ["skipped", "skipped", "error"])
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 1)
+        self.transaction.refresh_from_db()
+        self.assertEqual(self.transaction.amount, -12)
+
+    def test_duplicate_ids(self):
+        response = self.batch([
+            {"op": "update", "id": self.transaction.pk, "data": {"amount": "20"}},
+            {"op": "delete", "id": self.transaction.pk},
+        ])
+        results = response.json()["results"]
+        self.assertEqual(results[0]["status"], "updated")
+        self.assertEqual(results[1]["errors"], {"id": ["Transaction appears more than once in this batch."]})
+        self.transaction.refresh_from_db()
+        self.assertEqual(self.transaction.amount, -20)
+
+    def test_other_users_transaction(self):
+        bob = get_user_model().objects.create_user("bob", password="pw12345!x")
+        theirs = add_transaction(bob, datetime.date(2024, 5, 1), -7, description="Bob's")
+        bobs_category = Category.objects.create(user=bob, name="Bob's")
+        response = self.batch([
+            {"op": "update", "id": theirs.pk, "data": {"amount": "1"}},
+            {"op": "delete", "id": theirs.pk},
+            self.create(category=bobs_category.pk),
+        ])
+        results = response.json()["results"]
+        self.assertEqual(results[0]["errors"], {"id": ["No such transaction."]})
+        self.assertEqual(results[1]["errors"], {"id": ["No such transaction."]})
+        self.assertEqual(list(results[2]["errors"]), ["category"])
+        theirs.refresh_from_db()
+        self.assertEqual(theirs.amount, -7)
+
+    def test_type_decides_the_sign(self):
+        response = self.batch([
+            self.create(amount="3.50", type=EXPENSE),
+            self.create(amount="-2500", type=INCOME),
+            # Changing only the type flips the stored sign
+            {"op": "update", "id": self.transaction.pk, "data": {"type": INCOME}},
+        ])
+        results = response.json()["results"]
+        amounts = [Transaction.objects.get(pk=result["id"]).amount for result in results]
+        self.assertEqual(amounts, [Decimal("-3.50"), Decimal("2500"), Decimal("12")])
+        self.assertEqual(stored_rollups([self.user.pk]), compute_rollups([self.user.pk]))
+
+
+class TransactionApiListTests(UserDataTestCase):
+    def test_filters(self):
+        add_transaction(self.user, datetime.date(2024, 6, 1), -30, description="Taxi")
+        url = reverse("api-transaction-list")
+        response = self.client.get(url, {"start_date": "2024-05-15", "end_date": "2024-06-30"})
+        self.assertEqual([row["description"] for row in response.json()["results"]], ["Taxi"])
+        response = self.client.get(url, {"category": self.category.pk})
+        self.assertEqual([row["description"] for row in response.json()["results"]], ["Lunch"])
+
+    def test_malformed_filters_are_a_400(self):
+        url = reverse("api-transaction-list")
+        for params, message in [
+            ({"end_date": "x"}, "end_date: Enter a date as YYYY-MM-DD."),
+            ({"start_date": "2024-13-01"}, "start_date: Enter a date as YYYY-MM-DD."),
+            ({"category": "food"}, "category: Enter a category id."),
+        ]:
+            with self.subTest(params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"error": message})
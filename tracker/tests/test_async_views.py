@@ -0,0 +1,87 @@
+import datetime
+import re
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.test import RequestFactory
+from django.urls import reverse
+
+from .. import async_views, views
+from ..mixins import CursorPaginateMixin
+from ..rollups import rebuild_rollups
+from ..synthetic import generate_transactions
+from .base import UserDataTestCase, add_transaction
+
+CSRF_TOKEN = re.compile(r'name="csrfmiddlewaretoken" value="[^"]+"')
+
+PAGES = [
+    (views.TransactionListView, async_views.AsyncTransactionListView, [
+        {},
+        {"page": "2", "sort": "-amount"},
+        {"q": "landlord", "start_date": "2024-03-01", "page_size": "25"},
+        {CursorPaginateMixin.cursor_param: "", "sort": "date"},
+    ]),
+    (views.AnalyticsHomeView, async_views.AsyncAnalyticsHomeView, [{}]),
+    (views.AnalyticsSummaryView, async_views.AsyncAnalyticsSummaryView, [{}]),
+    (views.AnalyticsMonthlyView, async_views.AsyncAnalyticsMonthlyView, [{}]),
+    (views.AnalyticsCategoriesView, async_views.AsyncAnalyticsCategoriesView, [
+        {},
+        {"start_date": "2024-02-01", "end_date": "2024-04-30"},
+    ]),
+    (views.AnalyticsTrendsView, async_views.AsyncAnalyticsTrendsView, [{}]),
+    (views.AnalyticsRecurringView, async_views.AsyncAnalyticsRecurringView, [{}]),
+]
+
+
+class AsyncViewTests(UserDataTestCase):
+    """
+    Each async view renders the same page as its sync counterpart.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        generate_transactions(cls.user, 1, 200, seed=4, end=datetime.date(2024, 5, 31), days=180)
+        for month in range(1, 6):
+            add_transaction(cls.user, datetime.date(2024, month, 3), -850, description="Landlord")
+        rebuild_rollups([cls.user.pk])
+
+    def render(self, view_class, params):
+        request = RequestFactory().get("/", params)
+        request.user = self.user
+        request.session = self.client.session
+
+        async def auser():
+            return self.user
+
+        request.auser = auser
+        # Nothing either view cached may leak into the other's page
+        for cache in caches.all():
+            cache.clear()
+        view = view_class.as_view()
+        response = async_to_sync(view)(request) if view_class.view_is_async else view(request)
+        self.assertEqual(response.status_code, 200)
+        return CSRF_TOKEN.sub("", response.render().content.decode())
+
+    def test_same_output(self):
+        for sync_view, async_view, queries in PAGES:
+            for params in queries:
+                with self.subTest(async_view.__name__, **params):
+                    self.assertEqual(self.render(async_view, params), self.render(sync_view, params))
+
+    def test_filtered_rows_are_rendered(self):
+        html = self.render(async_views.AsyncTransactionListView, {"q": "landlord", "start_date": "2024-03-01"})
+        self.assertEqual(html.count("<td>Landlord</td>"), 3)
+
+    def test_login_required(self):
+        request = RequestFactory().get("/analytics/summary/")
+
+        async def auser():
+            return AnonymousUser()
+
+        request.auser = auser
+        response = async_to_sync(async_views.AsyncAnalyticsSummaryView.as_view())(request)
+        self.assertRedirects(
+            response, f"{reverse('login')}?next=/analytics/summary/", fetch_redirect_response=False
+        )
@@ -0,0 +1,106 @@
+import datetime
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import autocomplete
+from ..autocomplete import HALF_LIFE_DAYS, PrefixIndex, Suggestion, frecency, suggest
+from ..models import Category
+from .base import UserDataTestCase, add_transaction
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def index(self, *texts):
+        # Listed best first
+        return PrefixIndex(Suggestion(text, 1, None, None, -rank) for rank, text in enumerate(texts))
+
+    def lookup(self, index, query, limit=10):
+        return [s.text for s in index.lookup(query, limit)]
+
+    def test_frecency(self):
+        today = datetime.date(2024, 6, 1)
+        self.assertEqual(frecency(4, today, today), 4)
+        self.assertEqual(frecency(4, today - datetime.timedelta(days=HALF_LIFE_DAYS), today), 2)
+        self.assertEqual(frecency(4, None, today), 0)
+
+    def test_word_prefixes(self):
+        index = self.index("Coffee beans", "Blue Bottle Coffee", "Costco", "Card 1234 fee")
+        for query, texts in [
+            ("co", ["Coffee beans", "Blue Bottle Coffee", "Costco"]),
+            ("coff", ["Coffee beans", "Blue Bottle Coffee"]),
+            ("COFFEE bl", ["Blue Bottle Coffee"]),
+            ("bottle b", ["Blue Bottle Coffee"]),
+            # Numbers aren't indexed or matched on
+            ("1234 fe", ["Card 1234 fee"]),
+            ("tea", []),
+            ("", ["Coffee beans", "Blue Bottle Coffee", "Costco", "Card 1234 fee"]),
+        ]:
+            with self.subTest(query):
+                self.assertEqual(self.lookup(index, query), texts)
+
+    def test_limit(self):
+        index = self.index(*(f"Shop {i}" for i in range(30)), "Shopping shop")
+        self.assertEqual(self.lookup(index, "sho", 3), ["Shop 0", "Shop 1", "Shop 2"])
+        # Both words match; listed once
+        self.assertEqual(self.lookup(index, "shop", 40).count("Shopping shop"), 1)
+
+
+class SuggestTests(UserDataTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        today = timezone.localdate()
+        cls.streaming = Category.objects.create(user=cls.user, name="Streaming")
+        for days_ago in (400, 370, 340):
+            add_transaction(cls.user, today - datetime.timedelta(days=days_ago), -5, description="Lunch Box")
+        add_transaction(cls.user, today, -5, cls.category, description="Lunch Bar")
+        for days_ago, number in [(60, 1586), (30, 1881), (0, 2044)]:
+            add_transaction(cls.user, today - datetime.timedelta(days=days_ago), -15, cls.streaming, f"NETFLIX.COM #{number}")
+        add_transaction(cls.user, today - datetime.timedelta(days=5), -15, description="Netflix.com #3000")
+
+    def setUp(self):
+        super().setUp()
+        autocomplete._indexes.clear()
+
+    def test_ranked_by_frequency_and_recency(self):
+        suggestions = suggest(self.user.pk, "lun")
+        # Three old uses count less than one today
+        self.assertEqual([s["text"] for s in suggestions["descriptions"]], ["Lunch Bar", "Lunch Box", "Lunch"])
+        self.assertEqual(suggestions["categories"], [])
+
+    def test_variants_are_merged(self):
+        [netflix] = suggest(self.user.pk, "netf")["descriptions"]
+        self.assertEqual(netflix, {
+            "text": "NETFLIX.COM #2044",
+            "count": 4,
+            "last_used": timezone.localdate().isoformat(),
+            "category_id": self.streaming.pk,
+        })
+
+    def test_categories(self):
+        self.assertEqual(suggest(self.user.pk, "stre")["categories"], [
+            {"id": self.streaming.pk, "name": "Streaming", "count": 3},
+        ])
+        self.assertEqual([c["name"] for c in suggest(self.user.pk, "")["categories"]], ["Streaming", "Food"])
+
+    def test_rebuilt_after_writes(self):
+        suggest(self.user.pk, "lun")
+        with self.assertNumQueries(0):
+            suggest(self.user.pk, "net")
+
+        add_transaction(self.user, timezone.localdate(), -9, description="Lunchtime deli")
+        self.assertIn("Lunchtime deli", [s["text"] for s in suggest(self.user.pk, "lunch")["descriptions"]])
+        self.streaming.name = "Video"
+        self.streaming.save()
+        self.assertEqual([c["name"] for c in suggest(self.user.pk, "vid")["categories"]], ["Video"])
+
+    def test_view(self):
+        url = reverse("transaction-autocomplete")
+        for limit, count in [("1", 1), ("0", 3), ("abc", 3), ("1000", 3)]:
+            with self.subTest(limit=limit):
+                response = self.client.get(url, {"q": "lunch", "limit": limit})
+                self.assertEqual(len(response.json()["descriptions"]), count)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(url, {"q": "lunch"}).status_code, 302)
@@ -0,0 +1,215 @@
+"""
+Query and latency budgets for the tracker views.
+
+Every case below declares the most SQL queries one request may issue and
+the most milliseconds it may take (the median of TRACKER_BENCH_REPEAT
+runs, plus `ms_per_100k` for views whose cost grows with the history).
+The views are measured for one user seeded with each size in
+TRACKER_BENCH_SIZES. A case over its query budget fails the run; one over
+its latency budget only fails it with TRACKER_BENCH_LATENCY=True, as wall
+time depends on the machine:
+
+    python manage.py test tracker                                  # 1k rows
+    TRACKER_BENCH_LATENCY=True TRACKER_BENCH_SIZES=1000,100000,1000000 python manage.py test tracker
+
+TRACKER_BENCH_LATENCY_SCALE loosens the latency budgets on slow machines;
+TRACKER_BENCH_REPORT=results.json keeps the measured numbers.
+"""
+import datetime
+import json
+import os
+import statistics
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.constants import EXPENSE
+from ..cache import data_version
+from ..dates import date_resolver
+from ..models import Transaction
+from ..recurring import DETECTED_KEY, refresh_recurring
+from ..rollups import rebuild_rollups
+from ..synthetic import generate_transactions
+from .base import CHECK_LATENCY, TrackerTestCase
+
+SIZES = [int(size) for size in os.getenv("TRACKER_BENCH_SIZES", "1000").split(",")]
+REPEAT = int(os.getenv("TRACKER_BENCH_REPEAT", 3))
+LATENCY_SCALE = float(os.getenv("TRACKER_BENCH_LATENCY_SCALE", 1))
+REPORT = os.getenv("TRACKER_BENCH_REPORT")
+
+Budget = namedtuple("Budget", ["queries", "ms", "ms_per_100k"], defaults=[0])
+
+# Session + user lookups of a logged-in request, both cached when warm
+AUTH_QUERIES = 0
+
+LIST_BUDGETS = {
+    # Page numbers also count the matches (tracker/counting.py); cursors don't
+    "page": Budget(AUTH_QUERIES + 3, 150, ms_per_100k=15),
+    "cursor": Budget(AUTH_QUERIES + 2, 150),
+}
+
+# Date ranges sort every match before taking a page
+SCAN_MS_PER_100K = 80
+# Searches too; without PostgreSQL's full-text index they also read every row
+SEARCH_MS_PER_100K = 80 if connection.vendor == "postgresql" else 250
+
+ANALYTICS_BUDGETS = {
+    "analytics-home": Budget(AUTH_QUERIES, 100),
+    "analytics-summary": Budget(AUTH_QUERIES + 1, 100),
+    "analytics-monthly": Budget(AUTH_QUERIES + 1, 100),
+    "analytics-categories": Budget(AUTH_QUERIES + 1, 150, ms_per_100k=150),
+    # Loads the whole history into NumPy columns
+    "analytics-trends": Budget(AUTH_QUERIES + 1, 250, ms_per_100k=600),
+    "analytics-recurring": Budget(AUTH_QUERIES + 2, 100),
+}
+
+SUBMIT_BUDGETS = {
+    "transaction-add": Budget(AUTH_QUERIES + 5, 150),
+    "transaction-edit": Budget(AUTH_QUERIES + 5, 150),
+}
+
+results = []
+
+
+class ViewBudgetMixin:
+    """
+    The budget cases, run against `size` seeded transactions.
+    """
+
+    size = None
+
+    @classmethod
+    def setUpTestData(cls):
+        # Date ids cached by earlier tests were rolled back with them
+        date_resolver.clear()
+        cls.user = get_user_model().objects.create_user("bench", password="pw12345!x")
+        cls.categories = generate_transactions(cls.user, 1, cls.size)
+        rebuild_rollups([cls.user.pk])
+        refresh_recurring(cls.user.pk)
+        cls.transaction = Transaction.objects.filter(user=cls.user).earliest("id")
+
+    def setUp(self):
+        date_resolver.clear()
+        self.client.force_login(self.user)
+
+    def measure(self, request):
+        """
+        Median wall time (ms) and query count of `request`, a callable
+        returning the response; analytics caches are cleared before each
+        run so every run computes.
+        """
+        request()  # templates, URL resolver, connection
+        timings, queries = [], None
+        for _ in range(REPEAT):
+            caches[settings.TRACKER_CACHE_ALIAS].clear()
+            # That cache holds the session too; reload it uncounted
+            self.client.session.load()
+            # and the recurring series' detection stamp: nothing was
+            # written, so they are still current
+            caches[settings.TRACKER_CACHE_ALIAS].set(
+                DETECTED_KEY.format(user_id=self.user.pk),
+                (data_version(self.user.pk), timezone.localdate().isoformat()),
+                timeout=None,
+            )
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = request()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = len(captured)
+        return response, statistics.median(timings), queries
+
+    def check_budget(self, name, budget, request, expected_status=200):
+        response, ms, queries = self.measure(request)
+        allowed_ms = (budget.ms + budget.ms_per_100k * self.size / 100000) * LATENCY_SCALE
+        results.append({
+            "case": name,
+            "size": self.size,
+            "ms": round(ms, 2),
+            "queries": queries,
+            "budget_ms": round(allowed_ms, 2),
+            "budget_queries": budget.queries,
+        })
+        self.assertEqual(response.status_code, expected_status, name)
+        self.assertLessEqual(queries, budget.queries, f"{name}: {queries} queries")
+        if CHECK_LATENCY:
+            self.assertLessEqual(ms, allowed_ms, f"{name}: {ms:.1f} ms")
+        return response
+
+    def list_filters(self):
+        today = timezone.localdate()
+        date_range = {"start_date": str(today - datetime.timedelta(days=365)), "end_date": str(today)}
+        category = {"category": str(self.categories["Groceries"])}
+        return {
+            "none": ({}, 0),
+            "category": (category, 0),
+            "date range": (date_range, SCAN_MS_PER_100K),
+            "category + date range": (dict(category, **date_range), SCAN_MS_PER_100K),
+            "search": ({"q": "rent"}, SEARCH_MS_PER_100K),
+        }
+
+    def test_transaction_list(self):
+        url = reverse("transaction-list")
+        for sort in ["date", "-date", "amount", "-amount"]:
+            for label, (params, scan_cost) in self.list_filters().items():
+                for mode, budget in LIST_BUDGETS.items():
+                    name = f"transaction-list sort={sort} filter={label} mode={mode}"
+                    budget = budget._replace(ms_per_100k=budget.ms_per_100k + scan_cost)
+                    params = dict(params, sort=sort)
+                    with self.subTest(name):
+                        if mode == "page":
+                            self.check_budget(name, budget, lambda: self.client.get(url, dict(params, page=2)))
+                        else:
+                            # Follow the first page's "next" cursor
+                            first = self.client.get(url, dict(params, paginate="cursor"))
+                            cursor = first.context["page_obj"].next_cursor or ""
+                            self.check_budget(
+                                name,
+                                budget,
+                                lambda: self.client.get(url, dict(params, paginate="cursor", cursor=cursor)),
+                            )
+
+    def test_analytics(self):
+        for name, budget in ANALYTICS_BUDGETS.items():
+            with self.subTest(name):
+                self.check_budget(name, budget, lambda: self.client.get(reverse(name)))
+
+    def test_form_submit(self):
+        data = {
+            "raw_date": str(timezone.localdate()),
+            "description": "Budget check",
+            "amount": "12.50",
+            "type": EXPENSE,
+            "category": self.categories["Dining"],
+        }
+        self.check_budget(
+            "transaction-add",
+            SUBMIT_BUDGETS["transaction-add"],
+            lambda: self.client.post(reverse("transaction-add"), data),
+            expected_status=302,
+        )
+        self.check_budget(
+            "transaction-edit",
+            SUBMIT_BUDGETS["transaction-edit"],
+            lambda: self.client.post(reverse("transaction-edit", args=[self.transaction.pk]), data),
+            expected_status=302,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if REPORT:
+            with open(REPORT, "w") as f:
+                json.dump(results, f, indent=2)
+
+
+# One test case class per seeded size
+for _size in SIZES:
+    _name = f"ViewBudgetTests{_size}"
+    globals()[_name] = type(_name, (ViewBudgetMixin, TrackerTestCase), {"size": _size})
@@ -0,0 +1,56 @@
+import datetime
+
+from django.test import override_settings
+
+from core.routers import end_request, use_replica
+from ..cache import bump_data_version, cache_stats, cache_timeout, cached_for_user, data_version
+from ..models import Category
+from .base import UserDataTestCase, add_transaction
+
+
+class DataVersionTests(UserDataTestCase):
+    def lookups(self, name):
+        return cache_stats().get(name, {"hits": 0, "misses": 0})
+
+    def cached(self, compute):
+        return cached_for_user(self.user.pk, "test-cache", (1,), compute)
+
+    def test_writes_bump_the_version(self):
+        version = data_version(self.user.pk)
+        for write in [
+            lambda: add_transaction(self.user, datetime.date(2024, 5, 2), -3),
+            lambda: Category.objects.create(user=self.user, name="Rent"),
+            lambda: self.transaction.delete(),
+        ]:
+            write()
+            self.assertGreater(data_version(self.user.pk), version)
+            version = data_version(self.user.pk)
+
+    def test_hits_until_the_next_write(self):
+        before = self.lookups("test-cache")
+        self.assertEqual(self.cached(lambda: "first"), "first")
+        self.assertEqual(self.cached(lambda: "second"), "first")
+        add_transaction(self.user, datetime.date(2024, 5, 2), -3)
+        self.assertEqual(self.cached(lambda: "third"), "third")
+
+        after = self.lookups("test-cache")
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(after["misses"] - before["misses"], 2)
+
+    def test_bumped_again_on_commit_of_its_database(self):
+        version = data_version(self.user.pk)
+        with self.captureOnCommitCallbacks(using="default", execute=True) as callbacks:
+            bump_data_version(self.user.pk, using="default")
+            bumped = data_version(self.user.pk)
+        self.assertEqual(len(callbacks), 1)
+        self.assertGreater(bumped, version)
+        self.assertGreater(data_version(self.user.pk), bumped)
+
+    @override_settings(TRACKER_CACHE_TIMEOUT=600, TRACKER_REPLICA_STICKY_SECONDS=5, TRACKER_DB_REPLICAS=["replica"])
+    def test_timeout_is_capped_on_a_replica(self):
+        self.assertEqual((cache_timeout(), cache_timeout(30)), (600, 30))
+        use_replica()
+        try:
+            self.assertEqual((cache_timeout(), cache_timeout(3)), (5, 3))
+        finally:
+            end_request()
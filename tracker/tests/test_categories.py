@@ -0,0 +1,37 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Category
+from .base import UserDataTestCase
+
+
+class CategoryCacheTests(UserDataTestCase):
+    def category_queries(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        return response, [query for query in captured if 'FROM "tracker_category"' in query["sql"]]
+
+    def test_no_category_queries_after_warm_up(self):
+        urls = [
+            reverse("transaction-list"),
+            reverse("transaction-add"),
+            reverse("transaction-edit", args=[self.transaction.pk]),
+        ]
+        self.client.get(urls[0])
+        for url in urls:
+            response, queries = self.category_queries(url)
+            self.assertContains(response, ">Food<", html=False)
+            self.assertEqual(queries, [], url)
+
+    def test_category_writes_show_up(self):
+        url = reverse("transaction-add")
+        self.client.get(url)
+        self.category.name = "Groceries"
+        self.category.save()
+        Category.objects.create(user=self.user, name="Rent")
+        response = self.client.get(url)
+        self.assertContains(response, ">Groceries<", html=False)
+        self.assertContains(response, ">Rent<", html=False)
+        self.category.delete()
+        self.assertNotContains(self.client.get(url), ">Groceries<", html=False)
@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..counting import RowCount
+from ..dates import date_resolver
+from ..rollups import rebuild_rollups
+from ..synthetic import generate_transactions
+from .base import TrackerTestCase
+
+
+class RowCountTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        date_resolver.clear()
+        cls.user = get_user_model().objects.create_user(username="counted", password="pw12345!x")
+        generate_transactions(cls.user, 1, 150, days=60)
+        rebuild_rollups([cls.user.pk])
+
+    def setUp(self):
+        caches[settings.TRACKER_CACHE_ALIAS].clear()
+        self.client.force_login(self.user)
+
+    def test_display(self):
+        self.assertEqual(str(RowCount(40001)), "40,001")
+        self.assertEqual(str(RowCount(1000, exact=False)), "1,000+")
+        self.assertEqual(str(RowCount(25000, exact=False, estimated=True)), "about 25,000")
+
+    def test_unfiltered_count_comes_from_rollups(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse("transaction-list"))
+        self.assertEqual(response.context["paginator"].count, 150)
+        self.assertFalse(any("COUNT(" in query["sql"] for query in captured))
+
+    def test_capped_count(self):
+        with mock.patch("tracker.counting.COUNT_CAP", 25):
+            response = self.client.get(reverse("transaction-list"), {"start_date": "2000-01-01", "page": 10})
+        page = response.context["page_obj"]
+        self.assertFalse(page.paginator.count_exact)
+        self.assertContains(response, "of 25+)")
+        self.assertNotContains(response, "Last »")
+        # Past the cap, yet still served
+        self.assertEqual(page.start_index(), 91)
+
+    def test_count_is_cached(self):
+        url = reverse("transaction-list")
+        self.client.get(url, {"q": "rent"})
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(url, {"q": "rent", "page": 1})
+        self.assertFalse(any("COUNT(" in query["sql"] for query in captured))
@@ -0,0 +1,110 @@
+import datetime
+import io
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, transaction
+
+from ..dates import DateResolver, build_date, date_resolver
+from ..models import Date
+from .base import TrackerTestCase
+
+MAY_1 = datetime.date(2024, 5, 1)
+MAY_2 = datetime.date(2024, 5, 2)
+MAY_3 = datetime.date(2024, 5, 3)
+
+
+class DateResolverTests(TrackerTestCase):
+    def setUp(self):
+        self.resolver = DateResolver(maxsize=2)
+
+    def resolve(self, *days):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.resolver.resolve_many(days)
+
+    def test_creates_missing_days(self):
+        existing = Date.objects.create(full_date=MAY_1, year=2024, month=5, day=1, weekday="Wednesday", quarter=2)
+        resolved = self.resolve(MAY_1, MAY_2)
+        self.assertEqual(resolved[MAY_1], existing.pk)
+        created = Date.objects.get(pk=resolved[MAY_2])
+        self.assertEqual((created.full_date, created.weekday, created.quarter), (MAY_2, "Thursday", 2))
+        self.assertEqual(Date.objects.count(), 2)
+
+    def test_row_inserted_by_a_concurrent_writer(self):
+        # The other writer inserts the day after our read found nothing
+        winner = build_date(MAY_1)
+        fetch = self.resolver._fetch
+
+        def racing_fetch(days, using):
+            if not winner.pk:
+                found = fetch(days, using)
+                winner.save(using=using)
+                return found
+            return fetch(days, using)
+
+        with mock.patch.object(self.resolver, "_fetch", side_effect=racing_fetch):
+            self.assertEqual(self.resolve(MAY_1), {MAY_1: winner.pk})
+        self.assertEqual(Date.objects.filter(full_date=MAY_1).count(), 1)
+
+    def test_warm_days_skip_the_database(self):
+        self.resolve(MAY_1, MAY_2)
+        with self.assertNumQueries(0):
+            self.resolve(MAY_1, MAY_2)
+
+    def test_least_recently_used_days_are_evicted(self):
+        self.resolve(MAY_1)
+        self.resolve(MAY_2)
+        self.resolve(MAY_1)
+        self.resolve(MAY_3)
+        with self.assertNumQueries(0):
+            self.resolve(MAY_1, MAY_3)
+        with self.assertNumQueries(1):
+            self.resolve(MAY_2)
+
+    def test_rolled_back_ids_are_not_cached(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.resolver.resolve(MAY_1)
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+        self.assertEqual((callbacks, len(self.resolver._cache)), ([], 0))
+        self.assertFalse(Date.objects.filter(full_date=MAY_1).exists())
+        day_id = self.resolve(MAY_1)[MAY_1]
+        self.assertEqual(Date.objects.get(pk=day_id).full_date, MAY_1)
+
+    def test_cleared_when_dates_are_deleted(self):
+        date_resolver.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            date_resolver.resolve(MAY_1)
+        self.assertEqual(len(date_resolver._cache), 1)
+        Date.objects.get(full_date=MAY_1).delete()
+        self.assertEqual(len(date_resolver._cache), 0)
+
+
+class SeedDatesTests(TrackerTestCase):
+    def seed(self, *args):
+        out = io.StringIO()
+        call_command("seed_dates", *args, stdout=out)
+        return out.getvalue()
+
+    def test_seeds_the_range(self):
+        output = self.seed("--start", "2024-02-01", "--end", "2024-03-31", "--batch-size", "7")
+        self.assertIn("60 inserted, 0 skipped", output)
+        self.assertEqual(Date.objects.count(), 60)
+        leap_day = Date.objects.get(full_date=datetime.date(2024, 2, 29))
+        self.assertEqual((leap_day.weekday, leap_day.quarter), ("Thursday", 1))
+
+    def test_idempotent(self):
+        self.seed("--start", "2024-02-01", "--end", "2024-02-29")
+        ids = dict(Date.objects.values_list("full_date", "id"))
+        output = self.seed("--start", "2024-02-15", "--end", "2024-03-15")
+        self.assertIn("15 inserted, 15 skipped", output)
+        self.assertEqual(Date.objects.count(), 29 + 15)
+        # Existing rows are left alone
+        self.assertEqual(dict(Date.objects.filter(full_date__in=ids).values_list("full_date", "id")), ids)
+
+    def test_rejects_an_empty_range(self):
+        with self.assertRaises(CommandError):
+            self.seed("--start", "2024-03-01", "--end", "2024-02-01")
@@ -0,0 +1,71 @@
+import csv
+import datetime
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from core.constants import INCOME
+from ..models import Transaction
+from .base import UserDataTestCase, add_transaction
+
+
+class TransactionExportTests(UserDataTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        salary = add_transaction(cls.user, datetime.date(2024, 6, 1), 2500, description="Salary")
+        Transaction.objects.filter(pk=salary.pk).update(type=INCOME)
+        bob = get_user_model().objects.create_user("bob", password="pw12345!x")
+        add_transaction(bob, datetime.date(2024, 5, 1), -7, description="Bob's")
+
+    def export(self, **params):
+        response = self.client.get(reverse("transaction-export"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def csv_rows(self, **params):
+        return list(csv.reader(io.StringIO(self.export(format="csv", **params)[1])))
+
+    def test_csv(self):
+        response, body = self.export(sort="date")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertRegex(response["Content-Disposition"], r'^attachment; filename="transactions-\d{8}\.csv"$')
+        self.assertEqual(list(csv.reader(io.StringIO(body))), [
+            ["date", "description", "amount", "type", "category"],
+            ["2024-05-01", "Lunch", "-12.00", "expense", "Food"],
+            ["2024-06-01", "Salary", "2500.00", "income", ""],
+        ])
+
+    def test_ndjson(self):
+        response, body = self.export(format="ndjson", sort="-date")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual([json.loads(line) for line in body.splitlines()], [
+            {"date": "2024-06-01", "description": "Salary", "amount": "2500.00", "type": "income", "category": None},
+            {"date": "2024-05-01", "description": "Lunch", "amount": "-12.00", "type": "expense", "category": "Food"},
+        ])
+
+    def test_filters(self):
+        for params, descriptions in [
+            ({"category": self.category.pk}, ["Lunch"]),
+            ({"start_date": "2024-05-02"}, ["Salary"]),
+            ({"end_date": "2024-05-31"}, ["Lunch"]),
+            ({"q": "salary"}, ["Salary"]),
+            ({"start_date": "2024-05-02", "end_date": "2024-05-31"}, []),
+        ]:
+            with self.subTest(params):
+                rows = self.csv_rows(**params)[1:]
+                self.assertEqual([row[1] for row in rows], descriptions)
+
+    def test_malformed_filters_are_ignored(self):
+        for params in [{"start_date": "2024-13-01"}, {"end_date": "abc"}, {"category": "food"}]:
+            with self.subTest(params):
+                self.assertEqual(len(self.csv_rows(**params)), 3)
+                response = self.client.get(reverse("transaction-list"), params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context["paginator"].count, 2)
+
+    def test_unknown_format(self):
+        self.assertEqual(self.client.get(reverse("transaction-export"), {"format": "xlsx"}).status_code, 404)
@@ -0,0 +1,43 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .base import UserDataTestCase
+
+
+class FragmentCacheTests(UserDataTestCase):
+    def test_cached_table_skips_the_page_query(self):
+        url = reverse("transaction-list")
+        first = self.client.get(url)
+        with CaptureQueriesContext(connection) as cold:
+            self.client.get(url, {"sort": "amount"})
+        with CaptureQueriesContext(connection) as warm:
+            second = self.client.get(url, {"sort": "amount"})
+        self.assertEqual(len(warm), len(cold) - 1)
+        self.assertContains(second, "Lunch")
+        self.assertEqual(first.content.count(b"<tr>"), second.content.count(b"<tr>"))
+
+    def test_edits_show_up(self):
+        url = reverse("transaction-list")
+        self.client.get(url)
+        self.transaction.description = "Dinner"
+        self.transaction.save()
+        self.category.name = "Eating out"
+        self.category.save()
+        response = self.client.get(url)
+        self.assertContains(response, "Dinner")
+        self.assertContains(response, "<td>Eating out</td>", html=False)
+        self.assertNotContains(response, "Lunch")
+
+    def test_api_edits_show_up(self):
+        url = reverse("transaction-list")
+        self.assertContains(self.client.get(url), "12.00")
+        response = self.client.patch(
+            reverse("api-transaction-detail", args=[self.transaction.pk]),
+            {"amount": "777"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url)
+        self.assertContains(response, "777.00")
+        self.assertNotContains(response, "12.00")
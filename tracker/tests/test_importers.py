@@ -0,0 +1,162 @@
+import datetime
+import io
+import os
+import tempfile
+from decimal import Decimal
+from functools import partial
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from core.constants import EXPENSE, INCOME
+from ..dates import date_resolver
+from ..importers import (
+    CHUNK_SIZE,
+    ImportFormatError,
+    TransactionImporter,
+    _ofx_tokens,
+    detect_format,
+    parse_csv,
+    parse_ofx,
+)
+from ..models import Category, Transaction
+from ..rollups import compute_rollups, stored_rollups
+
+
+OFX_SGML = (
+    "OFXHEADER:100\nDATA:OFXSGML\n\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>"
+    "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240131120000.000[-5:EST]<TRNAMT>-12.50<NAME>Caf&eacute; Bar</STMTTRN>"
+    "<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240201<TRNAMT>2500.00<MEMO>Salary</STMTTRN>"
+    "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"
+)
+
+OFX_XML = """<?xml version="1.0"?>
+<OFX><BANKTRANLIST>
+  <STMTTRN>
+    <DTPOSTED>20240305</DTPOSTED>
+    <TRNAMT>-9.99</TRNAMT>
+    <NAME>Streaming &amp; Co</NAME>
+  </STMTTRN>
+</BANKTRANLIST></OFX>
+"""
+
+
+class ImportParserTests(SimpleTestCase):
+    def test_csv(self):
+        stream = io.StringIO(
+            " Date ,Description,AMOUNT,Category,Notes\n"
+            "2024-05-01, Lunch ,-12.00,Food,ignored\n"
+            '2024-05-02,"Rent, May",950,,\n'
+        )
+        self.assertEqual(list(parse_csv(stream)), [
+            (2, {"date": "2024-05-01", "description": "Lunch", "amount": "-12.00", "type": "", "category": "Food"}),
+            (3, {"date": "2024-05-02", "description": "Rent, May", "amount": "950", "type": "", "category": ""}),
+        ])
+
+    def test_csv_missing_columns(self):
+        with self.assertRaisesMessage(ImportFormatError, "Missing CSV column(s): amount, date."):
+            list(parse_csv(io.StringIO("description\nLunch\n")))
+        self.assertEqual(list(parse_csv(io.StringIO(""))), [])
+
+    def test_ofx_sgml(self):
+        # A small read size splits tags across reads
+        with mock.patch("tracker.importers._ofx_tokens", partial(_ofx_tokens, read_size=7)):
+            rows = list(parse_ofx(io.StringIO(OFX_SGML)))
+        self.assertEqual(rows, [
+            (1, {"date": "2024-01-31", "description": "Café Bar", "amount": "-12.50", "type": "", "category": ""}),
+            (2, {"date": "2024-02-01", "description": "Salary", "amount": "2500.00", "type": "", "category": ""}),
+        ])
+
+    def test_ofx_xml(self):
+        self.assertEqual(list(parse_ofx(io.StringIO(OFX_XML))), [
+            (1, {"date": "2024-03-05", "description": "Streaming & Co", "amount": "-9.99", "type": "", "category": ""}),
+        ])
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format("statement.CSV"), "csv")
+        self.assertEqual(detect_format("statement.ofx"), "ofx")
+        self.assertEqual(detect_format("statement.qfx"), "ofx")
+        for name in ("statement.xlsx", "statement"):
+            with self.assertRaises(ImportFormatError):
+                detect_format(name)
+
+
+class TransactionImporterTests(TestCase):
+    def setUp(self):
+        date_resolver.clear()
+        self.user = get_user_model().objects.create_user("alice", password="pw12345!x")
+        self.food = Category.objects.create(user=self.user, name="Food")
+
+    def run_csv(self, text, chunk_size=CHUNK_SIZE):
+        importer = TransactionImporter(self.user, chunk_size=chunk_size)
+        return importer.run(parse_csv(io.StringIO("date,description,amount,type,category\n" + text)))
+
+    def test_signs(self):
+        result = self.run_csv(
+            "2024-05-01,Refund,15,,\n"
+            "2024-05-02,Lunch,-12,,\n"
+            "2024-05-03,Rent,950,expense,\n"
+            "2024-05-04,Salary,-2500,INCOME,\n"
+        )
+        self.assertEqual(result.created, 4)
+        rows = Transaction.objects.filter(user=self.user).order_by("full_date").values_list("amount", "type")
+        self.assertEqual(list(rows), [
+            (Decimal("15"), INCOME),
+            (Decimal("-12"), EXPENSE),
+            (Decimal("-950"), EXPENSE),
+            (Decimal("2500"), INCOME),
+        ])
+
+    def test_bad_rows(self):
+        result = self.run_csv(
+            "2024-05-01,Lunch,-12,,\n"
+            "05/02/2024,Bad date,-1,,\n"
+            "2024-05-03,Zero,0,,\n"
+            "2024-05-04,  ,-1,,\n"
+            "2024-05-05,Bad type,-1,transfer,\n"
+            "2024-05-06,Bad amount,abc,,\n"
+            f"2024-05-07,Long category,-1,,{'x' * 51}\n"
+            "2024-05-08,Dinner,-20,,\n",
+            chunk_size=3,
+        )
+        self.assertEqual((result.rows, result.created, result.error_count), (8, 2, 6))
+        self.assertEqual([error.line for error in result.errors], [3, 4, 5, 6, 7, 8])
+        self.assertIn("Invalid date", str(result.errors[0]))
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 2)
+
+    def test_categories(self):
+        self.run_csv(
+            "2024-05-01,Lunch,-12,,Food\n"
+            "2024-05-02,Salary,2500,,Job\n"
+            "2024-05-03,Bonus,300,,Job\n"
+            "2024-05-04,Misc,-1,,\n",
+            chunk_size=2,
+        )
+        self.assertEqual(Category.objects.filter(user=self.user, name="Food").get(), self.food)
+        job = Category.objects.get(user=self.user, name="Job")
+        self.assertTrue(job.is_income)
+        categories = dict(
+            Transaction.objects.filter(user=self.user).values_list("description", "category__name")
+        )
+        self.assertEqual(categories, {"Lunch": "Food", "Salary": "Job", "Bonus": "Job", "Misc": None})
+
+    def test_import_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "statement.csv")
+            with open(path, "wb") as f:
+                # UTF-8 with a byte-order mark, plus one byte that isn't UTF-8
+                f.write(
+                    "\ufeffdate,description,amount,category\n".encode("utf-8")
+                    + "2024-05-01,Café,-4.20,Food\n".encode("utf-8")
+                    + b"2024-05-02,Caf\xe9,-3.80,Food\n"
+                    + b"2024-06-01,Salary,2500,Job\n"
+                )
+            out = io.StringIO()
+            call_command("import_transactions", path, user="alice", stdout=out, stderr=io.StringIO())
+        self.assertIn("3 of 3 rows imported, 0 rejected", out.getvalue())
+        descriptions = set(Transaction.objects.filter(user=self.user).values_list("description", flat=True))
+        self.assertEqual(descriptions, {"Café", "Caf\ufffd", "Salary"})
+        self.assertEqual(stored_rollups([self.user.pk]), compute_rollups([self.user.pk]))
+        self.assertEqual(stored_rollups([self.user.pk])[(self.user.pk, datetime.date(2024, 5, 1), self.food.pk)][2], 2)
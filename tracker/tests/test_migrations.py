@@ -0,0 +1,49 @@
+import datetime
+
+from django.conf import settings
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class FullDateBackfillTests(TransactionTestCase):
+    """
+    0004 fills Transaction.full_date from the Date dimension before 0005
+    makes the column required.
+    """
+
+    before = [("tracker", "0003_transaction_indexes")]
+    after = [("tracker", "0005_transaction_full_date_required")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # Back to the latest schema for the tests that follow
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        apps = self.migrate(self.before)
+        User = apps.get_model(settings.AUTH_USER_MODEL)
+        Date = apps.get_model("tracker", "Date")
+        Transaction = apps.get_model("tracker", "Transaction")
+        user = User.objects.create(username="alice")
+        days = [datetime.date(2024, 2, 29), datetime.date(2024, 3, 1)]
+        dates = [
+            Date.objects.create(full_date=day, year=day.year, month=day.month, day=day.day, weekday="", quarter=1)
+            for day in days
+        ]
+        for date in dates + dates[:1]:
+            Transaction.objects.create(user=user, date=date, description="Row", amount=-1, type="expense")
+
+        apps = self.migrate(self.after)
+        Transaction = apps.get_model("tracker", "Transaction")
+        self.assertEqual(
+            sorted(Transaction.objects.values_list("date__full_date", "full_date")),
+            [(days[0], days[0]), (days[0], days[0]), (days[1], days[1])],
+        )
+        self.assertFalse(Transaction._meta.get_field("full_date").null)
@@ -0,0 +1,78 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from django.urls import reverse
+
+from ..dates import date_resolver
+from ..views import TransactionListView
+from .base import TrackerTestCase, add_transaction
+
+
+class CursorPaginatorTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        date_resolver.clear()
+        cls.user = get_user_model().objects.create_user("alice", password="pw12345!x")
+        first = datetime.date(2024, 5, 1)
+        # Three dates and two amounts over 13 rows: every page boundary is a tie
+        for i in range(13):
+            day = first + datetime.timedelta(days=i % 3)
+            add_transaction(cls.user, day, -5 * (i % 2 + 1), description=f"Row {i}")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def view(self, sort):
+        view = TransactionListView()
+        view.request = RequestFactory().get(reverse("transaction-list"), {"sort": sort})
+        view.request.user = self.user
+        return view
+
+    def walk(self, paginator, token=None, backwards=False):
+        pages = []
+        while True:
+            page = paginator.page(token)
+            pages.append(page)
+            token = page.previous_cursor if backwards else page.next_cursor
+            if token is None:
+                return pages
+
+    def ids(self, pages):
+        return [[row.pk for row in page] for page in pages]
+
+    def test_every_sort(self):
+        for sort in TransactionListView.allowed_sorts:
+            with self.subTest(sort=sort):
+                view = self.view(sort)
+                queryset = view.get_queryset()
+                paginator = view.get_cursor_paginator(queryset, 4)
+
+                pages = self.walk(paginator)
+                forward = self.ids(pages)
+                self.assertEqual([len(page) for page in forward], [4, 4, 4, 1])
+                self.assertEqual(sum(forward, []), [row.pk for row in queryset])
+
+                # Back from the last page, through the previous cursors
+                back = self.walk(paginator, pages[-1].previous_cursor, backwards=True)
+                self.assertEqual(self.ids(back), forward[-2::-1])
+
+    def test_next_and_previous_round_trip(self):
+        view = self.view("-date")
+        paginator = view.get_cursor_paginator(view.get_queryset(), 5)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+        self.assertFalse(first.has_previous())
+        self.assertEqual(self.ids([paginator.page(second.previous_cursor)]), self.ids([first]))
+        self.assertEqual(self.ids([paginator.page(third.previous_cursor)]), self.ids([second]))
+
+    def test_bad_cursor_is_404(self):
+        url = reverse("transaction-list")
+        response = self.client.get(url, {"paginate": "cursor", "page_size": 4, "sort": "amount"})
+        token = response.context["page_obj"].next_cursor
+        self.assertEqual(self.client.get(url, {"paginate": "cursor", "sort": "amount", "cursor": token}).status_code, 200)
+        for sort, cursor in [("amount", token[:-2] + "xx"), ("amount", "garbage"), ("date", token)]:
+            with self.subTest(sort=sort, cursor=cursor):
+                response = self.client.get(url, {"paginate": "cursor", "sort": sort, "cursor": cursor})
+                self.assertEqual(response.status_code, 404)
@@ -0,0 +1,43 @@
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from ..synthetic import generate_transactions
+from .base import UserDataTestCase
+
+INDEXES = {
+    "txn_user_full_date_idx": ["user_id", "full_date", "id"],
+    "txn_user_cat_full_date_idx": ["user_id", "category_id", "full_date", "id"],
+    "txn_user_amount_idx": ["user_id", "amount", "id"],
+    "txn_user_cat_amount_idx": ["user_id", "category_id", "amount", "id"],
+}
+
+
+class TransactionIndexTests(UserDataTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        generate_transactions(cls.user, 1, 500, days=365)
+
+    def test_composite_indexes(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, "tracker_transaction")
+        for name, columns in INDEXES.items():
+            with self.subTest(name):
+                self.assertTrue(constraints[name]["index"])
+                self.assertEqual(constraints[name]["columns"], columns)
+
+    def test_list_plans_are_index_backed(self):
+        out = io.StringIO()
+        # Raises CommandError if any plan scans the table
+        call_command("check_query_plans", user=self.user.pk, stdout=out)
+        self.assertIn("All transaction list plans are index-backed", out.getvalue())
+        self.assertNotIn("❌", out.getvalue())
+
+    def test_date_sort_walks_the_index(self):
+        response = self.client.get(reverse("transaction-list"), {"sort": "-date"})
+        self.assertEqual(response.status_code, 200)
+        plan = response.context["page_obj"].object_list.explain()
+        self.assertIn("txn_user_full_date_idx", plan)
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..dates import date_resolver
+from ..models import Transaction
+from ..read_models import transaction_rows
+from ..rollups import rebuild_rollups
+from ..synthetic import generate_transactions
+from .base import TrackerTestCase
+
+
+class TransactionRowsTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        date_resolver.clear()
+        cls.user = get_user_model().objects.create_user("alice", password="pw12345!x")
+        generate_transactions(cls.user, 1, 150, days=60)
+        rebuild_rollups([cls.user.pk])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_rows(self):
+        row = transaction_rows(Transaction.objects.filter(user=self.user, category__isnull=False)).first()
+        t = Transaction.objects.get(pk=row.pk)
+        self.assertEqual(row.category_name, t.category.name)
+        self.assertEqual(row.signed_amount, t.signed_amount())
+        self.assertEqual(row.edit_url, reverse("transaction-edit", args=[t.pk]))
+        self.assertEqual(row.delete_url, reverse("transaction-delete", args=[t.pk]))
+
+    def test_queries_do_not_grow_with_page_size(self):
+        self.client.get(reverse("transaction-list"))  # caches the user
+        counts = []
+        for page_size in (10, 100):
+            caches[settings.TRACKER_CACHE_ALIAS].clear()
+            self.client.session.load()
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get(reverse("transaction-list"), {"page_size": page_size, "sort": "amount"})
+            self.assertEqual(response.content.count(b"<tr>"), page_size + 1)
+            counts.append(len(captured))
+        self.assertEqual(counts[0], counts[1])
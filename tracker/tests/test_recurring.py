@@ -0,0 +1,121 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.constants import BIWEEKLY, EXPENSE, MONTHLY, WEEKLY, YEARLY
+from ..models import RecurringSeries
+from ..recurring import add_months, detect_series, match_period, next_occurrence, refresh_recurring
+from .base import UserDataTestCase, add_transaction
+
+
+def monthly(first, count):
+    return [add_months(first, months, first.day) for months in range(count)]
+
+
+def ordinals(days):
+    return [day.toordinal() for day in days]
+
+
+class RecurringDetectorTests(SimpleTestCase):
+    def rows(self, days, amount=Decimal("-15.99"), description="NETFLIX.COM"):
+        return [(day, amount, None, EXPENSE, description) for day in days]
+
+    def test_periods(self):
+        first = datetime.date(2024, 1, 5)
+        for period, days in [
+            (WEEKLY, [first + datetime.timedelta(days=7 * i) for i in range(4)]),
+            (BIWEEKLY, [first + datetime.timedelta(days=14 * i) for i in range(3)]),
+            (MONTHLY, monthly(first, 3)),
+            (YEARLY, [first, first.replace(year=2025)]),
+        ]:
+            with self.subTest(period):
+                self.assertEqual(match_period(ordinals(days)), period)
+                # One occurrence short of believable
+                self.assertIsNone(match_period(ordinals(days[:-1])))
+
+    def test_irregular_gaps(self):
+        first = datetime.date(2024, 1, 5)
+        days = monthly(first, 6)
+        # One skipped month still reads as monthly; two don't
+        self.assertEqual(match_period(ordinals(days[:2] + days[3:])), MONTHLY)
+        self.assertIsNone(match_period(ordinals(days[:1] + days[2:3] + days[4:])))
+        self.assertIsNone(match_period(ordinals([first + datetime.timedelta(days=gap) for gap in (0, 3, 40, 41)])))
+
+    def test_next_occurrence_keeps_the_day_of_month(self):
+        days = [datetime.date(2024, 1, 31), datetime.date(2024, 2, 29), datetime.date(2024, 3, 31)]
+        self.assertEqual(next_occurrence(days, MONTHLY), datetime.date(2024, 4, 30))
+        self.assertEqual(next_occurrence(days, YEARLY), datetime.date(2025, 3, 31))
+
+    def test_grace_window(self):
+        rows = self.rows(monthly(datetime.date(2024, 1, 15), 3))
+        # Due on April 15th; monthly series get 10 days' grace
+        [series] = detect_series(rows, datetime.date(2024, 4, 25))
+        self.assertEqual((series.period, series.next_date), (MONTHLY, datetime.date(2024, 4, 15)))
+        self.assertEqual(detect_series(rows, datetime.date(2024, 4, 26)), [])
+
+    def test_grouping(self):
+        days = monthly(datetime.date(2024, 1, 15), 4)
+        rows = (
+            self.rows(days[::2], description="NETFLIX.COM 1234")
+            + self.rows(days[1::2], amount=Decimal("-16.19"), description="Netflix.com #5678")
+            # Same name, another amount band: not part of the series
+            + self.rows(days[:2], amount=Decimal("-150"), description="NETFLIX.COM")
+        )
+        [series] = detect_series(rows, datetime.date(2024, 5, 1))
+        self.assertEqual((series.description, series.occurrences), ("NETFLIX.COM 1234", 4))
+        self.assertEqual((series.first_date, series.last_date), (days[0], days[-1]))
+
+
+class RecurringRefreshTests(UserDataTestCase):
+    """
+    The recurring page re-runs detection after any write to the user's
+    transactions, whichever way it was made.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        today = timezone.localdate()
+        first = add_months(today, -3, min(today.day, 28))
+        cls.days = monthly(first, 3)
+        cls.streaming = [add_transaction(cls.user, day, -15, description="Streaming") for day in cls.days]
+        refresh_recurring(cls.user.pk)
+
+    def series(self):
+        self.assertEqual(self.client.get(reverse("analytics-recurring")).status_code, 200)
+        return list(RecurringSeries.objects.filter(user=self.user).values_list("description", "occurrences"))
+
+    def test_form_writes(self):
+        self.assertEqual(self.series(), [("Streaming", 3)])
+        response = self.client.post(reverse("transaction-add"), {
+            "raw_date": str(add_months(self.days[-1], 1, self.days[0].day)),
+            "description": "Streaming",
+            "amount": "15",
+            "type": EXPENSE,
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.series(), [("Streaming", 4)])
+
+        self.client.post(reverse("transaction-delete", args=[self.streaming[0].pk]))
+        self.assertEqual(self.series(), [("Streaming", 3)])
+
+    def test_api_writes(self):
+        self.series()
+        response = self.client.post(
+            reverse("api-transaction-batch"),
+            {"operations": [{"op": "delete", "id": self.streaming[1].pk}]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.json()["results"][0]["status"], "deleted")
+        # Two occurrences aren't a series
+        self.assertEqual(self.series(), [])
+
+    def test_no_refresh_without_writes(self):
+        self.series()
+        with mock.patch("tracker.recurring.refresh_recurring") as refresh:
+            self.assertEqual(self.series(), [("Streaming", 3)])
+        refresh.assert_not_called()
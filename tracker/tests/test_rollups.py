@@ -0,0 +1,108 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from .. import rollups
+from ..dates import date_resolver
+from ..models import Category, Transaction
+from ..rollups import compute_rollups, stored_rollups
+from .base import add_transaction
+
+
+class RollupTests(TestCase):
+    """
+    The stored MonthlyRollups must always equal a fresh GROUP BY.
+    """
+
+    def setUp(self):
+        date_resolver.clear()
+        self.user = get_user_model().objects.create_user("alice", password="pw12345!x")
+        self.food = Category.objects.create(user=self.user, name="Food")
+        self.rent = Category.objects.create(user=self.user, name="Rent")
+
+    def add(self, day, amount, category=None):
+        return add_transaction(self.user, day, amount, category)
+
+    def assertRollupsMatch(self):
+        stored = stored_rollups([self.user.pk])
+        self.assertEqual(stored, compute_rollups([self.user.pk]))
+        return stored
+
+    def test_save(self):
+        self.add(datetime.date(2024, 5, 1), -12, self.food)
+        self.add(datetime.date(2024, 5, 20), -8, self.food)
+        self.add(datetime.date(2024, 5, 31), 2500)
+        stored = self.assertRollupsMatch()
+        self.assertEqual(stored[(self.user.pk, datetime.date(2024, 5, 1), self.food.pk)], (0, 20, 2))
+
+    def test_edit_moves_month_and_category(self):
+        t = self.add(datetime.date(2024, 5, 1), -12, self.food)
+        self.add(datetime.date(2024, 5, 2), -3, self.food)
+        t.full_date = datetime.date(2024, 7, 15)
+        t.date_id = date_resolver.resolve(t.full_date)
+        t.category = self.rent
+        t.amount = -950
+        t.save()
+        # An instance that wasn't loaded from the database
+        Transaction(
+            pk=t.pk,
+            user=self.user,
+            category=None,
+            full_date=datetime.date(2024, 8, 1),
+            date_id=date_resolver.resolve(datetime.date(2024, 8, 1)),
+            amount=-950,
+            description="Row",
+        ).save()
+        stored = self.assertRollupsMatch()
+        self.assertEqual(set(stored), {
+            (self.user.pk, datetime.date(2024, 5, 1), self.food.pk),
+            (self.user.pk, datetime.date(2024, 8, 1), None),
+        })
+
+    def test_delete(self):
+        t = self.add(datetime.date(2024, 5, 1), -12, self.food)
+        self.add(datetime.date(2024, 6, 1), -5, self.food)
+        Transaction.objects.get(pk=t.pk).delete()
+        stored = self.assertRollupsMatch()
+        self.assertNotIn((self.user.pk, datetime.date(2024, 5, 1), self.food.pk), stored)
+
+    def test_category_delete(self):
+        self.add(datetime.date(2024, 5, 1), -12, self.food)
+        self.add(datetime.date(2024, 5, 2), -7)
+        self.add(datetime.date(2024, 6, 1), -30, self.food)
+        self.food.delete()
+        stored = self.assertRollupsMatch()
+        self.assertEqual(stored[(self.user.pk, datetime.date(2024, 5, 1), None)], (0, 19, 2))
+
+    def test_bulk_apply_many_buckets(self):
+        self.add(datetime.date(2024, 5, 1), -12, self.food)
+        doomed = self.add(datetime.date(2024, 6, 1), -30, self.rent)
+        new = [
+            Transaction(
+                user=self.user,
+                category=category,
+                full_date=day,
+                date_id=date_resolver.resolve(day),
+                amount=amount,
+                description="Bulk",
+            )
+            for day, amount, category in [
+                (datetime.date(2024, 5, 3), -4, self.food),  # existing bucket
+                (datetime.date(2024, 5, 4), 100, None),
+                (datetime.date(2024, 7, 1), -950, self.rent),
+                (datetime.date(2024, 7, 9), 50, self.rent),
+            ]
+        ]
+        Transaction.objects.bulk_create(new)
+        Transaction.objects.filter(pk=doomed.pk)._raw_delete(connection.alias)
+        deltas = rollups.bucket_deltas([(self.user.pk, t.full_date, t.category_id, t.amount) for t in new])
+        rollups.bucket_deltas([(self.user.pk, doomed.full_date, self.rent.pk, doomed.amount)], sign=-1, deltas=deltas)
+        with mock.patch("tracker.rollups._apply_deltas_in_bulk", wraps=rollups._apply_deltas_in_bulk) as bulk:
+            rollups.apply_deltas(deltas)
+        bulk.assert_called_once()
+        stored = self.assertRollupsMatch()
+        self.assertEqual(stored[(self.user.pk, datetime.date(2024, 7, 1), self.rent.pk)], (50, 950, 2))
+        self.assertNotIn((self.user.pk, datetime.date(2024, 6, 1), self.rent.pk), stored)
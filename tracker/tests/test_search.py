@@ -0,0 +1,61 @@
+import datetime
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+
+from ..models import Transaction
+from ..search import MAX_QUERY_LENGTH, search_transactions
+from .base import UserDataTestCase, add_transaction
+
+
+class SearchTests(UserDataTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        add_transaction(cls.user, datetime.date(2024, 5, 2), -4, description="Coffee at Blue Bottle")
+        add_transaction(cls.user, datetime.date(2024, 5, 3), -3, description="COFFEE beans")
+        add_transaction(cls.user, datetime.date(2024, 5, 4), -900, cls.category, description="Rent May")
+        bob = get_user_model().objects.create_user("bob", password="pw12345!x")
+        add_transaction(bob, datetime.date(2024, 5, 2), -5, description="Coffee")
+
+    def search(self, text):
+        qs = Transaction.objects.filter(user=self.user).order_by("full_date")
+        return list(search_transactions(qs, text).values_list("description", flat=True))
+
+    def test_matches(self):
+        for text, descriptions in [
+            ("coffee", ["Coffee at Blue Bottle", "COFFEE beans"]),
+            ("  Blue   bottle ", ["Coffee at Blue Bottle"]),
+            ("rent may", ["Rent May"]),
+            ("tea", []),
+        ]:
+            with self.subTest(text):
+                self.assertEqual(self.search(text), descriptions)
+
+    def test_blank_query_matches_everything(self):
+        qs = Transaction.objects.filter(user=self.user)
+        self.assertIs(search_transactions(qs, "   "), qs)
+
+    @unittest.skipIf(connection.vendor == "postgresql", "PostgreSQL searches the full-text and trigram indexes")
+    def test_substring_fallback(self):
+        qs = search_transactions(Transaction.objects.all(), "offe")
+        self.assertIn("LIKE", str(qs.query))
+        self.assertEqual(qs.count(), 3)
+        # Long input is cut before it reaches the database
+        [lookup] = search_transactions(Transaction.objects.all(), "x" * 1000).query.where.children
+        self.assertEqual(len(lookup.rhs), MAX_QUERY_LENGTH)
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "needs the PostgreSQL search indexes")
+    def test_word_forms_match(self):
+        self.assertEqual(self.search("coffees"), ["Coffee at Blue Bottle", "COFFEE beans"])
+
+    def test_list_view_combines_with_filters(self):
+        url = reverse("transaction-list")
+        response = self.client.get(url, {"q": "coffee", "sort": "-date"})
+        self.assertEqual(
+            [t.description for t in response.context["transactions"]], ["COFFEE beans", "Coffee at Blue Bottle"]
+        )
+        response = self.client.get(url, {"q": "may", "category": self.category.pk})
+        self.assertEqual([t.description for t in response.context["transactions"]], ["Rent May"])
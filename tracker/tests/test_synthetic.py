@@ -0,0 +1,49 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+
+from ..models import Transaction
+from ..synthetic import CATEGORY_NAMES, generate_rows, generate_transactions
+from .base import TrackerTestCase
+
+
+class GenerateRowsTests(SimpleTestCase):
+    def setUp(self):
+        self.first = datetime.date(2024, 1, 1)
+        self.categories = {name: pk for pk, (name, _) in enumerate(CATEGORY_NAMES, start=1)}
+        self.date_ids = {self.first + datetime.timedelta(days=offset): offset for offset in range(366)}
+
+    def rows(self, count, seed=0, user_number=1):
+        return list(generate_rows(count, seed, user_number, self.categories, self.date_ids, self.first, 366))
+
+    def test_same_seed_same_rows(self):
+        self.assertEqual(self.rows(1000), self.rows(1000))
+        self.assertNotEqual(self.rows(1000), self.rows(1000, seed=1))
+        self.assertNotEqual(self.rows(1000), self.rows(1000, user_number=2))
+
+    def test_monthly_series_and_date_order(self):
+        rows = self.rows(5000)
+        self.assertEqual(len(rows), 5000)
+        self.assertEqual([row[4] for row in rows].count("Payroll"), 12)
+        self.assertEqual([row[1] for row in rows], sorted(row[1] for row in rows))
+        self.assertTrue(all((row[3] > 0) == (row[5] == "income") for row in rows))
+
+
+class GenerateTransactionsTests(TrackerTestCase):
+    def generate(self, username, user_number, chunk_size):
+        user = get_user_model().objects.create_user(username, password="pw12345!x")
+        generate_transactions(
+            user, user_number, 1234, seed=7, end=datetime.date(2024, 12, 31), days=366, chunk_size=chunk_size
+        )
+        # Summed in Python: SQLite's SUM() of decimals goes through floats
+        amounts = Transaction.objects.filter(user=user).values_list("amount", flat=True)
+        return len(amounts), sum(amounts, Decimal(0))
+
+    def test_deterministic(self):
+        totals = self.generate("first", 1, chunk_size=100)
+        self.assertEqual(totals, (1234, Decimal("-18696.72")))
+        # The same rows whatever the chunking, another history per user number
+        self.assertEqual(self.generate("again", 1, chunk_size=5000), totals)
+        self.assertNotEqual(self.generate("second", 2, chunk_size=100), totals)
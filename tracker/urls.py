@@ -1,12 +1,35 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, views
+
+if settings.TRACKER_ASYNC_VIEWS:
+    from . import async_views
+
+    TransactionListView = async_views.AsyncTransactionListView
+    AnalyticsHomeView = async_views.AsyncAnalyticsHomeView
+    AnalyticsSummaryView = async_views.AsyncAnalyticsSummaryView
+    AnalyticsMonthlyView = async_views.AsyncAnalyticsMonthlyView
+    AnalyticsCategoriesView = async_views.AsyncAnalyticsCategoriesView
+    AnalyticsTrendsView = async_views.AsyncAnalyticsTrendsView
+    AnalyticsRecurringView = async_views.AsyncAnalyticsRecurringView
+else:
+    TransactionListView = views.TransactionListView
+    AnalyticsHomeView = views.AnalyticsHomeView
+    AnalyticsSummaryView = views.AnalyticsSummaryView
+    AnalyticsMonthlyView = views.AnalyticsMonthlyView
+    AnalyticsCategoriesView = views.AnalyticsCategoriesView
+    AnalyticsTrendsView = views.AnalyticsTrendsView
+    AnalyticsRecurringView = views.AnalyticsRecurringView
 
 urlpatterns = [
     # Home
     path("", views.HomeView.as_view(), name="home"),
     # Transactions
-    path("transactions/", views.TransactionListView.as_view(), name="transaction-list"),
+    path("transactions/", TransactionListView.as_view(), name="transaction-list"),
     path("transactions/add/", views.TransactionCreateView.as_view(), name="transaction-add"),
+    path("transactions/export/", views.TransactionExportView.as_view(), name="transaction-export"),
+    path("transactions/import/", views.TransactionImportView.as_view(), name="transaction-import"),
+    path("transactions/autocomplete/", views.TransactionAutocompleteView.as_view(), name="transaction-autocomplete"),
     path("transactions/<int:pk>/edit/", views.TransactionUpdateView.as_view(), name="transaction-edit"),
     path("transactions/<int:pk>/delete/", views.TransactionDeleteView.as_view(), name="transaction-delete"),
     # Categories
@@ -14,10 +37,16 @@ urlpatterns = [
     path("categories/add/", views.CategoryCreateView.as_view(), name="category-add"),
     path("categories/<int:pk>/edit/", views.CategoryUpdateView.as_view(), name="category-edit"),
     path("categories/<int:pk>/delete/", views.CategoryDeleteView.as_view(), name="category-delete"),
+    # JSON API
+    path("api/transactions/", api.TransactionApiListView.as_view(), name="api-transaction-list"),
+    path("api/transactions/batch/", api.TransactionApiBatchView.as_view(), name="api-transaction-batch"),
+    path("api/transactions/<int:pk>/", api.TransactionApiDetailView.as_view(), name="api-transaction-detail"),
     # Analytics
-    path("analytics/", views.AnalyticsHomeView.as_view(), name="analytics-home"),
-    path("analytics/summary/", views.AnalyticsSummaryView.as_view(), name="analytics-summary"),
-    path("analytics/monthly/", views.AnalyticsMonthlyView.as_view(), name="analytics-monthly"),
-    path("analytics/categories/", views.AnalyticsCategoriesView.as_view(), name="analytics-categories"),
+    path("analytics/", AnalyticsHomeView.as_view(), name="analytics-home"),
+    path("analytics/summary/", AnalyticsSummaryView.as_view(), name="analytics-summary"),
+    path("analytics/monthly/", AnalyticsMonthlyView.as_view(), name="analytics-monthly"),
+    path("analytics/categories/", AnalyticsCategoriesView.as_view(), name="analytics-categories"),
+    path("analytics/trends/", AnalyticsTrendsView.as_view(), name="analytics-trends"),
+    path("analytics/recurring/", AnalyticsRecurringView.as_view(), name="analytics-recurring"),
 ]
 
@@ -1,11 +1,29 @@
+import datetime
+import io
 from django.shortcuts import render
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views import View
 from django.contrib import messages
-from django.views.generic import TemplateView, ListView, CreateView, UpdateView, DeleteView
+from django.views.generic import TemplateView, ListView, CreateView, UpdateView, DeleteView, FormView
 from django.urls import reverse_lazy
 from .models import Transaction, Category
-from django.db.models import Sum, Q
 from tracker.forms.transaction_form import TransactionForm
-from .mixins import MessageDeleteMixin, MessageCreateUpdateMixin, PaginateByMixin
+from tracker.forms.import_form import TransactionImportForm
+from tracker.forms.analytics_form import DateRangeForm
+from tracker.autocomplete import DEFAULT_LIMIT, MAX_LIMIT, suggest
+from tracker.analytics import category_breakdown, monthly_trend, spending_trends, summary_totals
+from tracker.cache import cache_stats, cached_for_user
+from tracker.categories import user_categories
+from tracker.counting import CountingPaginator, RowCount, count_transactions
+from tracker.fragments import fragment_context
+from tracker.read_models import transaction_rows
+from tracker.recurring import refresh_if_stale, upcoming_series
+from tracker.search import search_transactions
+from tracker.importers import PARSERS, ImportFormatError, TransactionImporter, detect_format
+from tracker.exporters import EXPORTERS
+from core.routers import use_primary
+from .mixins import MessageDeleteMixin, MessageCreateUpdateMixin, PaginateByMixin, CursorPaginateMixin, ReplicaReadMixin, SortMixin
 from django.contrib.auth.mixins import LoginRequiredMixin
 
 # Home
@@ -14,61 +32,158 @@ class HomeView(TemplateView):
 
 
 # Transactions
-class TransactionListView(LoginRequiredMixin, PaginateByMixin, ListView):
-    model = Transaction
-    template_name = "tracker/transactions/list.html"
-    context_object_name = "transactions"
-    paginate_by = 10
-    login_url = "login"  
-    redirect_field_name = "next"
+def parse_date_param(value):
+    """
+    The date in a YYYY-MM-DD query parameter, or None if it isn't one.
+    """
+    try:
+        return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TransactionFilterMixin(SortMixin):
+    """
+    The current user's transactions, sorted and filtered by the
+    ?sort=, ?q=, ?category=, ?start_date= and ?end_date= parameters.
+    Shared by the list page and the export so both see the same rows.
+    """
+
+    default_sort = "-date"
+    allowed_sorts = {
+        "date": "full_date",
+        "-date": "-full_date",
+        "amount": "amount",
+        "-amount": "-amount"
+    }
+
+    def get_filters(self):
+        """
+        The filters in use: {"category": id, "start_date": ..., "end_date": ..., "q": ...}.
+        Malformed ids and dates are ignored.
+        """
+        params = self.request.GET
+        filters = {}
+        category_id = params.get("category")
+        if category_id and category_id.isdigit():
+            filters["category"] = int(category_id)
+        for name in ("start_date", "end_date"):
+            day = parse_date_param(params.get(name))
+            if day:
+                filters[name] = day.isoformat()
+        if params.get("q"):
+            filters["q"] = params["q"]
+        return filters
+
+    def get_filter_errors(self):
+        """
+        {parameter: message} for the filters get_filters() ignores as malformed.
+        """
+        params = self.request.GET
+        errors = {}
+        if params.get("category") and not params["category"].isdigit():
+            errors["category"] = "Enter a category id."
+        for name in ("start_date", "end_date"):
+            if params.get(name) and not parse_date_param(params[name]):
+                errors[name] = "Enter a date as YYYY-MM-DD."
+        return errors
 
     def get_queryset(self):
         # Show only transactions belonging to the current user
         qs = Transaction.objects.filter(user=self.request.user)
 
-        # Sorting
-        sort = self.request.GET.get("sort")
-        allowed_sorts = {
-            "date": "date__full_date",
-            "-date": "-date__full_date",
-            "amount": "amount",
-            "-amount": "-amount"
-        }
-        qs = qs.order_by(allowed_sorts.get(sort, "-date__full_date"))
+        # Sorting (cursor mode re-applies the same ordering itself)
+        qs = qs.order_by(*self.get_ordering())
+
+        filters = self.get_filters()
 
         # Filter by category
-        category_id = self.request.GET.get("category")
-        if category_id:
-            qs = qs.filter(category_id=category_id)
+        if "category" in filters:
+            qs = qs.filter(category_id=filters["category"])
 
         # Filter by date
-        start_date = self.request.GET.get("start_date")
-        end_date = self.request.GET.get("end_date")
-        if start_date:
-            qs = qs.filter(date__full_date__gte=start_date)
-        if end_date:
-            qs = qs.filter(date__full_date__lte=end_date)
+        if "start_date" in filters:
+            qs = qs.filter(full_date__gte=filters["start_date"])
+        if "end_date" in filters:
+            qs = qs.filter(full_date__lte=filters["end_date"])
+
+        # Search descriptions (full-text + trigram indexes on PostgreSQL)
+        if "q" in filters:
+            qs = search_transactions(qs, filters["q"])
 
         return qs
 
+
+class TransactionListView(LoginRequiredMixin, ReplicaReadMixin, PaginateByMixin, CursorPaginateMixin, TransactionFilterMixin, ListView):
+    model = Transaction
+    template_name = "tracker/transactions/list.html"
+    context_object_name = "transactions"
+    paginate_by = 10
+    paginator_class = CountingPaginator
+    login_url = "login"  
+    redirect_field_name = "next"
+
+    def get_queryset(self):
+        # Only the shown columns, category name joined in the same query
+        return transaction_rows(super().get_queryset())
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        # Page numbers without a COUNT(*) over every matching row
+        row_count = count_transactions(self.request.user.pk, queryset, self.get_filters())
+        return super().get_paginator(queryset, per_page, row_count=row_count, **kwargs)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Categories only for this user
-        context["categories"] = Category.objects.filter(user=self.request.user)
+        context["categories"] = user_categories(self.request.user.pk)
+        context.update(self.get_querystrings())
+        context.update(fragment_context(self.request.user.pk, context["transactions"]))
+        return context
 
+    def get_querystrings(self):
         # Keep current filters/sort in querystring (except page)
         params = self.request.GET.copy()
 
-        # For pagination: keep filters & sort, drop page
+        # For pagination: keep filters & sort, drop page/cursor
         params.pop("page", None)
-        context["querystring"] = params.urlencode()
+        params.pop("cursor", None)
 
         # For sorting links: keep filters, drop page and old sort
         params_no_sort = params.copy()
         params_no_sort.pop("sort", None)
-        context["querystring_no_sort"] = params_no_sort.urlencode()
+        params_no_sort.pop("cursor", None)
 
-        return context
+        return {
+            "querystring": params.urlencode(),
+            "querystring_no_sort": params_no_sort.urlencode(),
+        }
+
+
+class TransactionExportView(LoginRequiredMixin, ReplicaReadMixin, TransactionFilterMixin, View):
+    login_url = "login"
+    redirect_field_name = "next"
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get("format", "csv")
+        if export_format not in EXPORTERS:
+            raise Http404("Unknown export format.")
+
+        stream, content_type = EXPORTERS[export_format]
+        filename = f"transactions-{timezone.localdate():%Y%m%d}.{export_format}"
+        response = StreamingHttpResponse(stream(self.get_queryset()), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class TransactionAutocompleteView(LoginRequiredMixin, View):
+    login_url = "login"
+    redirect_field_name = "next"
+
+    def get(self, request, *args, **kwargs):
+        limit = request.GET.get("limit", "")
+        limit = min(int(limit), MAX_LIMIT) if limit.isdigit() and int(limit) > 0 else DEFAULT_LIMIT
+        # Served from the per-user in-memory prefix index, no query per keystroke
+        return JsonResponse(suggest(request.user.pk, request.GET.get("q", ""), limit))
 
 
 class TransactionCreateView(LoginRequiredMixin, MessageCreateUpdateMixin, CreateView):
@@ -125,12 +240,37 @@ class TransactionDeleteView(LoginRequiredMixin, MessageDeleteMixin, DeleteView):
         return Transaction.objects.filter(user=self.request.user)
 
 
+class TransactionImportView(LoginRequiredMixin, FormView):
+    form_class = TransactionImportForm
+    template_name = "tracker/transactions/import.html"
+    login_url = "login"
+    redirect_field_name = "next"
+
+    def form_valid(self, form):
+        upload = form.cleaned_data["file"]
+        try:
+            file_format = form.cleaned_data["format"] or detect_format(upload.name)
+            # Decode the upload lazily; large files stay in their temp file
+            stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", errors="replace", newline="")
+            result = TransactionImporter(self.request.user).run(PARSERS[file_format](stream))
+        except ImportFormatError as e:
+            form.add_error(None, str(e))
+            return self.form_invalid(form)
+
+        if result.created:
+            messages.success(self.request, f"✅ Imported {result.created} of {result.rows} transactions.")
+        if result.error_count:
+            messages.warning(self.request, f"⚠️ {result.error_count} rows were rejected.")
+        return self.render_to_response(self.get_context_data(form=form, result=result))
+
+
 # Categories
 class CategoryListView(LoginRequiredMixin, PaginateByMixin, ListView):
     model = Category
     template_name = "tracker/categories/list.html"
     context_object_name = "categories"
     paginate_by = 10
+    paginator_class = CountingPaginator
     login_url = "login"
     redirect_field_name = "next"
 
@@ -138,6 +278,10 @@ class CategoryListView(LoginRequiredMixin, PaginateByMixin, ListView):
         # Filter only categories created by the logged-in user
         return Category.objects.filter(user=self.request.user).order_by("name")
 
+    def get_paginator(self, queryset, per_page, **kwargs):
+        row_count = cached_for_user(self.request.user.pk, "category-count", (), lambda: RowCount(queryset.count()))
+        return super().get_paginator(queryset, per_page, row_count=row_count, **kwargs)
+
 
 class CategoryCreateView(LoginRequiredMixin, MessageCreateUpdateMixin, CreateView):
     model = Category
@@ -181,34 +325,86 @@ class CategoryDeleteView(LoginRequiredMixin, MessageDeleteMixin, DeleteView):
 
 
 # Analytics
-class AnalyticsHomeView(TemplateView):
+class AnalyticsHomeView(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
     template_name = "tracker/analytics/home.html"
+    login_url = "login"
+    redirect_field_name = "next"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.request.user.is_staff:
+            context["cache_stats"] = cache_stats()
+        return context
 
-class AnalyticsSummaryView(TemplateView):
+class AnalyticsSummaryView(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
     template_name = "tracker/analytics/summary.html"
+    login_url = "login"
+    redirect_field_name = "next"
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        #Agg totals
-        totals = Transaction.objects.aggregate(
-            total_income = Sum("amount", filter = Q(amount__gt=0)),
-            total_expenses = Sum("amount", filter = Q(amount__lt=0)),
-        )
-
-        income = totals["total_income"] or 0
-        expenses = totals["total_expenses"] or 0
-        expenses = abs(expenses)
-        balance = income - expenses
-
-        context.update({
-            "income":income,
-            "expenses":expenses,
-            "balance":balance
-        })
+        # Totals for this user only, from the rollups and cached per data version
+        context.update(summary_totals(self.request.user.pk))
         return context
 
-class AnalyticsMonthlyView(TemplateView):
+class AnalyticsMonthlyView(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
     template_name = "tracker/analytics/monthly.html"
+    login_url = "login"
+    redirect_field_name = "next"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        # One row per month from the rollup table, not a scan of every transaction
+        context["months"] = monthly_trend(self.request.user.pk)
+        return context
 
-class AnalyticsCategoriesView(TemplateView):
+class AnalyticsCategoriesView(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
     template_name = "tracker/analytics/categories.html"
+    login_url = "login"
+    redirect_field_name = "next"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        form = DateRangeForm(self.request.GET)
+        start_date = end_date = None
+        if form.is_valid():
+            start_date = form.cleaned_data["start_date"]
+            end_date = form.cleaned_data["end_date"]
+
+        context["form"] = form
+        context["breakdown"] = category_breakdown(self.request.user.pk, start_date, end_date)
+        return context
+
+class AnalyticsTrendsView(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
+    template_name = "tracker/analytics/trends.html"
+    login_url = "login"
+    redirect_field_name = "next"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        # Vectorized over the user's transactions, cached per data version and day
+        context.update(spending_trends(self.request.user.pk, timezone.localdate()))
+        return context
+
+class AnalyticsRecurringView(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
+    template_name = "tracker/analytics/recurring.html"
+    login_url = "login"
+    redirect_field_name = "next"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        # Stored by the detector, which only runs again after the user's
+        # transactions changed
+        today = timezone.localdate()
+        if refresh_if_stale(self.request.user.pk, today):
+            # A replica may not have the new series yet
+            use_primary()
+        context["today"] = today
+        context["upcoming"] = upcoming_series(self.request.user.pk, today)
+        context["series"] = self.request.user.recurring_series.select_related("category").order_by("description")
+        return context
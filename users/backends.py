@@ -0,0 +1,94 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.db import transaction
+
+CACHE_SIZE = 1024
+
+
+class UserCache:
+    """
+    Per-process cache of user rows for the authentication middleware.
+
+    Entries expire after TRACKER_USER_CACHE_SECONDS, and the process that
+    saves or deletes a user forgets it at once (users/signals.py); other
+    processes see the change when their entry expires.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._cache.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._cache[user_id]
+                return None
+            self._cache.move_to_end(user_id)
+        # Each request gets its own instance to modify
+        return copy.copy(user)
+
+    def set(self, user):
+        expires = time.monotonic() + settings.TRACKER_USER_CACHE_SECONDS
+        with self._lock:
+            self._cache[user.pk] = (expires, copy.copy(user))
+            self._cache.move_to_end(user.pk)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def _drop(self, user_id):
+        with self._lock:
+            self._cache.pop(user_id, None)
+
+    def forget(self, user_id):
+        """
+        Drop the user now and, inside a transaction, again on commit in case
+        a concurrent request cached the old row meanwhile.
+        """
+        self._drop(user_id)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self._drop(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that serves the session's user from `user_cache`, so a
+    warm logged-in request doesn't query the user table. Passwords are
+    still checked against the database.
+    """
+
+    def get_user(self, user_id):
+        if not settings.TRACKER_USER_CACHE_SECONDS:
+            return super().get_user(user_id)
+        user = user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                user_cache.set(user)
+        return user
+
+    async def aget_user(self, user_id):
+        if not settings.TRACKER_USER_CACHE_SECONDS:
+            return await super().aget_user(user_id)
+        user = user_cache.get(user_id)
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                user_cache.set(user)
+        return user
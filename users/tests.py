@@ -1,3 +1,84 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tracker.tests.base import CHECK_LATENCY
+
+
+class AuthViewBudgetTests(TestCase):
+    """
+    Query and latency budgets for the account pages, like the tracker
+    views' (see tracker/tests/test_budgets.py), with the latency checks
+    likewise behind TRACKER_BENCH_LATENCY. Password hashing dominates the
+    POSTs; counts include the savepoints the session save opens.
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("alice", password="pw12345!x")
+
+    def check_budget(self, request, queries, ms, expected_status):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = request()
+            elapsed = (time.perf_counter() - started) * 1000
+        self.assertEqual(response.status_code, expected_status)
+        self.assertLessEqual(len(captured), queries)
+        if CHECK_LATENCY:
+            self.assertLessEqual(elapsed, ms)
+
+    def test_login_page(self):
+        self.check_budget(lambda: self.client.get(reverse("login")), queries=0, ms=100, expected_status=200)
+
+    def test_login(self):
+        self.check_budget(
+            lambda: self.client.post(reverse("login"), {"username": "alice", "password": "pw12345!x"}),
+            queries=9,
+            ms=1000,
+            expected_status=302,
+        )
+
+    def test_register(self):
+        self.check_budget(
+            lambda: self.client.post(reverse("register"), {
+                "username": "bob",
+                "email": "bob@example.com",
+                "password1": "pw12345!x",
+                "password2": "pw12345!x",
+            }),
+            queries=11,
+            ms=1000,
+            expected_status=302,
+        )
+
+
+class CachedSessionUserTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("alice", password="pw12345!x")
+        self.client.force_login(self.user)
+        self.url = reverse("transaction-add")
+        self.client.get(self.url)
+
+    def test_warm_request_skips_session_and_user_queries(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(captured), 0)
+
+    def test_password_change_ends_sessions(self):
+        self.user.set_password("new-pw12345!x")
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_profile_changes_show_up(self):
+        self.user.preferred_currency = "EUR"
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.wsgi_request.user.preferred_currency, "EUR")
 
-# Create your tests here.
+    def test_logout(self):
+        self.client.post(reverse("logout"))
+        self.assertEqual(self.client.get(self.url).status_code, 302)
@@ -1,4 +1,5 @@
 from django.contrib.auth.views import LoginView, LogoutView
+from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.views.generic import CreateView
 from django.contrib.auth import login
@@ -10,14 +11,10 @@ class RegisterView(CreateView):
     success_url = reverse_lazy("login")
 
     def form_valid(self, form):
-        user = form.save(commit=True)  # save user to DB
+        self.object = user = form.save(commit=True)  # save user to DB
         login(self.request, user)  # optionally log in
-        print("✅ USER SAVED:", user.username)
-        return super().form_valid(form)
-
-    def form_invalid(self, form):
-        print("❌ FORM INVALID:", form.errors)
-        return super().form_invalid(form)
+        # CreateView.form_valid would save (and hash the password) again
+        return HttpResponseRedirect(self.get_success_url())
 
 
 class CustomLoginView(LoginView):